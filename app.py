@@ -1,6 +1,6 @@
 # app.py
 """
-This code version is - 1.13 every time if you make any small update increase this number for tracking purposes - last update _codeEMA/BB Strategy Bot — Refactored from KAMA base.
+This code version is - 1.15 every time if you make any small update increase this number for tracking purposes - last update _codeEMA/BB Strategy Bot — Refactored from KAMA base.
  - Added Strategy 12 (Small-account: SuperTrend + MACD + RSI using pandas-ta, S4-style fixed risk, 1.5R TP)
  - Added Strategy 11 (Mean Reversion with 1H Bollinger Bands, 4H RSI filter, 1H/4H ADX filter) with S4-style sizing
  - DualLock for cross-thread locking
@@ -26,21 +26,28 @@ import re
 import traceback
 import psutil
 import random
+import queue
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
+import functools
+import operator
+import bisect
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional
+from dataclasses import dataclass, fields
 from collections import deque
-from decimal import Decimal, ROUND_DOWN, getcontext, ROUND_CEILING
+from decimal import ROUND_DOWN, ROUND_CEILING
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib.parse import quote_plus
 import numpy as np
 import pandas as pd
-import pandas_ta as ta
-import matplotlib
-matplotlib.use('Agg') # Use non-interactive backend for server-side plotting
-import matplotlib.pyplot as plt
 from fastapi import FastAPI
 
 from binance.client import Client
@@ -49,11 +56,29 @@ from binance.exceptions import BinanceAPIException
 import telegram
 from telegram import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup
 
-import mplfinance as mpf
-from stocktrends import Renko
-
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; news fetches fall back to resp.json()
+    ijson = None
+
+import charts
+from indicators_nb import (
+    _supertrend_bands_nb, _supertrend_bands_tr_nb, _adx_nb, _rsi_avgs_nb, _macd_nb, _true_range_nb, _ewm_nb,
+    _rolling_mean_nb, _rolling_mean_std_nb, _rsi_sma_nb,
+    step_ema, step_atr_wilder, step_rsi_wilder, step_supertrend,
+)
+from patterns_nb import (
+    BUY, SELL, is_pin_bar, is_engulfing, is_follow_through,
+    pin_bar_mask, engulfing_mask, follow_through_mask,
+)
+
 # Load .env file into environment (if present)
 load_dotenv()
 
@@ -76,6 +101,49 @@ ALPHA_VANTAGE_API_KEY = "EU4VA0HP1D24U_codeYAnew0</"
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 log = logging.getLogger("ema-bb-bot")
 
+# -------------------------
+# JSON codec
+# -------------------------
+def json_dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def json_dumps_line(obj) -> bytes:
+    """One newline-terminated JSON record as UTF-8 bytes, for appending to .jsonl files."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(obj) + "\n").encode()
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _OrjsonCompat:
+    """Stand-in for requests' json module: orjson for plain loads, stdlib for everything else."""
+    JSONDecodeError = json.JSONDecodeError  # orjson.JSONDecodeError subclasses this
+    dumps = staticmethod(json.dumps)
+
+    @staticmethod
+    def loads(s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def _install_fast_response_json():
+    """
+    Route Response.json() (every python-binance REST reply) through orjson. Only done when
+    requests is using the stdlib json module, whose JSONDecodeError orjson's error subclasses.
+    """
+    import requests.models
+    if orjson is not None and requests.models.complexjson is json:
+        requests.models.complexjson = _OrjsonCompat
+
+_install_fast_response_json()
+
 # Globals
 client: Optional[Client] = None
 request = telegram.utils.request.Request(con_pool_size=10)
@@ -101,263 +169,555 @@ S10_STACKED_WIDER_MULT_BONUS = 0.25
 S10_USE_ADAPTIVE_TRAIL = True
 S10_TRAIL_DISABLED = False        # global kill-switch for quick rollback
 
-CONFIG = {
-    # --- STRATEGY ---
-    "STRATEGY_MODE": os.getenv("STRATEGY_MODE", "5,6,7,8,9,10"),
-    "STRATEGY_1": {  # Original Bollinger Band strategy
-        "BB_LENGTH": int(os.getenv("BB_LENGTH_CUSTOM", "20")),
-        "BB_STD": float(os.getenv("BB_STD_CUSTOM", "2.5")),
-        "MIN_RSI_FOR_BUY": int(os.getenv("S1_MIN_RSI_FOR_BUY", "30")),
-        "MAX_RSI_FOR_SELL": int(os.getenv("S1_MAX_RSI_FOR_SELL", "70")),
-        "MAX_VOLATILITY_FOR_ENTRY": float(os.getenv("S1_MAX_VOL_ENTRY", "0.03")),
-    },
-    "STRATEGY_2": {  # New SuperTrend strategy
-        "SUPERTREND_PERIOD": int(os.getenv("ST_PERIOD", "7")),
-        "SUPERTREND_MULTIPLIER": float(os.getenv("ST_MULTIPLIER", "2.0")),
-        "ADX_THRESHOLD": int(os.getenv("ST_ADX_THRESHOLD", "15")),
-        "MIN_ADX_FOR_ENTRY": int(os.getenv("S2_MIN_ADX_ENTRY", "15")),
-        "MIN_RSI_SELL": int(os.getenv("ST_MIN_RSI_SELL", "35")),
-        "MAX_RSI_SELL": int(os.getenv("ST_MAX_RSI_SELL", "75")),
-        "MIN_RSI_BUY": int(os.getenv("ST_MIN_RSI_BUY", "25")),
-        "MAX_RSI_BUY": int(os.getenv("ST_MAX_RSI_BUY", "65")),
-        "MIN_MACD_CONF": float(os.getenv("ST_MIN_MACD_CONF", "0.3")),
-        "EMA_CONFIRMATION_PERIOD": int(os.getenv("ST_EMA_CONF_PERIOD", "20")),
-        "MIN_VOLATILITY_FOR_ENTRY": float(os.getenv("S2_MIN_VOL_ENTRY", "0.003")),
-        "MAX_VOLATILITY_FOR_ENTRY": float(os.getenv("S2_MAX_VOL_ENTRY", "0.035")),
-        "BASE_CONFIDENCE_THRESHOLD": float(os.getenv("S2_BASE_CONF_THRESH", "55.0")),
-        "LOW_VOL_CONF_THRESHOLD": float(os.getenv("S2_LOW_VOL_THRESH", "0.005")),
-        "LOW_VOL_CONF_LEVEL": float(os.getenv("S2_LOW_VOL_LEVEL", "50.0")),
-        "HIGH_VOL_CONF_THRESHOLD": float(os.getenv("S2_HIGH_VOL_THRESH", "0.01")),
-        "HIGH_VOL_CONF_ADJUSTMENT": float(os.getenv("S2_HIGH_VOL_ADJUST", "5.0")),
-    },
-    "STRATEGY_3": { # Simple MA Cross strategy
-        "FAST_MA": int(os.getenv("S3_FAST_MA", 9)),
-        "SLOW_MA": int(os.getenv("S3_SLOW_MA", 21)),
-        "ATR_SL_MULT": float(os.getenv("S3_ATR_SL_MULT", 1.5)),
-        "FALLBACK_SL_PCT": float(os.getenv("S3_FALLBACK_SL_PCT", 0.015)),
-        # --- New Trailing Stop parameters for S3 ---
-        "TRAILING_ENABLED": os.getenv("S3_TRAILING_ENABLED", "true").lower() in ("true", "1", "yes"),
-        "TRAILING_ATR_PERIOD": int(os.getenv("S3_TRAILING_ATR_PERIOD", "14")),
-        "TRAILING_ATR_MULTIPLIER": float(os.getenv("S3_TRAILING_ATR_MULTIPLIER", "3.0")),
-        "TRAILING_ACTIVATION_PROFIT_PCT": float(os.getenv("S3_TRAILING_ACTIVATION_PROFIT_PCT", "0.01")), # 1% profit
-    },
-    "STRATEGY_4": { # 3x SuperTrend strategy
-        "ST1_PERIOD": int(os.getenv("S4_ST1_PERIOD", "12")),
-        "ST1_MULT": float(os.getenv("S4_ST1_MULT", "3")),
-        "ST2_PERIOD": int(os.getenv("S4_ST2_PERIOD", "11")),
-        "ST2_MULT": float(os.getenv("S4_ST2_MULT", "2.0")),
-        "ST3_PERIOD": int(os.getenv("S4_ST3_PERIOD", "10")),
-        "ST3_MULT": float(os.getenv("S4_ST3_MULT", "1.4")),
-        "RISK_USD": float(os.getenv("S4_RISK_USD", "0.50")), # Fixed risk amount
-        "VOLATILITY_EXIT_ATR_MULT": float(os.getenv("S4_VOLATILITY_EXIT_ATR_MULT", "3.0")),
-        "EMA_FILTER_PERIOD": int(os.getenv("S4_EMA_FILTER_PERIOD", "200")),
-        "EMA_FILTER_ENABLED": os.getenv("S4_EMA_FILTER_ENABLED", "false").lower() in ("true", "1", "yes"),
-    },
-    "STRATEGY_5": {  # Advanced crypto-futures strategy (H1 trend + M15 execution)
-        "H1_ST_PERIOD": int(os.getenv("S5_H1_ST_PERIOD", "10")),
-        "H1_ST_MULT": float(os.getenv("S5_H1_ST_MULT", "3.0")),
-        "EMA_FAST": int(os.getenv("S5_EMA_FAST", "21")),
-        "EMA_SLOW": int(os.getenv("S5_EMA_SLOW", "55")),
-        "ATR_PERIOD": int(os.getenv("S5_ATR_PERIOD", "14")),
-        "RSI_PERIOD": int(os.getenv("S5_RSI_PERIOD", "14")),
-        "VOL_MIN_PCT": float(os.getenv("S5_VOL_MIN_PCT", "0.003")),   # 0.3%
-        "VOL_MAX_PCT": float(os.getenv("S5_VOL_MAX_PCT", "0.035")),   # 3.5%
-        "RISK_USD": float(os.getenv("S5_RISK_USD", "0.50")),          # Same risk model as S4 (fixed risk)
-        "TP1_CLOSE_PCT": float(os.getenv("S5_TP1_CLOSE_PCT", "0.3")), # 30% at 1R
-        "TRAIL_ATR_MULT": float(os.getenv("S5_TRAIL_ATR_MULT", "1.0")),
-        "TRAIL_BUFFER_MULT": float(os.getenv("S5_TRAIL_BUFFER_MULT", "0.25")),
-        "BE_BUFFER_PCT": float(os.getenv("S5_BE_BUFFER_PCT", "0.0005")),  # 0.05% buffer to cover fees
-        "MAX_TRADES_PER_SYMBOL_PER_DAY": int(os.getenv("S5_MAX_TRADES_PER_SYMBOL_PER_DAY", "2")),
-        "SYMBOLS": os.getenv(
-            "S5_SYMBOLS",
-            "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT"
-        ).split(","),
-    },
-    "STRATEGY_6": { # Price-Action only (single high-probability trade per day)
-        "ATR_PERIOD": int(os.getenv("S6_ATR_PERIOD", "14")),
-        "ATR_BUFFER_MULT": float(os.getenv("S6_ATR_BUFFER", "0.25")),
-        "FOLLOW_THROUGH_RANGE_RATIO": float(os.getenv("S6_FOLLOW_THROUGH_RATIO", "0.7")),
-        "VOL_MA_LEN": int(os.getenv("S6_VOL_MA_LEN", "10")),
-        "LIMIT_EXPIRY_CANDLES": int(os.getenv("S6_LIMIT_EXPIRY_CANDLES", "3")),
-        "SESSION_START_UTC_HOUR": int(os.getenv("S6_SESSION_START_HOUR", "7")),
-        "SESSION_END_UTC_HOUR": int(os.getenv("S6_SESSION_END_HOUR", "15")),
-        "RISK_USD": float(os.getenv("S6_RISK_USD", "0.50")),
-        "ENFORCE_ONE_TRADE_PER_DAY": os.getenv("S6_ENFORCE_ONE_PER_DAY", "true").lower() in ("true", "1", "yes"),
-        "SYMBOLS": os.getenv("S6_SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT").split(","),
-    },
-    "STRATEGY_7": { # SMC (Smart Money Concepts) execution - price-action only
-        "ATR_PERIOD": int(os.getenv("S7_ATR_PERIOD", "14")),
-        "ATR_BUFFER": float(os.getenv("S7_ATR_BUFFER", "0.25")),
-        "BOS_LOOKBACK_H1": int(os.getenv("S7_BOS_LOOKBACK_H1", "72")),
-        "OB_MIN_BODY_RATIO": float(os.getenv("S7_OB_MIN_BODY_RATIO", "0.5")),
-        "REJECTION_WICK_RATIO": float(os.getenv("S7_REJECTION_WICK_RATIO", "0.6")),
-        "LIMIT_EXPIRY_CANDLES": int(os.getenv("S7_LIMIT_EXPIRY_CANDLES", "4")),
-        "USE_MIN_NOTIONAL": os.getenv("S7_USE_MIN_NOTIONAL", "true").lower() in ("true", "1", "yes"),
-        "ALLOW_M5_MICRO_CONFIRM": os.getenv("S7_ALLOW_M5_MICRO_CONFIRM", "false").lower() in ("true", "1", "yes"),
-        "SYMBOLS": os.getenv(
-            "S7_SYMBOLS",
-            "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT"
-        ).split(","),
-
-        "RISK_USD": float(os.getenv("S7_RISK_USD", "0.0")),  # kept optional; default 0 uses min notional
-    },
-    "STRATEGY_8": {  # SMC + Chart-Pattern Sniper Entry — break+retest inside OB/FVG
-        "ATR_PERIOD": int(os.getenv("S8_ATR_PERIOD", "14")),
-        "ATR_BUFFER": float(os.getenv("S8_ATR_BUFFER", "0.25")),
-        "BOS_LOOKBACK_H1": int(os.getenv("S8_BOS_LOOKBACK_H1", "72")),
-        "VOL_MA_LEN": int(os.getenv("S8_VOL_MA_LEN", "10")),
-        "RETEST_EXPIRY_CANDLES": int(os.getenv("S8_RETEST_EXPIRY_CANDLES", "3")),
-        "USE_OB": os.getenv("S8_USE_OB", "true").lower() in ("true", "1", "yes"),
-        "USE_FVG": os.getenv("S8_USE_FVG", "true").lower() in ("true", "1", "yes"),
-        "SYMBOLS": os.getenv("S8_SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT").split(","),
-    },
-    "STRATEGY_9": {  # SMC Scalping — high-win probability (M1/M5 execution, H1 BOS, H4/D bias)
-        "REJECTION_WICK_RATIO": float(os.getenv("S9_REJECTION_WICK_RATIO", "0.7")),
-        "M1_RANGE_AVG_LEN": int(os.getenv("S9_M1_RANGE_AVG_LEN", "20")),
-        "M5_ATR_PERIOD": int(os.getenv("S9_M5_ATR_PERIOD", "14")),
-        "ATR_BUFFER_MULT_M5": float(os.getenv("S9_ATR_BUFFER_MULT_M5", "0.6")),
-        "MAX_STOP_TO_AVG_RANGE_M5": float(os.getenv("S9_MAX_STOP_TO_AVG_RANGE_M5", "1.5")),
-        "LIMIT_EXPIRY_M1_CANDLES": int(os.getenv("S9_LIMIT_EXPIRY_M1_CANDLES", "3")),
-        "BOS_LOOKBACK_H1_MIN": int(os.getenv("S9_BOS_LOOKBACK_H1_MIN", "12")),
-        "BOS_LOOKBACK_H1_MAX": int(os.getenv("S9_BOS_LOOKBACK_H1_MAX", "48")),
-        "SESSION_START_UTC_HOUR": int(os.getenv("S9_SESSION_START_HOUR", "7")),
-        "SESSION_END_UTC_HOUR": int(os.getenv("S9_SESSION_END_HOUR", "15")),
-        "RISK_USD": float(os.getenv("S9_RISK_USD", "0.50")),  # Use S6 fixed-risk sizing model
-        "SYMBOLS": os.getenv("S9_SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT").split(","),
-        "HIGH_WIN_TP_R_MULT": float(os.getenv("S9_HIGH_WIN_TP_R_MULT", "0.5")),  # Conservative target 0.5R
-        "MICRO_SWEEP_LOOKBACK_M1": int(os.getenv("S9_MICRO_SWEEP_LOOKBACK_M1", "20")),
-        "SWEEP_RECLAIM_MAX_BARS": int(os.getenv("S9_SWEEP_RECLAIM_MAX_BARS", "5"))
-    },
-    "STRATEGY_10": {  # Combined Active-Adaptive (AA) + Volatility Breakout Momentum (VBM)
-        "H1_ST_PERIOD": int(os.getenv("S10_H1_ST_PERIOD", "10")),     # SuperTrend on H1
-        "H1_ST_MULT": float(os.getenv("S10_H1_ST_MULT", "3.0")),
-        "EMA_FAST": int(os.getenv("S10_EMA_FAST", "21")),             # EMA 21/55 on H1 and M15
-        "EMA_SLOW": int(os.getenv("S10_EMA_SLOW", "55")),
-        "ATR_PERIOD_M15": int(os.getenv("S10_ATR_PERIOD_M15", "14")), # Wilder ATR on M15 for AA
-        "ATR_PERIOD_M5": int(os.getenv("S10_ATR_PERIOD_M5", "14")),   # Wilder ATR on M5 for VBM
-        "VBM_RANGE_MIN_M5": int(os.getenv("S10_VBM_RANGE_MIN_M5", "6")),   # 30m consolidation on M5
-        "VBM_RANGE_MAX_M5": int(os.getenv("S10_VBM_RANGE_MAX_M5", "12")),  # 60m consolidation on M5
-        "VBM_ATR_MULT_STOP": float(os.getenv("S10_VBM_ATR_MULT_STOP", "1.75")),
-        "VBM_MIN_RANGE_PCT_OF_AVG": float(os.getenv("S10_VBM_MIN_RANGE_PCT_OF_AVG", "1.2")),  # 120% of avg M5 range
-        "CONFIRM_VOL_MULT": float(os.getenv("S10_CONFIRM_VOL_MULT", "1.5")),  # vs 10-bar avg
-        "REJECTION_WICK_RATIO": float(os.getenv("S10_REJECTION_WICK_RATIO", "0.6")),          # AA rejection candle wick ratio
-        "LIMIT_EXPIRY_M5_CANDLES": int(os.getenv("S10_LIMIT_EXPIRY_M5_CANDLES", "2")),
-        "LIMIT_EXPIRY_M15_CANDLES": int(os.getenv("S10_LIMIT_EXPIRY_M15_CANDLES", "3")),
-        # Sizing: reuse S5 model (fixed USDT risk with min-notional enforcement)
-        "RISK_USD": float(os.getenv("S10_RISK_USD", os.getenv("S5_RISK_USD", "0.50"))),
-        # Symbol universe defaults to S5 symbols
-        "SYMBOLS": os.getenv(
-            "S10_SYMBOLS",
-            os.getenv("S5_SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT")
-        ).split(","),
-    },
-    "STRATEGY_11": {  # Mean Reversion with BB (1H), RSI(4H) filter and ADX(1H/4H)
-        "BB_LENGTH": int(os.getenv("S11_BB_LENGTH", "20")),
-        "BB_STD": float(os.getenv("S11_BB_STD", "2.0")),
-        "RSI_PERIOD_4H": int(os.getenv("S11_RSI_PERIOD_4H", "14")),
-        "RSI_LONG_MIN": float(os.getenv("S11_RSI_LONG_MIN", "55")),   # 4H RSI > 55 only longs
-        "RSI_SHORT_MAX": float(os.getenv("S11_RSI_SHORT_MAX", "45")), # 4H RSI < 45 only shorts
-        "ADX_PERIOD_H1": int(os.getenv("S11_ADX_PERIOD_H1", "14")),
-        "ADX_PERIOD_4H": int(os.getenv("S11_ADX_PERIOD_4H", "14")),
-        "ADX_MIN_H1": float(os.getenv("S11_ADX_MIN_H1", "20")),
-        "ADX_MIN_4H": float(os.getenv("S11_ADX_MIN_4H", "25")),
-        "ATR_PERIOD_H1": int(os.getenv("S11_ATR_PERIOD_H1", "14")),
-        "RISK_USD": float(os.getenv("S11_RISK_USD", os.getenv("S4_RISK_USD", "0.50"))),
-        "ORDER_EXPIRY_HOURS": int(os.getenv("S11_ORDER_EXPIRY_HOURS", "2"))
-    },
-    "STRATEGY_12": {  # Small-account system — SuperTrend + MACD + RSI (pandas-ta)
-        "ST_PERIOD": int(os.getenv("S12_ST_PERIOD", "10")),
-        "ST_MULT": float(os.getenv("S12_ST_MULT", "3.0")),
-        "RSI_LEN": int(os.getenv("S12_RSI_LEN", "14")),
-        "MACD_FAST": int(os.getenv("S12_MACD_FAST", "12")),
-        "MACD_SLOW": int(os.getenv("S12_MACD_SLOW", "26")),
-        "MACD_SIGNAL": int(os.getenv("S12_MACD_SIGNAL", "9")),
-        "SWING_LOOKBACK": int(os.getenv("S12_SWING_LOOKBACK", "5")),
-        "RR": float(os.getenv("S12_RR", "1.5")),
-        "RISK_USD": float(os.getenv("S12_RISK_USD", os.getenv("S4_RISK_USD", "0.50"))),
-        "ORDER_EXPIRY_CANDLES": int(os.getenv("S12_ORDER_EXPIRY_CANDLES", os.getenv("ORDER_EXPIRY_CANDLES", "2")))
-    },
-    "STRATEGY_EXIT_PARAMS": {
-        "1": {  # BB strategy
-            "ATR_MULTIPLIER": float(os.getenv("S1_ATR_MULTIPLIER", "1.5")),
-            "BE_TRIGGER": float(os.getenv("S1_BE_TRIGGER", "0.008")),
-            "BE_SL_OFFSET": float(os.getenv("S1_BE_SL_OFFSET", "0.002"))
-        },
-        "2": {  # SuperTrend strategy
-            "ATR_MULTIPLIER": float(os.getenv("S2_ATR_MULTIPLIER", "2.0")),
-            "BE_TRIGGER": float(os.getenv("S2_BE_TRIGGER", "0.006")),
-            "BE_SL_OFFSET": float(os.getenv("S2_BE_SL_OFFSET", "0.001"))
-        },
-        "3": {  # MA Cross strategy (uses its own trailing config)
-            "ATR_MULTIPLIER": float(os.getenv("S3_TRAIL_ATR_MULT", "3.0")),  # Value from S3 config
-            "BE_TRIGGER": 0.0,  # Not used in S3
-            "BE_SL_OFFSET": 0.0  # Not used in S3
-        },
-        "4": {  # 3x SuperTrend strategy (custom trailing logic)
-            "ATR_MULTIPLIER": float(os.getenv("S4_TRAIL_ATR_MULT", "3.0")),  # Value from S4 config
-            "BE_TRIGGER": 0.0,  # Not used in S4
-            "BE_SL_OFFSET": 0.0  # Not used in S4
-        },
-        "5": {  # Advanced H1/M15 strategy (custom trailing logic)
-            "ATR_MULTIPLIER": float(os.getenv("S5_TRAIL_ATR_MULT", "1.0")),
-            "BE_TRIGGER": 0.0,
-            "BE_SL_OFFSET": 0.0
-        },
-        "7": {  # SMC trailing is structural; keep generic minimal trailing disabled by default
-            "ATR_MULTIPLIER": float(os.getenv("S7_TRAIL_ATR_MULT", "0.0")),
-            "BE_TRIGGER": 0.0,
-            "BE_SL_OFFSET": 0.0
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ("true", "1", "yes")
+
+
+def _env_list(name: str, default: str) -> tuple:
+    return tuple(os.environ.get(name, default).split(","))
+
+
+_DEFAULT_SYMBOLS = "BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,AVAXUSDT,LTCUSDT,ADAUSDT,XRPUSDT,LINKUSDT,DOTUSDT"
+
+
+class ConfigSection:
+    """
+    Mapping-style read access over a frozen config dataclass, so older call sites
+    (cfg['KEY'], cfg.get('KEY', default), 'KEY' in cfg) keep working next to cfg.key.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key.lower())
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key.lower(), default)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and key.lower() in self.__dataclass_fields__
+
+    def keys(self) -> list:
+        return [f.name.upper() for f in fields(self)]
+
+    def items(self) -> list:
+        return [(f.name.upper(), getattr(self, f.name)) for f in fields(self)]
+
+
+@dataclass(slots=True, frozen=True)
+class S1Config(ConfigSection):  # Original Bollinger Band strategy
+    bb_length: int
+    bb_std: float
+    min_rsi_for_buy: int
+    max_rsi_for_sell: int
+    max_volatility_for_entry: float
+
+
+@dataclass(slots=True, frozen=True)
+class S2Config(ConfigSection):  # New SuperTrend strategy
+    supertrend_period: int
+    supertrend_multiplier: float
+    adx_threshold: int
+    min_adx_for_entry: int
+    min_rsi_sell: int
+    max_rsi_sell: int
+    min_rsi_buy: int
+    max_rsi_buy: int
+    min_macd_conf: float
+    ema_confirmation_period: int
+    min_volatility_for_entry: float
+    max_volatility_for_entry: float
+    base_confidence_threshold: float
+    low_vol_conf_threshold: float
+    low_vol_conf_level: float
+    high_vol_conf_threshold: float
+    high_vol_conf_adjustment: float
+
+
+@dataclass(slots=True, frozen=True)
+class S3Config(ConfigSection):  # Simple MA Cross strategy
+    fast_ma: int
+    slow_ma: int
+    atr_sl_mult: float
+    fallback_sl_pct: float
+    trailing_enabled: bool
+    trailing_atr_period: int
+    trailing_atr_multiplier: float
+    trailing_activation_profit_pct: float
+
+
+@dataclass(slots=True, frozen=True)
+class S4Config(ConfigSection):  # 3x SuperTrend strategy
+    st1_period: int
+    st1_mult: float
+    st2_period: int
+    st2_mult: float
+    st3_period: int
+    st3_mult: float
+    risk_usd: float  # Fixed risk amount
+    volatility_exit_atr_mult: float
+    ema_filter_period: int
+    ema_filter_enabled: bool
+
+
+@dataclass(slots=True, frozen=True)
+class S5Config(ConfigSection):  # Advanced crypto-futures strategy (H1 trend + M15 execution)
+    h1_st_period: int
+    h1_st_mult: float
+    ema_fast: int
+    ema_slow: int
+    atr_period: int
+    rsi_period: int
+    vol_min_pct: float
+    vol_max_pct: float
+    risk_usd: float  # Same risk model as S4 (fixed risk)
+    tp1_close_pct: float
+    trail_atr_mult: float
+    trail_buffer_mult: float
+    be_buffer_pct: float  # buffer to cover fees
+    max_trades_per_symbol_per_day: int
+    symbols: tuple
+
+
+@dataclass(slots=True, frozen=True)
+class S6Config(ConfigSection):  # Price-Action only (single high-probability trade per day)
+    atr_period: int
+    atr_buffer_mult: float
+    follow_through_range_ratio: float
+    vol_ma_len: int
+    limit_expiry_candles: int
+    session_start_utc_hour: int
+    session_end_utc_hour: int
+    risk_usd: float
+    enforce_one_trade_per_day: bool
+    symbols: tuple
+
+
+@dataclass(slots=True, frozen=True)
+class S7Config(ConfigSection):  # SMC (Smart Money Concepts) execution - price-action only
+    atr_period: int
+    atr_buffer: float
+    bos_lookback_h1: int
+    ob_min_body_ratio: float
+    rejection_wick_ratio: float
+    limit_expiry_candles: int
+    use_min_notional: bool
+    allow_m5_micro_confirm: bool
+    symbols: tuple
+    risk_usd: float  # kept optional; default 0 uses min notional
+
+
+@dataclass(slots=True, frozen=True)
+class S8Config(ConfigSection):  # SMC + Chart-Pattern Sniper Entry — break+retest inside OB/FVG
+    atr_period: int
+    atr_buffer: float
+    bos_lookback_h1: int
+    vol_ma_len: int
+    retest_expiry_candles: int
+    use_ob: bool
+    use_fvg: bool
+    symbols: tuple
+
+
+@dataclass(slots=True, frozen=True)
+class S9Config(ConfigSection):  # SMC Scalping — high-win probability (M1/M5 execution, H1 BOS, H4/D bias)
+    rejection_wick_ratio: float
+    m1_range_avg_len: int
+    m5_atr_period: int
+    atr_buffer_mult_m5: float
+    max_stop_to_avg_range_m5: float
+    limit_expiry_m1_candles: int
+    bos_lookback_h1_min: int
+    bos_lookback_h1_max: int
+    session_start_utc_hour: int
+    session_end_utc_hour: int
+    risk_usd: float  # Use S6 fixed-risk sizing model
+    symbols: tuple
+    high_win_tp_r_mult: float  # Conservative target 0.5R
+    micro_sweep_lookback_m1: int
+    sweep_reclaim_max_bars: int
+
+
+@dataclass(slots=True, frozen=True)
+class S10Config(ConfigSection):  # Combined Active-Adaptive (AA) + Volatility Breakout Momentum (VBM)
+    h1_st_period: int
+    h1_st_mult: float
+    ema_fast: int
+    ema_slow: int
+    atr_period_m15: int
+    atr_period_m5: int
+    vbm_range_min_m5: int
+    vbm_range_max_m5: int
+    vbm_atr_mult_stop: float
+    vbm_min_range_pct_of_avg: float
+    confirm_vol_mult: float
+    rejection_wick_ratio: float
+    limit_expiry_m5_candles: int
+    limit_expiry_m15_candles: int
+    risk_usd: float
+    symbols: tuple
+
+
+@dataclass(slots=True, frozen=True)
+class S11Config(ConfigSection):  # Mean Reversion with BB (1H), RSI(4H) filter and ADX(1H/4H)
+    bb_length: int
+    bb_std: float
+    rsi_period_4h: int
+    rsi_long_min: float
+    rsi_short_max: float
+    adx_period_h1: int
+    adx_period_4h: int
+    adx_min_h1: float
+    adx_min_4h: float
+    atr_period_h1: int
+    risk_usd: float
+    order_expiry_hours: int
+
+
+@dataclass(slots=True, frozen=True)
+class S12Config(ConfigSection):  # Small-account system — SuperTrend + MACD + RSI
+    st_period: int
+    st_mult: float
+    rsi_len: int
+    macd_fast: int
+    macd_slow: int
+    macd_signal: int
+    swing_lookback: int
+    rr: float
+    risk_usd: float
+    order_expiry_candles: int
+
+
+@dataclass(slots=True, frozen=True)
+class ExitParams(ConfigSection):
+    atr_multiplier: float
+    be_trigger: float
+    be_sl_offset: float
+
+
+@dataclass(slots=True, frozen=True)
+class BotConfig:
+    """Per-strategy settings parsed from the environment once at startup."""
+    s1: S1Config
+    s2: S2Config
+    s3: S3Config
+    s4: S4Config
+    s5: S5Config
+    s6: S6Config
+    s7: S7Config
+    s8: S8Config
+    s9: S9Config
+    s10: S10Config
+    s11: S11Config
+    s12: S12Config
+    exit_params: Dict[int, ExitParams]
+
+
+def load_config() -> BotConfig:
+    """Parse every strategy setting from the environment. Bad values fail here, at startup."""
+    return BotConfig(
+        s1=S1Config(
+            bb_length=_env_int("BB_LENGTH_CUSTOM", "20"),
+            bb_std=_env_float("BB_STD_CUSTOM", "2.5"),
+            min_rsi_for_buy=_env_int("S1_MIN_RSI_FOR_BUY", "30"),
+            max_rsi_for_sell=_env_int("S1_MAX_RSI_FOR_SELL", "70"),
+            max_volatility_for_entry=_env_float("S1_MAX_VOL_ENTRY", "0.03"),
+        ),
+        s2=S2Config(
+            supertrend_period=_env_int("ST_PERIOD", "7"),
+            supertrend_multiplier=_env_float("ST_MULTIPLIER", "2.0"),
+            adx_threshold=_env_int("ST_ADX_THRESHOLD", "15"),
+            min_adx_for_entry=_env_int("S2_MIN_ADX_ENTRY", "15"),
+            min_rsi_sell=_env_int("ST_MIN_RSI_SELL", "35"),
+            max_rsi_sell=_env_int("ST_MAX_RSI_SELL", "75"),
+            min_rsi_buy=_env_int("ST_MIN_RSI_BUY", "25"),
+            max_rsi_buy=_env_int("ST_MAX_RSI_BUY", "65"),
+            min_macd_conf=_env_float("ST_MIN_MACD_CONF", "0.3"),
+            ema_confirmation_period=_env_int("ST_EMA_CONF_PERIOD", "20"),
+            min_volatility_for_entry=_env_float("S2_MIN_VOL_ENTRY", "0.003"),
+            max_volatility_for_entry=_env_float("S2_MAX_VOL_ENTRY", "0.035"),
+            base_confidence_threshold=_env_float("S2_BASE_CONF_THRESH", "55.0"),
+            low_vol_conf_threshold=_env_float("S2_LOW_VOL_THRESH", "0.005"),
+            low_vol_conf_level=_env_float("S2_LOW_VOL_LEVEL", "50.0"),
+            high_vol_conf_threshold=_env_float("S2_HIGH_VOL_THRESH", "0.01"),
+            high_vol_conf_adjustment=_env_float("S2_HIGH_VOL_ADJUST", "5.0"),
+        ),
+        s3=S3Config(
+            fast_ma=_env_int("S3_FAST_MA", 9),
+            slow_ma=_env_int("S3_SLOW_MA", 21),
+            atr_sl_mult=_env_float("S3_ATR_SL_MULT", 1.5),
+            fallback_sl_pct=_env_float("S3_FALLBACK_SL_PCT", 0.015),
+            trailing_enabled=_env_bool("S3_TRAILING_ENABLED", "true"),
+            trailing_atr_period=_env_int("S3_TRAILING_ATR_PERIOD", "14"),
+            trailing_atr_multiplier=_env_float("S3_TRAILING_ATR_MULTIPLIER", "3.0"),
+            trailing_activation_profit_pct=_env_float("S3_TRAILING_ACTIVATION_PROFIT_PCT", "0.01"),  # 1% profit
+        ),
+        s4=S4Config(
+            st1_period=_env_int("S4_ST1_PERIOD", "12"),
+            st1_mult=_env_float("S4_ST1_MULT", "3"),
+            st2_period=_env_int("S4_ST2_PERIOD", "11"),
+            st2_mult=_env_float("S4_ST2_MULT", "2.0"),
+            st3_period=_env_int("S4_ST3_PERIOD", "10"),
+            st3_mult=_env_float("S4_ST3_MULT", "1.4"),
+            risk_usd=_env_float("S4_RISK_USD", "0.50"),
+            volatility_exit_atr_mult=_env_float("S4_VOLATILITY_EXIT_ATR_MULT", "3.0"),
+            ema_filter_period=_env_int("S4_EMA_FILTER_PERIOD", "200"),
+            ema_filter_enabled=_env_bool("S4_EMA_FILTER_ENABLED", "false"),
+        ),
+        s5=S5Config(
+            h1_st_period=_env_int("S5_H1_ST_PERIOD", "10"),
+            h1_st_mult=_env_float("S5_H1_ST_MULT", "3.0"),
+            ema_fast=_env_int("S5_EMA_FAST", "21"),
+            ema_slow=_env_int("S5_EMA_SLOW", "55"),
+            atr_period=_env_int("S5_ATR_PERIOD", "14"),
+            rsi_period=_env_int("S5_RSI_PERIOD", "14"),
+            vol_min_pct=_env_float("S5_VOL_MIN_PCT", "0.003"),  # 0.3%
+            vol_max_pct=_env_float("S5_VOL_MAX_PCT", "0.035"),  # 3.5%
+            risk_usd=_env_float("S5_RISK_USD", "0.50"),
+            tp1_close_pct=_env_float("S5_TP1_CLOSE_PCT", "0.3"),  # 30% at 1R
+            trail_atr_mult=_env_float("S5_TRAIL_ATR_MULT", "1.0"),
+            trail_buffer_mult=_env_float("S5_TRAIL_BUFFER_MULT", "0.25"),
+            be_buffer_pct=_env_float("S5_BE_BUFFER_PCT", "0.0005"),  # 0.05%
+            max_trades_per_symbol_per_day=_env_int("S5_MAX_TRADES_PER_SYMBOL_PER_DAY", "2"),
+            symbols=_env_list("S5_SYMBOLS", _DEFAULT_SYMBOLS),
+        ),
+        s6=S6Config(
+            atr_period=_env_int("S6_ATR_PERIOD", "14"),
+            atr_buffer_mult=_env_float("S6_ATR_BUFFER", "0.25"),
+            follow_through_range_ratio=_env_float("S6_FOLLOW_THROUGH_RATIO", "0.7"),
+            vol_ma_len=_env_int("S6_VOL_MA_LEN", "10"),
+            limit_expiry_candles=_env_int("S6_LIMIT_EXPIRY_CANDLES", "3"),
+            session_start_utc_hour=_env_int("S6_SESSION_START_HOUR", "7"),
+            session_end_utc_hour=_env_int("S6_SESSION_END_HOUR", "15"),
+            risk_usd=_env_float("S6_RISK_USD", "0.50"),
+            enforce_one_trade_per_day=_env_bool("S6_ENFORCE_ONE_PER_DAY", "true"),
+            symbols=_env_list("S6_SYMBOLS", _DEFAULT_SYMBOLS),
+        ),
+        s7=S7Config(
+            atr_period=_env_int("S7_ATR_PERIOD", "14"),
+            atr_buffer=_env_float("S7_ATR_BUFFER", "0.25"),
+            bos_lookback_h1=_env_int("S7_BOS_LOOKBACK_H1", "72"),
+            ob_min_body_ratio=_env_float("S7_OB_MIN_BODY_RATIO", "0.5"),
+            rejection_wick_ratio=_env_float("S7_REJECTION_WICK_RATIO", "0.6"),
+            limit_expiry_candles=_env_int("S7_LIMIT_EXPIRY_CANDLES", "4"),
+            use_min_notional=_env_bool("S7_USE_MIN_NOTIONAL", "true"),
+            allow_m5_micro_confirm=_env_bool("S7_ALLOW_M5_MICRO_CONFIRM", "false"),
+            symbols=_env_list("S7_SYMBOLS", _DEFAULT_SYMBOLS),
+            risk_usd=_env_float("S7_RISK_USD", "0.0"),
+        ),
+        s8=S8Config(
+            atr_period=_env_int("S8_ATR_PERIOD", "14"),
+            atr_buffer=_env_float("S8_ATR_BUFFER", "0.25"),
+            bos_lookback_h1=_env_int("S8_BOS_LOOKBACK_H1", "72"),
+            vol_ma_len=_env_int("S8_VOL_MA_LEN", "10"),
+            retest_expiry_candles=_env_int("S8_RETEST_EXPIRY_CANDLES", "3"),
+            use_ob=_env_bool("S8_USE_OB", "true"),
+            use_fvg=_env_bool("S8_USE_FVG", "true"),
+            symbols=_env_list("S8_SYMBOLS", _DEFAULT_SYMBOLS),
+        ),
+        s9=S9Config(
+            rejection_wick_ratio=_env_float("S9_REJECTION_WICK_RATIO", "0.7"),
+            m1_range_avg_len=_env_int("S9_M1_RANGE_AVG_LEN", "20"),
+            m5_atr_period=_env_int("S9_M5_ATR_PERIOD", "14"),
+            atr_buffer_mult_m5=_env_float("S9_ATR_BUFFER_MULT_M5", "0.6"),
+            max_stop_to_avg_range_m5=_env_float("S9_MAX_STOP_TO_AVG_RANGE_M5", "1.5"),
+            limit_expiry_m1_candles=_env_int("S9_LIMIT_EXPIRY_M1_CANDLES", "3"),
+            bos_lookback_h1_min=_env_int("S9_BOS_LOOKBACK_H1_MIN", "12"),
+            bos_lookback_h1_max=_env_int("S9_BOS_LOOKBACK_H1_MAX", "48"),
+            session_start_utc_hour=_env_int("S9_SESSION_START_HOUR", "7"),
+            session_end_utc_hour=_env_int("S9_SESSION_END_HOUR", "15"),
+            risk_usd=_env_float("S9_RISK_USD", "0.50"),
+            symbols=_env_list("S9_SYMBOLS", _DEFAULT_SYMBOLS),
+            high_win_tp_r_mult=_env_float("S9_HIGH_WIN_TP_R_MULT", "0.5"),
+            micro_sweep_lookback_m1=_env_int("S9_MICRO_SWEEP_LOOKBACK_M1", "20"),
+            sweep_reclaim_max_bars=_env_int("S9_SWEEP_RECLAIM_MAX_BARS", "5"),
+        ),
+        s10=S10Config(
+            h1_st_period=_env_int("S10_H1_ST_PERIOD", "10"),  # SuperTrend on H1
+            h1_st_mult=_env_float("S10_H1_ST_MULT", "3.0"),
+            ema_fast=_env_int("S10_EMA_FAST", "21"),  # EMA 21/55 on H1 and M15
+            ema_slow=_env_int("S10_EMA_SLOW", "55"),
+            atr_period_m15=_env_int("S10_ATR_PERIOD_M15", "14"),  # Wilder ATR on M15 for AA
+            atr_period_m5=_env_int("S10_ATR_PERIOD_M5", "14"),  # Wilder ATR on M5 for VBM
+            vbm_range_min_m5=_env_int("S10_VBM_RANGE_MIN_M5", "6"),  # 30m consolidation on M5
+            vbm_range_max_m5=_env_int("S10_VBM_RANGE_MAX_M5", "12"),  # 60m consolidation on M5
+            vbm_atr_mult_stop=_env_float("S10_VBM_ATR_MULT_STOP", "1.75"),
+            vbm_min_range_pct_of_avg=_env_float("S10_VBM_MIN_RANGE_PCT_OF_AVG", "1.2"),  # 120% of avg M5 range
+            confirm_vol_mult=_env_float("S10_CONFIRM_VOL_MULT", "1.5"),  # vs 10-bar avg
+            rejection_wick_ratio=_env_float("S10_REJECTION_WICK_RATIO", "0.6"),  # AA rejection candle wick ratio
+            limit_expiry_m5_candles=_env_int("S10_LIMIT_EXPIRY_M5_CANDLES", "2"),
+            limit_expiry_m15_candles=_env_int("S10_LIMIT_EXPIRY_M15_CANDLES", "3"),
+            # Sizing: reuse S5 model (fixed USDT risk with min-notional enforcement)
+            risk_usd=_env_float("S10_RISK_USD", _env_str("S5_RISK_USD", "0.50")),
+            # Symbol universe defaults to S5 symbols
+            symbols=_env_list("S10_SYMBOLS", _env_str("S5_SYMBOLS", _DEFAULT_SYMBOLS)),
+        ),
+        s11=S11Config(
+            bb_length=_env_int("S11_BB_LENGTH", "20"),
+            bb_std=_env_float("S11_BB_STD", "2.0"),
+            rsi_period_4h=_env_int("S11_RSI_PERIOD_4H", "14"),
+            rsi_long_min=_env_float("S11_RSI_LONG_MIN", "55"),  # 4H RSI > 55 only longs
+            rsi_short_max=_env_float("S11_RSI_SHORT_MAX", "45"),  # 4H RSI < 45 only shorts
+            adx_period_h1=_env_int("S11_ADX_PERIOD_H1", "14"),
+            adx_period_4h=_env_int("S11_ADX_PERIOD_4H", "14"),
+            adx_min_h1=_env_float("S11_ADX_MIN_H1", "20"),
+            adx_min_4h=_env_float("S11_ADX_MIN_4H", "25"),
+            atr_period_h1=_env_int("S11_ATR_PERIOD_H1", "14"),
+            risk_usd=_env_float("S11_RISK_USD", _env_str("S4_RISK_USD", "0.50")),
+            order_expiry_hours=_env_int("S11_ORDER_EXPIRY_HOURS", "2"),
+        ),
+        s12=S12Config(
+            st_period=_env_int("S12_ST_PERIOD", "10"),
+            st_mult=_env_float("S12_ST_MULT", "3.0"),
+            rsi_len=_env_int("S12_RSI_LEN", "14"),
+            macd_fast=_env_int("S12_MACD_FAST", "12"),
+            macd_slow=_env_int("S12_MACD_SLOW", "26"),
+            macd_signal=_env_int("S12_MACD_SIGNAL", "9"),
+            swing_lookback=_env_int("S12_SWING_LOOKBACK", "5"),
+            rr=_env_float("S12_RR", "1.5"),
+            risk_usd=_env_float("S12_RISK_USD", _env_str("S4_RISK_USD", "0.50")),
+            order_expiry_candles=_env_int("S12_ORDER_EXPIRY_CANDLES", _env_str("ORDER_EXPIRY_CANDLES", "2")),
+        ),
+        exit_params={
+            1: ExitParams(  # BB strategy
+                atr_multiplier=_env_float("S1_ATR_MULTIPLIER", "1.5"),
+                be_trigger=_env_float("S1_BE_TRIGGER", "0.008"),
+                be_sl_offset=_env_float("S1_BE_SL_OFFSET", "0.002"),
+            ),
+            2: ExitParams(  # SuperTrend strategy
+                atr_multiplier=_env_float("S2_ATR_MULTIPLIER", "2.0"),
+                be_trigger=_env_float("S2_BE_TRIGGER", "0.006"),
+                be_sl_offset=_env_float("S2_BE_SL_OFFSET", "0.001"),
+            ),
+            # S3/S4/S5 use their own trailing logic; BE fields are unused there
+            3: ExitParams(atr_multiplier=_env_float("S3_TRAIL_ATR_MULT", "3.0"), be_trigger=0.0, be_sl_offset=0.0),
+            4: ExitParams(atr_multiplier=_env_float("S4_TRAIL_ATR_MULT", "3.0"), be_trigger=0.0, be_sl_offset=0.0),
+            5: ExitParams(atr_multiplier=_env_float("S5_TRAIL_ATR_MULT", "1.0"), be_trigger=0.0, be_sl_offset=0.0),
+            # SMC trailing is structural; keep generic minimal trailing disabled by default
+            7: ExitParams(atr_multiplier=_env_float("S7_TRAIL_ATR_MULT", "0.0"), be_trigger=0.0, be_sl_offset=0.0),
+            # S10 uses S5-style management; no generic BE/TP here. Less aggressive trailing by default.
+            10: ExitParams(
+                atr_multiplier=_env_float("S10_TRAIL_ATR_MULT", _env_str("S5_TRAIL_ATR_MULT", "1.75")),
+                be_trigger=0.0,
+                be_sl_offset=0.0,
+            ),
         },
-        "10": {  # S10 uses S5-style management; no generic BE/TP here
-            # Make trailing less aggressive by default (increase ATR multiplier)
-            "ATR_MULTIPLIER": float(os.getenv("S10_TRAIL_ATR_MULT", os.getenv("S5_TRAIL_ATR_MULT", "1.75"))),
-            "BE_TRIGGER": 0.0,
-            "BE_SL_OFFSET": 0.0
-        }
-    },
+    )
+
+
+def _parse_strategy_mode(raw: str) -> list[int]:
+    try:
+        return [int(x.strip()) for x in raw.split(',')]
+    except ValueError:
+        log.error(f"Invalid STRATEGY_MODE: '{raw}'. Must be a comma-separated list of numbers. Defaulting to auto (0).")
+        return [0]
+
+
+CFG = load_config()
 
-    "SMA_LEN": int(os.getenv("SMA_LEN", "200")),
-    "RSI_LEN": int(os.getenv("RSI_LEN", "2")),
+MAX_STRATEGY_ID = 12
+
+
+def _exit_param_table(attr: str) -> np.ndarray:
+    """Per-strategy exit parameter indexed by strategy id; ids without an entry use strategy 1's."""
+    default = getattr(CFG.exit_params[1], attr)
+    return np.array(
+        [getattr(CFG.exit_params.get(sid), attr, default) for sid in range(MAX_STRATEGY_ID + 1)],
+        dtype=np.float64,
+    )
+
+
+# Exit params are frozen after load, so the monitor loop reads these instead of the nested dicts.
+EXIT_ATR_MULT = _exit_param_table("atr_multiplier")
+EXIT_BE_TRIGGER = _exit_param_table("be_trigger")
+EXIT_BE_SL_OFFSET = _exit_param_table("be_sl_offset")
+
+
+def _exit_index(strategy_id) -> int:
+    """Row in the EXIT_* tables for a strategy id given as int or str; unknown ids map to 1."""
+    try:
+        sid = int(strategy_id)
+    except (TypeError, ValueError):
+        return 1
+    return sid if 0 < sid <= MAX_STRATEGY_ID else 1
+
+# Strategy sections are frozen; the top-level scalars stay in a plain dict because
+# /setparam edits them at runtime.
+CONFIG = {
+    # --- STRATEGY ---
+    "STRATEGY_MODE": _parse_strategy_mode(_env_str("STRATEGY_MODE", "5,6,7,8,9,10")),
+    "STRATEGY_1": CFG.s1,
+    "STRATEGY_2": CFG.s2,
+    "STRATEGY_3": CFG.s3,
+    "STRATEGY_4": CFG.s4,
+    "STRATEGY_5": CFG.s5,
+    "STRATEGY_6": CFG.s6,
+    "STRATEGY_7": CFG.s7,
+    "STRATEGY_8": CFG.s8,
+    "STRATEGY_9": CFG.s9,
+    "STRATEGY_10": CFG.s10,
+    "STRATEGY_11": CFG.s11,
+    "STRATEGY_12": CFG.s12,
+    "STRATEGY_EXIT_PARAMS": CFG.exit_params,
+    "SMA_LEN": _env_int("SMA_LEN", "200"),
+    "RSI_LEN": _env_int("RSI_LEN", "2"),
     
     # --- ORDER MANAGEMENT ---
-    "USE_LIMIT_ENTRY": os.getenv("USE_LIMIT_ENTRY", "true").lower() in ("true", "1", "yes"),
-    "ORDER_ENTRY_TIMEOUT": int(os.getenv("ORDER_ENTRY_TIMEOUT", "1")), # 1 candle timeout for limit orders
-    "ORDER_EXPIRY_CANDLES": int(os.getenv("ORDER_EXPIRY_CANDLES", "2")), # How many candles a limit order is valid for
-    "ORDER_LIMIT_OFFSET_PCT": float(os.getenv("ORDER_LIMIT_OFFSET_PCT", "0.005")),
-    "SL_BUFFER_PCT": float(os.getenv("SL_BUFFER_PCT", "0.02")),
-    "LOSS_COOLDOWN_HOURS": int(os.getenv("LOSS_COOLDOWN_HOURS", "6")),
+    "USE_LIMIT_ENTRY": _env_bool("USE_LIMIT_ENTRY", "true"),
+    "ORDER_ENTRY_TIMEOUT": _env_int("ORDER_ENTRY_TIMEOUT", "1"), # 1 candle timeout for limit orders
+    "ORDER_EXPIRY_CANDLES": _env_int("ORDER_EXPIRY_CANDLES", "2"), # How many candles a limit order is valid for
+    "ORDER_LIMIT_OFFSET_PCT": _env_float("ORDER_LIMIT_OFFSET_PCT", "0.005"),
+    "SL_BUFFER_PCT": _env_float("SL_BUFFER_PCT", "0.02"),
+    "LOSS_COOLDOWN_HOURS": _env_int("LOSS_COOLDOWN_HOURS", "6"),
 
     # --- FAST MOVE FILTER (avoids entry on volatile candles) ---
-    "FAST_MOVE_FILTER_ENABLED": os.getenv("FAST_MOVE_FILTER_ENABLED", "true").lower() in ("true", "1", "yes"),
-    "FAST_MOVE_ATR_MULT": float(os.getenv("FAST_MOVE_ATR_MULT", "2.0")), # Candle size > ATR * mult
-    "FAST_MOVE_RETURN_PCT": float(os.getenv("FAST_MOVE_RETURN_PCT", "0.005")), # 1m return > 0.5%
-    "FAST_MOVE_VOL_MULT": float(os.getenv("FAST_MOVE_VOL_MULT", "2.0")), # Volume > avg_vol * mult
+    "FAST_MOVE_FILTER_ENABLED": _env_bool("FAST_MOVE_FILTER_ENABLED", "true"),
+    "FAST_MOVE_ATR_MULT": _env_float("FAST_MOVE_ATR_MULT", "2.0"), # Candle size > ATR * mult
+    "FAST_MOVE_RETURN_PCT": _env_float("FAST_MOVE_RETURN_PCT", "0.005"), # 1m return > 0.5%
+    "FAST_MOVE_VOL_MULT": _env_float("FAST_MOVE_VOL_MULT", "2.0"), # Volume > avg_vol * mult
 
     # --- ADX TREND FILTER ---
-    "ADX_FILTER_ENABLED": os.getenv("ADX_FILTER_ENABLED", "true").lower() in ("true", "1", "yes"),
-    "ADX_PERIOD": int(os.getenv("ADX_PERIOD", "14")),
-    "ADX_THRESHOLD": float(os.getenv("ADX_THRESHOLD", "25.0")),
+    "ADX_FILTER_ENABLED": _env_bool("ADX_FILTER_ENABLED", "true"),
+    "ADX_PERIOD": _env_int("ADX_PERIOD", "14"),
+    "ADX_THRESHOLD": _env_float("ADX_THRESHOLD", "25.0"),
 
     # --- TP/SL & TRADE MANAGEMENT ---
-    "PARTIAL_TP_CLOSE_PCT": float(os.getenv("PARTIAL_TP_CLOSE_PCT", "0.8")),
+    "PARTIAL_TP_CLOSE_PCT": _env_float("PARTIAL_TP_CLOSE_PCT", "0.8"),
     # BE_TRIGGER_PROFIT_PCT and BE_SL_PROFIT_PCT are now in STRATEGY_EXIT_PARAMS
     
     # --- CORE ---
-    "SYMBOLS": os.getenv("SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT").split(","),
-    "TIMEFRAME": os.getenv("TIMEFRAME", "15m"),
-    "SCAN_INTERVAL": int(os.getenv("SCAN_INTERVAL", "60")),
-    "CANDLE_SYNC_BUFFER_SEC": int(os.getenv("CANDLE_SYNC_BUFFER_SEC", "10")),
-    "MAX_CONCURRENT_TRADES": int(os.getenv("MAX_CONCURRENT_TRADES", "3")),
-    "START_MODE": os.getenv("START_MODE", "running").lower(),
-    "SESSION_FREEZE_ENABLED": os.getenv("SESSION_FREEZE_ENABLED", "true").lower() in ("true", "1", "yes"),
+    "SYMBOLS": list(_env_list("SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT")),
+    "TIMEFRAME": _env_str("TIMEFRAME", "15m"),
+    "SCAN_INTERVAL": _env_int("SCAN_INTERVAL", "60"),
+    "CANDLE_SYNC_BUFFER_SEC": _env_int("CANDLE_SYNC_BUFFER_SEC", "10"),
+    "MAX_CONCURRENT_TRADES": _env_int("MAX_CONCURRENT_TRADES", "3"),
+    "START_MODE": _env_str("START_MODE", "running").lower(),
+    "SESSION_FREEZE_ENABLED": _env_bool("SESSION_FREEZE_ENABLED", "true"),
 
     # --- ACCOUNT MODE ---
     # Local preference for hedging (dualSidePosition). The live exchange mode takes precedence at runtime.
-    "HEDGING_ENABLED": os.getenv("HEDGING_ENABLED", "false").lower() in ("true", "1", "yes"),
+    "HEDGING_ENABLED": _env_bool("HEDGING_ENABLED", "false"),
 
     # --- MONITORING / PERFORMANCE ---
     # Warn if a single monitor loop exceeds this duration (in seconds)
-    "MONITOR_LOOP_THRESHOLD_SEC": float(os.getenv("MONITOR_LOOP_THRESHOLD_SEC", "5")),
+    "MONITOR_LOOP_THRESHOLD_SEC": _env_float("MONITOR_LOOP_THRESHOLD_SEC", "5"),
+    # Positions filled more recently than this are attributed from the M15 candles alone
+    # (no higher-timeframe fetches) when importing them. 0 disables the fast path.
+    "FAST_INFER_THRESHOLD_SEC": _env_int("FAST_INFER_THRESHOLD_SEC", "900"),
 
 
 
@@ -366,55 +726,32 @@ CONFIG = {
 
     # --- INDICATOR SETTINGS ---
     # "BB_LENGTH_CUSTOM" and "BB_STD_CUSTOM" are now in STRATEGY_1
-    "ATR_LENGTH": int(os.getenv("ATR_LENGTH", "14")),
+    "ATR_LENGTH": _env_int("ATR_LENGTH", "14"),
     # "SL_TP_ATR_MULT" is now in STRATEGY_EXIT_PARAMS as "ATR_MULTIPLIER"
 
-    "RISK_SMALL_BALANCE_THRESHOLD": float(os.getenv("RISK_SMALL_BALANCE_THRESHOLD", "50.0")),
-    "RISK_SMALL_FIXED_USDT": float(os.getenv("RISK_SMALL_FIXED_USDT", "0.5")),
-    "RISK_SMALL_FIXED_USDT_STRATEGY_2": float(os.getenv("RISK_SMALL_FIXED_S2", "0.6")),
-    "MARGIN_USDT_SMALL_BALANCE": float(os.getenv("MARGIN_USDT_SMALL_BALANCE", "1.0")),
-    "RISK_PCT_LARGE": float(os.getenv("RISK_PCT_LARGE", "0.02")),
-    "RISK_PCT_STRATEGY_2": float(os.getenv("RISK_PCT_S2", "0.025")),
-    "MAX_RISK_USDT": float(os.getenv("MAX_RISK_USDT", "0.0")),  # 0 disables cap
-    "MAX_BOT_LEVERAGE": int(os.getenv("MAX_BOT_LEVERAGE", "30")),
+    "RISK_SMALL_BALANCE_THRESHOLD": _env_float("RISK_SMALL_BALANCE_THRESHOLD", "50.0"),
+    "RISK_SMALL_FIXED_USDT": _env_float("RISK_SMALL_FIXED_USDT", "0.5"),
+    "RISK_SMALL_FIXED_USDT_STRATEGY_2": _env_float("RISK_SMALL_FIXED_S2", "0.6"),
+    "MARGIN_USDT_SMALL_BALANCE": _env_float("MARGIN_USDT_SMALL_BALANCE", "1.0"),
+    "RISK_PCT_LARGE": _env_float("RISK_PCT_LARGE", "0.02"),
+    "RISK_PCT_STRATEGY_2": _env_float("RISK_PCT_S2", "0.025"),
+    "MAX_RISK_USDT": _env_float("MAX_RISK_USDT", "0.0"),  # 0 disables cap
+    "MAX_BOT_LEVERAGE": _env_int("MAX_BOT_LEVERAGE", "30"),
 
 
-    "TRAILING_ENABLED": os.getenv("TRAILING_ENABLED", "true").lower() in ("true", "1", "yes"),
+    "TRAILING_ENABLED": _env_bool("TRAILING_ENABLED", "true"),
 
-    "MAX_DAILY_LOSS": float(os.getenv("MAX_DAILY_LOSS", "-2.0")), # Negative value, e.g. -50.0 for $50 loss
-    "MAX_DAILY_PROFIT": float(os.getenv("MAX_DAILY_PROFIT", "5.0")), # 0 disables this
-    "AUTO_FREEZE_ON_PROFIT": os.getenv("AUTO_FREEZE_ON_PROFIT", "true").lower() in ("true", "1", "yes"),
-    "DAILY_PNL_CHECK_INTERVAL": int(os.getenv("DAILY_PNL_CHECK_INTERVAL", "60")), # In seconds
+    "MAX_DAILY_LOSS": _env_float("MAX_DAILY_LOSS", "-2.0"), # Negative value, e.g. -50.0 for $50 loss
+    "MAX_DAILY_PROFIT": _env_float("MAX_DAILY_PROFIT", "5.0"), # 0 disables this
+    "AUTO_FREEZE_ON_PROFIT": _env_bool("AUTO_FREEZE_ON_PROFIT", "true"),
+    "DAILY_PNL_CHECK_INTERVAL": _env_int("DAILY_PNL_CHECK_INTERVAL", "60"), # In seconds
 
-    "DB_FILE": os.getenv("DB_FILE", "trades.db"),
+    "DB_FILE": _env_str("DB_FILE", "trades.db"),
     
-    "DRY_RUN": os.getenv("DRY_RUN", "false").lower() in ("true", "1", "yes"),
-    "MIN_NOTIONAL_USDT": float(os.getenv("MIN_NOTIONAL_USDT", "5.0")),
+    "DRY_RUN": _env_bool("DRY_RUN", "false"),
+    "MIN_NOTIONAL_USDT": _env_float("MIN_NOTIONAL_USDT", "5.0"),
 }
 
-# --- Ensure required config keys exist with sane defaults ---
-# Some downstream code accesses these with direct indexing.
-CONFIG.setdefault("HEDGING_ENABLED", os.getenv("HEDGING_ENABLED", "false").lower() in ("true", "1", "yes"))
-try:
-    CONFIG.setdefault("MONITOR_LOOP_THRESHOLD_SEC", float(os.getenv("MONITOR_LOOP_THRESHOLD_SEC", "5")))
-except Exception:
-    CONFIG["MONITOR_LOOP_THRESHOLD_SEC"] = 5.0
-
-# --- Parse STRATEGY_MODE into a list of ints (robustly) ---
-mode_raw = CONFIG.get('STRATEGY_MODE', 0)
-if isinstance(mode_raw, list):
-    try:
-        CONFIG['STRATEGY_MODE'] = [int(x) for x in mode_raw]
-    except Exception:
-        log.error(f"Invalid STRATEGY_MODE list: '{mode_raw}'. Defaulting to auto (0).")
-        CONFIG['STRATEGY_MODE'] = [0]
-else:
-    try:
-        CONFIG['STRATEGY_MODE'] = [int(x.strip()) for x in str(mode_raw).split(',')]
-    except (ValueError, TypeError):
-        log.error(f"Invalid STRATEGY_MODE: '{mode_raw}'. Must be a comma-separated list of numbers. Defaulting to auto (0).")
-        CONFIG['STRATEGY_MODE'] = [0]
-
 running = (CONFIG["START_MODE"] == "running")
 overload_notified = False
 frozen = False
@@ -429,9 +766,10 @@ session_freeze_override = False
 notified_frozen_session: Optional[str] = None
 
 rejected_trades = deque(maxlen=20)
-last_attention_alert_time: Dict[str, datetime] = {}
-symbol_loss_cooldown: Dict[str, datetime] = {}
-symbol_trade_cooldown: Dict[str, datetime] = {}
+last_attention_alert_time: Dict[str, float] = {}  # time.monotonic() of the last alert
+# Cooldown end per symbol as epoch seconds, so the per-scan check is a float compare
+symbol_loss_cooldown: Dict[str, float] = {}
+symbol_trade_cooldown: Dict[str, float] = {}
 last_env_rejection_log: Dict[tuple[str, str], float] = {}
 
 # Emoji map for clearer rejection messages
@@ -579,7 +917,10 @@ class DualLock:
         self._lock.release()
 
     async def __aenter__(self):
-        await asyncio.to_thread(self._lock.acquire)
+        # Uncontended fast path: no executor round-trip
+        if self._lock.acquire(blocking=False):
+            return self
+        await asyncio.get_running_loop().run_in_executor(None, self._lock.acquire)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -616,6 +957,11 @@ last_maintenance_month = "" # YYYY-MM format
 
 scan_task: Optional[asyncio.Task] = None
 rogue_check_task: Optional[asyncio.Task] = None
+user_stream_task: Optional[asyncio.Task] = None
+user_stream_connected = False
+stream_rogue_check_task: Optional[asyncio.Task] = None
+telegram_sender_task: Optional[asyncio.Task] = None
+telegram_queue: Optional[asyncio.Queue] = None
 notified_rogue_symbols: set[str] = set()
 
 # Flag for one-time startup sync
@@ -625,10 +971,57 @@ initial_sync_complete: bool = False
 scan_cycle_count: int = 0
 next_scan_time: Optional[datetime] = None
 
+# Chart rendering worker (see charts.py); created on first use
+chart_pool: Optional[ProcessPoolExecutor] = None
+chart_pool_lock = threading.Lock()
+CHART_RENDER_TIMEOUT_SEC = 60
+
 # Exchange info cache
 EXCHANGE_INFO_CACHE = {"ts": 0.0, "data": None, "ttl": 300}  # ttl seconds
+exchange_info_refresh_lock = threading.Lock()  # one thread refreshes; the rest keep using the stale copy
+# symbol -> (tick_size, step_size, price_decimals, qty_decimals); rebuilt with each exchange info fetch
+STEP_TABLE: Dict[str, tuple] = {}
+# symbol -> its exchange info entry, and symbol -> MIN_NOTIONAL filter value (absent when the symbol has none)
+SYMBOL_INFO_TABLE: Dict[str, Dict[str, Any]] = {}
+MIN_NOTIONAL_TABLE: Dict[str, float] = {}
+
+@dataclass
+class PositionsSnapshot:
+    """One futures_position_information() call, grouped by symbol (hedge mode has a row per side)."""
+    positions: Dict[str, list]
+    fetched_at: float
+
+    def open_positions(self) -> Dict[str, Dict[str, Any]]:
+        """symbol -> a position row with non-zero size."""
+        return {
+            sym: pos for sym, rows in self.positions.items()
+            for pos in rows if float(pos.get('positionAmt', 0.0)) != 0.0
+        }
+
+
+def fetch_positions_snapshot_sync() -> PositionsSnapshot:
+    rows = client.futures_position_information()
+    grouped: Dict[str, list] = {}
+    for pos in rows:
+        grouped.setdefault(pos['symbol'], []).append(pos)
+    return PositionsSnapshot(positions=grouped, fetched_at=time.time())
+
+
+ACCOUNT_TRADES_CACHE_SEC = 30
+_account_trades_cache: Dict[str, tuple[float, list]] = {}
 
-def infer_strategy_for_open_trade_sync(symbol: str, side: str) -> Optional[int]:
+def get_account_trades_cached_sync(symbol: str, limit: int = 50) -> list:
+    """futures_account_trades for symbol, reused for ACCOUNT_TRADES_CACHE_SEC across a reconciliation pass."""
+    now = time.time()
+    cached = _account_trades_cache.get(symbol)
+    if cached and now - cached[0] < ACCOUNT_TRADES_CACHE_SEC:
+        return cached[1]
+    trades = client.futures_account_trades(symbol=symbol, limit=limit)
+    _account_trades_cache[symbol] = (now, trades)
+    return trades
+
+
+def infer_strategy_for_open_trade_sync(symbol: str, side: str, snapshot: Optional[PositionsSnapshot] = None) -> Optional[int]:
     """
     Try to infer the entry timestamp from the actual fill time of the position,
     using account trades first (most accurate), then fall back to the position's
@@ -637,6 +1030,7 @@ def infer_strategy_for_open_trade_sync(symbol: str, side: str) -> Optional[int]:
     This improves strategy inference accuracy (e.g. distinguishing S6 from S4)
     because using updateTime can reflect later updates (like SL/TP changes)
     rather than the original entry fill time.
+    Pass the caller's positions snapshot to skip refetching position info.
     """
     ts_ms: Optional[int] = None
     try:
@@ -646,27 +1040,29 @@ def infer_strategy_for_open_trade_sync(symbol: str, side: str) -> Optional[int]:
             # 1) Prefer the latest trade fill that contributed to the current position side
             #    This is the most accurate signal time for the entry.
             try:
-                trades = client.futures_account_trades(symbol=symbol, limit=50)
+                trades = get_account_trades_cached_sync(symbol, limit=20)
                 # Find last trade that increased the position on this side
                 # For LONG: side == 'BUY' and positionSide == 'LONG'
                 # For SHORT: side == 'SELL' and positionSide == 'SHORT'
-                contributing = [
-                    t for t in trades
-                    if str(t.get('positionSide', '')).upper() == desired_pos_side
-                    and str(t.get('side', '')).upper() == side
-                ]
-                if contributing:
-                    # Pick the most recent by time
-                    last_trade = max(contributing, key=lambda x: int(x.get('time', 0)))
-                    if last_trade.get('time'):
-                        ts_ms = int(last_trade['time'])
+                # Binance returns fills oldest first, so the first match from the end is the latest.
+                # positionSide/side come back as canonical upper-case strings, so compare them directly.
+                ts_ms = next(
+                    (int(t['time']) for t in reversed(trades)
+                     if t.get('positionSide') == desired_pos_side
+                     and t.get('side') == side
+                     and t.get('time')),
+                    None,
+                )
             except Exception:
                 # Ignore and fall back to position info
                 pass
 
             # 2) Fallback: use the position's update time (can be later than entry)
             if ts_ms is None:
-                positions = client.futures_position_information(symbol=symbol)
+                if snapshot is not None:
+                    positions = snapshot.positions.get(symbol, [])
+                else:
+                    positions = client.futures_position_information(symbol=symbol)
                 pos = next((p for p in positions if p.get('positionSide') in (desired_pos_side, 'BOTH')), None)
                 if pos:
                     ut = pos.get('updateTime') or pos.get('updateTimeMs') or pos.get('time')
@@ -677,18 +1073,108 @@ def infer_strategy_for_open_trade_sync(symbol: str, side: str) -> Optional[int]:
 
     return infer_strategy_for_open_trade_at_time_sync(symbol, side, ts_ms)
 
+def _nearest_closed_indices(df: pd.DataFrame, ts_ms_list) -> np.ndarray:
+    """Positional index of the last candle at or before each timestamp (ms), -1 where none, in one lookup."""
+    # The kline index is sorted, so a binary search does what get_indexer(pad) does. Search with
+    # Timestamps rather than raw int64 so the index's own unit (ns, or ms under pandas 3) is respected.
+    ts = pd.to_datetime(np.asarray(ts_ms_list, dtype=np.int64), unit='ms', utc=True)
+    return np.asarray(df.index.searchsorted(ts, side='right'), dtype=np.int64) - 1
+
 def _nearest_closed_index_for_time(df: pd.DataFrame, ts_ms: Optional[int]) -> Optional[int]:
     if df is None or df.empty:
         return None
     if ts_ms is None:
         return len(df) - 1  # last closed
-    ts = pd.to_datetime(ts_ms, unit='ms', utc=True)
     # find index of last candle closed at or before ts
-    idx = df.index.get_indexer([ts], method='pad')[0]
-    if idx is None or idx < 2:
+    idx = int(_nearest_closed_indices(df, [ts_ms])[0])
+    if idx < 2:
         return None
     return idx
 
+# Klines and indicator frames used by strategy inference, shared for one wall-clock minute so
+# reconciling several positions (or re-checking one) doesn't refetch and recompute.
+INFER_CACHE_BUCKET_SEC = 60
+_infer_cache: Dict[tuple, Any] = {}
+_infer_cache_bucket = -1
+_infer_cache_lock = threading.Lock()
+
+def _infer_cached(key: tuple, build) -> Any:
+    """Return the frame (or arrays) cached under key for the current minute, building it on a miss. Treat as read-only."""
+    global _infer_cache_bucket
+    bucket = int(time.time()) // INFER_CACHE_BUCKET_SEC
+    with _infer_cache_lock:
+        if bucket != _infer_cache_bucket:
+            _infer_cache.clear()
+            _infer_cache_bucket = bucket
+        if key in _infer_cache:
+            return _infer_cache[key]
+    frame = build()
+    with _infer_cache_lock:
+        _infer_cache[key] = frame
+    return frame
+
+def _infer_klines(symbol: str, interval: str, limit: int) -> Optional[pd.DataFrame]:
+    return _infer_cached((symbol, interval, limit), lambda: fetch_klines_sync(symbol, interval, limit))
+
+# Inference runs in a worker thread; this pool lets it download several timeframes at once
+infer_fetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="infer-fetch")
+
+# The monitor thread refreshes klines for every symbol with an open trade; this pool
+# downloads them side by side instead of one request after another
+monitor_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="monitor-fetch")
+
+def _prefetch_infer_klines(symbol: str, wanted: list[tuple[str, int]]) -> None:
+    """Warm the inference cache for several (interval, limit) pairs concurrently; errors surface on the real read."""
+    if len(wanted) < 2:
+        return
+    futures = [infer_fetch_pool.submit(_infer_klines, symbol, interval, limit) for interval, limit in wanted]
+    for fut in futures:
+        try:
+            fut.result()
+        except Exception:
+            pass
+
+def _inference_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """calculate_all_indicators plus the extra S5/S6 M15 columns the inference checks read."""
+    s5 = CFG.s5
+    s6 = CFG.s6
+    df_ind = calculate_all_indicators(df)  # returns a new frame; df is the shared kline cache
+    df_ind['s5_m15_ema_fast'] = ema(df_ind['close'], s5.ema_fast)
+    df_ind['s5_m15_ema_slow'] = ema(df_ind['close'], s5.ema_slow)
+    df_ind['s5_atr'] = atr(df_ind, s5.atr_period)
+    df_ind['s5_rsi'] = rsi(df_ind['close'], s5.rsi_period)
+    df_ind['s5_vol_ma10'] = df_ind['volume'].rolling(10).mean()
+    df_ind['s6_atr'] = atr(df_ind, s6.atr_period)
+    df_ind['s6_vol_ma'] = df_ind['volume'].rolling(int(s6.vol_ma_len)).mean()
+    return df_ind
+
+def _inference_h1_s5(df_h1: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """The H1 columns the S5 bias check reads, as arrays aligned to df_h1 (which is left untouched)."""
+    s5 = CFG.s5
+    close = df_h1['close']
+    st_h1, _ = supertrend(df_h1, period=s5.h1_st_period, multiplier=s5.h1_st_mult)
+    return {
+        'close': close.to_numpy(np.float64),
+        'ema_fast': ema(close, s5.ema_fast).to_numpy(np.float64),
+        'ema_slow': ema(close, s5.ema_slow).to_numpy(np.float64),
+        'st_h1': st_h1.to_numpy(np.float64),
+    }
+
+# M15 columns the inference checks read at the signal/previous bar
+_INFER_M15_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 's5_m15_ema_fast', 's5_m15_ema_slow', 's5_vol_ma10', 's5_rsi')
+
+def _inference_patterns(df_ind: pd.DataFrame, side: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pin, engulfing and S6 follow-through masks for every M15 bar, indexed by the rejection bar."""
+    d = _direction_code(side)
+    o = df_ind['open'].to_numpy(np.float64)
+    h = df_ind['high'].to_numpy(np.float64)
+    l = df_ind['low'].to_numpy(np.float64)
+    c = df_ind['close'].to_numpy(np.float64)
+    v = df_ind['volume'].to_numpy(np.float64)
+    vol_ma = df_ind['s6_vol_ma'].to_numpy(np.float64)
+    ratio = float(CFG.s6.follow_through_range_ratio)
+    return pin_bar_mask(o, h, l, c, d), engulfing_mask(o, c, d), follow_through_mask(o, h, l, c, v, vol_ma, d, ratio)
+
 def infer_strategy_for_open_trade_at_time_sync(symbol: str, side: str, ts_ms: Optional[int]) -> Optional[int]:
     """
     Infers strategy likely responsible for an open trade, using signals around a given timestamp (ms).
@@ -697,88 +1183,119 @@ def infer_strategy_for_open_trade_at_time_sync(symbol: str, side: str, ts_ms: Op
     """
     try:
         # Fetch M15
-        df = fetch_klines_sync(symbol, CONFIG["TIMEFRAME"], 300)
+        df = _infer_klines(symbol, CONFIG["TIMEFRAME"], 300)
         if df is None or len(df) < 80:
             return None
-        df_ind = calculate_all_indicators(df.copy())
+        # Shared, read-only: every column the checks need is computed up front
+        df_ind = _infer_cached(
+            (symbol, CONFIG["TIMEFRAME"], "indicators", df.index[-1]),
+            lambda: _inference_indicators(df),
+        )
 
         sig_idx = _nearest_closed_index_for_time(df_ind, ts_ms)
         if sig_idx is None or sig_idx < 3:
             return None
 
-        sig = df_ind.iloc[sig_idx - 1]
-        prev = df_ind.iloc[sig_idx - 2]
-        ft = df_ind.iloc[sig_idx] if sig_idx < len(df_ind) else df_ind.iloc[-1]
+        # Plain float arrays, read at the signal (i) and previous (p) bars without building row Series
+        col = _infer_cached(
+            (symbol, CONFIG["TIMEFRAME"], "columns", df.index[-1]),
+            lambda: {c: df_ind[c].to_numpy(np.float64) for c in _INFER_M15_COLUMNS},
+        )
+        i, p = sig_idx - 1, sig_idx - 2
+
+        # M15-only predicates first: the higher-timeframe klines are only fetched for a
+        # strategy whose signal-candle conditions already hold.
+        def _h1():
+            df_h1 = _infer_klines(symbol, '1h', 300)
+            return df_h1, _nearest_closed_index_for_time(df_h1, ts_ms)
+
+        # Classified for the whole frame once (per side) and then just indexed
+        try:
+            pin_m, engulf_m, ft_m = _infer_cached(
+                (symbol, CONFIG["TIMEFRAME"], "patterns", side, df.index[-1]),
+                lambda: _inference_patterns(df_ind, side),
+            )
+            sig_close = float(col['close'][i])
+            poi = sig_close  # the signal close stands in for the POI here
+            is_engulf = bool(engulf_m[i]) and (sig_close > poi if side == 'BUY' else sig_close < poi)
+            pattern_ok = bool(pin_m[i]) or is_engulf
+            follow_through = side in ('BUY', 'SELL') and bool(ft_m[i])
+        except Exception:
+            pattern_ok = follow_through = False
+
+        # Fast path for a fill from the last few minutes: an M15 rejection with follow-through
+        # reads as S6, anything else gets the S4 fallback without touching H1/H4/D.
+        fast_sec = CONFIG.get("FAST_INFER_THRESHOLD_SEC", 0)
+        if fast_sec > 0 and ts_ms is not None and time.time() * 1000 - ts_ms < fast_sec * 1000:
+            return 6 if (pattern_ok and follow_through) else 4
+
+        try:
+            fast, slow, close = col['s5_m15_ema_fast'], col['s5_m15_ema_slow'], col['close']
+            if side == 'BUY':
+                m15_pullback = (fast[i] >= slow[i]) and (col['low'][p] <= fast[p]) and (close[i] > fast[i]) and (close[i] > col['open'][i])
+            else:
+                m15_pullback = (fast[i] <= slow[i]) and (col['high'][p] >= fast[p]) and (close[i] < fast[i]) and (close[i] < col['open'][i])
+            vol_ma10 = col['s5_vol_ma10'][i]
+            vol_spike = (col['volume'][i] >= 1.2 * vol_ma10) if not np.isnan(vol_ma10) else False
+            rsi_ok = 35 <= col['s5_rsi'][i] <= 65
+            s5_m15_ok = bool(m15_pullback and vol_spike and rsi_ok)
+        except Exception:
+            s5_m15_ok = False
+
+        # Download every higher timeframe a surviving check will read in parallel, so
+        # latency is the slowest request rather than the sum of them.
+        wanted = []
+        if s5_m15_ok or pattern_ok:
+            wanted.append(('1h', 300))
+        if pattern_ok and follow_through:
+            wanted += [('4h', 200), ('1d', 200)]
+        _prefetch_infer_klines(symbol, wanted)
 
         # 1) S5 check
         try:
-            s5 = CONFIG.get('STRATEGY_5', {})
-            df_h1 = fetch_klines_sync(symbol, '1h', 300)
-            if df_h1 is not None and len(df_h1) >= 80:
-                h1_idx = _nearest_closed_index_for_time(df_h1, ts_ms)
-                if h1_idx is None or h1_idx < 2:
-                    raise RuntimeError("no h1 index")
-                df_h1 = df_h1.copy()
-                df_h1['ema_fast'] = ema(df_h1['close'], s5.get('EMA_FAST', 21))
-                df_h1['ema_slow'] = ema(df_h1['close'], s5.get('EMA_SLOW', 55))
-                df_h1['st_h1'], df_h1['st_h1_dir'] = supertrend(df_h1, period=s5.get('H1_ST_PERIOD', 10), multiplier=s5.get('H1_ST_MULT', 3.0))
-                h1_last = df_h1.iloc[h1_idx - 1]
-                h1_bull = (h1_last['ema_fast'] > h1_last['ema_slow']) and (h1_last['close'] > h1_last['st_h1'])
-                h1_bear = (h1_last['ema_fast'] < h1_last['ema_slow']) and (h1_last['close'] < h1_last['st_h1'])
-
-                df_ind['s5_m15_ema_fast'] = ema(df_ind['close'], s5.get('EMA_FAST', 21))
-                df_ind['s5_m15_ema_slow'] = ema(df_ind['close'], s5.get('EMA_SLOW', 55))
-                df_ind['s5_atr'] = atr(df_ind, s5.get('ATR_PERIOD', 14))
-                df_ind['s5_rsi'] = rsi(df_ind['close'], s5.get('RSI_PERIOD', 14))
-                df_ind['s5_vol_ma10'] = df_ind['volume'].rolling(10).mean()
-                sig = df_ind.iloc[sig_idx - 1]; prev = df_ind.iloc[sig_idx - 2]
-                m15_bull_pullback = (sig['s5_m15_ema_fast'] >= sig['s5_m15_ema_slow']) and (prev['low'] <= prev['s5_m15_ema_fast']) and (sig['close'] > sig['s5_m15_ema_fast']) and (sig['close'] > sig['open'])
-                m15_bear_pullback = (sig['s5_m15_ema_fast'] <= sig['s5_m15_ema_slow']) and (prev['high'] >= prev['s5_m15_ema_fast']) and (sig['close'] < sig['s5_m15_ema_fast']) and (sig['close'] < sig['open'])
-                vol_spike = (sig['volume'] >= 1.2 * sig['s5_vol_ma10']) if pd.notna(sig['s5_vol_ma10']) else False
-                rsi_ok = 35 <= sig['s5_rsi'] <= 65
-                if (side == 'BUY' and h1_bull and m15_bull_pullback and vol_spike and rsi_ok) or \
-                   (side == 'SELL' and h1_bear and m15_bear_pullback and vol_spike and rsi_ok):
-                    return 5
+            if s5_m15_ok:
+                df_h1, h1_idx = _h1()
+                if df_h1 is not None and len(df_h1) >= 80:
+                    if h1_idx is None or h1_idx < 2:
+                        raise RuntimeError("no h1 index")
+                    h1 = _infer_cached((symbol, '1h', "s5", df_h1.index[-1]), lambda: _inference_h1_s5(df_h1))
+                    j = h1_idx - 1
+                    h1_bull = (h1['ema_fast'][j] > h1['ema_slow'][j]) and (h1['close'][j] > h1['st_h1'][j])
+                    h1_bear = (h1['ema_fast'][j] < h1['ema_slow'][j]) and (h1['close'][j] < h1['st_h1'][j])
+                    if (side == 'BUY' and h1_bull) or (side == 'SELL' and h1_bear):
+                        return 5
         except Exception:
             pass
 
         # 2) S6 check
         try:
-            s6 = CONFIG.get('STRATEGY_6', {})
-            df_ind['s6_atr'] = atr(df_ind, s6.get('ATR_PERIOD', 14))
-            df_h4 = fetch_klines_sync(symbol, '4h', 200)
-            df_d = fetch_klines_sync(symbol, '1d', 200)
-            if df_h4 is not None and df_d is not None and len(df_h4) >= 50 and len(df_d) >= 50:
-                bias_d = _s6_trend_from_swings(df_d, swing_lookback=20)
-                direction = 'BUY' if bias_d == 'BULL' else ('SELL' if bias_d == 'BEAR' else None)
-                sig = df_ind.iloc[sig_idx - 1]; prev = df_ind.iloc[sig_idx - 2]; ft = df_ind.iloc[min(sig_idx, len(df_ind)-1)]
-                if direction == side:
-                    is_pin = _s6_is_pin_bar(sig, direction)
-                    is_engulf = _s6_is_engulfing_reclaim(sig, prev, direction, float(sig['close']))
-                    vol_ma = float(df_ind['volume'].rolling(int(s6.get('VOL_MA_LEN', 10))).mean().iloc[sig_idx - 1])
-                    if (is_pin or is_engulf) and _s6_follow_through_ok(sig, ft, direction, vol_ma, float(s6.get('FOLLOW_THROUGH_RATIO', 0.7))):
+            if pattern_ok and follow_through:
+                df_h4 = _infer_klines(symbol, '4h', 200)
+                df_d = _infer_klines(symbol, '1d', 200)
+                if df_h4 is not None and df_d is not None and len(df_h4) >= 50 and len(df_d) >= 50:
+                    bias_d = _s6_trend_from_swings(df_d, swing_lookback=20)
+                    direction = 'BUY' if bias_d == 'BULL' else ('SELL' if bias_d == 'BEAR' else None)
+                    if direction == side:
                         return 6
         except Exception:
             pass
 
         # 3) S7 check
         try:
-            s7 = CONFIG.get('STRATEGY_7', {})
-            df_h1 = fetch_klines_sync(symbol, '1h', 300)
-            if df_h1 is not None and len(df_h1) >= 120:
-                lookback = int(s7.get('BOS_LOOKBACK_H1', 72))
-                h1_idx = _nearest_closed_index_for_time(df_h1, ts_ms)
-                if h1_idx is None or h1_idx < lookback + 2:
-                    raise RuntimeError("no h1 idx")
-                sig_h1 = df_h1.iloc[h1_idx - 1]
-                prev_window_high = float(df_h1['high'].iloc[(h1_idx - lookback - 2):(h1_idx - 1)].max())
-                prev_window_low = float(df_h1['low'].iloc[(h1_idx - lookback - 2):(h1_idx - 1)].min())
-                dir_detected = 'BUY' if float(sig_h1['close']) > prev_window_high else ('SELL' if float(sig_h1['close']) < prev_window_low else None)
-                if dir_detected == side:
-                    sig = df_ind.iloc[sig_idx - 1]; prev = df_ind.iloc[sig_idx - 2]
-                    is_pin = _s6_is_pin_bar(sig, side)
-                    is_engulf = _s6_is_engulfing_reclaim(sig, prev, side, float(sig['close']))
-                    if is_pin or is_engulf:
+            s7 = CFG.s7
+            if pattern_ok:
+                df_h1, h1_idx = _h1()
+                if df_h1 is not None and len(df_h1) >= 120:
+                    lookback = int(s7.bos_lookback_h1)
+                    if h1_idx is None or h1_idx < lookback + 2:
+                        raise RuntimeError("no h1 idx")
+                    h1_high = df_h1['high'].to_numpy()
+                    h1_low = df_h1['low'].to_numpy()
+                    sig_h1_close = float(df_h1['close'].to_numpy()[h1_idx - 1])
+                    prev_window_high = float(h1_high[h1_idx - lookback - 2:h1_idx - 1].max())
+                    prev_window_low = float(h1_low[h1_idx - lookback - 2:h1_idx - 1].min())
+                    dir_detected = 'BUY' if sig_h1_close > prev_window_high else ('SELL' if sig_h1_close < prev_window_low else None)
+                    if dir_detected == side:
                         return 7
         except Exception:
             pass
@@ -815,7 +1332,26 @@ def infer_strategy_for_open_trade_at_time_sync(symbol: str, side: str, ts_ms: Op
     except Exception:
         return None
 
-async def _import_rogue_position_async(symbol: str, position: Dict[str, Any]) -> Optional[tuple[str, Dict[str, Any]]]:
+# Caps how many rogue imports hit the API at once when several are gathered
+rogue_import_sem = asyncio.Semaphore(8)
+
+async def _import_rogue_positions_async(open_positions: Dict[str, Dict[str, Any]], symbols, snapshot: Optional[PositionsSnapshot]) -> list[tuple[str, Dict[str, Any]]]:
+    """Import the given rogue symbols concurrently; returns the (trade_id, meta) pairs that succeeded."""
+    async def _one(symbol):
+        async with rogue_import_sem:
+            return await _import_rogue_position_async(symbol, open_positions[symbol], snapshot)
+
+    symbols = list(symbols)
+    results = await asyncio.gather(*(_one(s) for s in symbols), return_exceptions=True)
+    imported = []
+    for symbol, res in zip(symbols, results):
+        if isinstance(res, BaseException):
+            log.error(f"Rogue import for {symbol} failed: {res}")
+        elif res:
+            imported.append(res)
+    return imported
+
+async def _import_rogue_position_async(symbol: str, position: Dict[str, Any], snapshot: Optional[PositionsSnapshot] = None) -> Optional[tuple[str, Dict[str, Any]]]:
     """
     Imports a single rogue position, places a default SL order, and returns the trade metadata.
     """
@@ -843,7 +1379,7 @@ async def _import_rogue_position_async(symbol: str, position: Dict[str, Any]) ->
             stop_price = None # Do not place an SL
 
         # Infer strategy for better in-trade management. The sync function returns only an int (or None).
-        inferred_strategy = await asyncio.to_thread(infer_strategy_for_open_trade_sync, symbol, side)
+        inferred_strategy = await asyncio.to_thread(infer_strategy_for_open_trade_sync, symbol, side, snapshot)
         infer_src = "last_closed"
         if inferred_strategy is None:
             inferred_strategy = 4  # fallback
@@ -888,14 +1424,14 @@ async def _import_rogue_position_async(symbol: str, position: Dict[str, Any]) ->
                    f"A default SL has been calculated and placed:\n"
                    f"**SL:** `{round_price(symbol, stop_price)}`\n\n"
                    f"The bot will now manage this trade.")
-            await asyncio.to_thread(send_telegram, msg)
+            enqueue_telegram(msg)
         else:
             log.warning(f"No valid SL placed for imported trade {symbol}. Please manage manually.")
             msg = (f"ℹ️ **Position Imported (No SL)**\n\n"
                    f"Found and imported a position for **{symbol}** but could not place a valid SL.\n\n"
                    f"**Inferred Strategy:** S{inferred_strategy}\n"
                    f"**Please manage this trade manually.**")
-            await asyncio.to_thread(send_telegram, msg)
+            enqueue_telegram(msg)
 
         return trade_id, meta
     except Exception as e:
@@ -917,19 +1453,18 @@ async def reconcile_open_trades():
             log.warning("Binance client not initialized. Cannot fetch positions for reconciliation.")
             return
         
-        positions = await asyncio.to_thread(client.futures_position_information)
-        open_positions = {
-            pos['symbol']: pos for pos in positions if float(pos.get('positionAmt', 0.0)) != 0.0
-        }
+        snapshot = await asyncio.to_thread(fetch_positions_snapshot_sync)
+        open_positions = snapshot.open_positions()
         log.info(f"Found {len(open_positions)} open position(s) on Binance.")
 
     except Exception as e:
         log.exception("Failed to fetch Binance positions during reconciliation.")
-        await asyncio.to_thread(send_telegram, f"⚠️ **CRITICAL**: Failed to fetch positions from Binance during startup reconciliation: {e}. The bot may not manage existing trades correctly.")
+        enqueue_telegram(f"⚠️ **CRITICAL**: Failed to fetch positions from Binance during startup reconciliation: {e}. The bot may not manage existing trades correctly.")
         managed_trades = {}
         return
 
     retained_trades = {}
+    to_archive = []
     
     # 1. Reconcile trades that are already in the database
     for trade_id, trade_meta in db_trades.items():
@@ -940,27 +1475,21 @@ async def reconcile_open_trades():
         else:
             log.warning(f"ℹ️ Reconciled DB trade: {trade_id} ({symbol}) is closed on Binance. Archiving.")
             # This part could be enhanced to fetch last trade details for accurate PnL
-            await asyncio.to_thread(
-                record_trade,
-                {
-                    'id': trade_id, 'symbol': symbol, 'side': trade_meta['side'],
-                    'entry_price': trade_meta['entry_price'], 'exit_price': None, # Exit price is unknown
-                    'qty': trade_meta['initial_qty'], 'notional': trade_meta['notional'], 
-                    'pnl': 0.0, 'open_time': trade_meta['open_time'], 
-                    'close_time': datetime.utcnow().isoformat(),
-                    'risk_usdt': trade_meta.get('risk_usdt', 0.0)
-                }
-            )
-            await asyncio.to_thread(remove_managed_trade_from_db, trade_id)
+            to_archive.append({
+                'id': trade_id, 'symbol': symbol, 'side': trade_meta['side'],
+                'entry_price': trade_meta['entry_price'], 'exit_price': None, # Exit price is unknown
+                'qty': trade_meta['initial_qty'], 'notional': trade_meta['notional'],
+                'pnl': 0.0, 'open_time': trade_meta['open_time'],
+                'close_time': datetime.utcnow().isoformat(),
+                'risk_usdt': trade_meta.get('risk_usdt', 0.0)
+            })
+    await asyncio.to_thread(archive_trades_db, to_archive)
 
     # 2. Import "rogue" positions that are on the exchange but not in the DB
     managed_symbols = {t['symbol'] for t in retained_trades.values()}
-    for symbol, position in open_positions.items():
-        if symbol not in managed_symbols:
-            result = await _import_rogue_position_async(symbol, position)
-            if result:
-                trade_id, meta = result
-                retained_trades[trade_id] = meta
+    rogue_symbols = [s for s in open_positions if s not in managed_symbols]
+    for trade_id, meta in await _import_rogue_positions_async(open_positions, rogue_symbols, snapshot):
+        retained_trades[trade_id] = meta
 
     async with managed_trades_lock:
         managed_trades.clear()
@@ -983,10 +1512,8 @@ async def check_and_import_rogue_trades():
             return
 
         # Get all open positions from the exchange
-        positions = await asyncio.to_thread(client.futures_position_information)
-        open_positions = {
-            pos['symbol']: pos for pos in positions if float(pos.get('positionAmt', 0.0)) != 0.0
-        }
+        snapshot = await asyncio.to_thread(fetch_positions_snapshot_sync)
+        open_positions = snapshot.open_positions()
 
         # Get symbols of trades currently managed by the bot
         async with managed_trades_lock:
@@ -999,6 +1526,7 @@ async def check_and_import_rogue_trades():
             log.info("No rogue positions found.")
             return
 
+        to_import = []
         for symbol in rogue_symbols:
             if symbol in notified_rogue_symbols:
                 log.debug(f"Ignoring already notified rogue symbol: {symbol}")
@@ -1006,12 +1534,12 @@ async def check_and_import_rogue_trades():
 
             # Mark as notified BEFORE attempting import to prevent spam on repeated failures.
             notified_rogue_symbols.add(symbol)
-            position = open_positions[symbol]
-            
-            result = await _import_rogue_position_async(symbol, position)
-            if result:
-                trade_id, meta = result
-                async with managed_trades_lock:
+            to_import.append(symbol)
+
+        imported = await _import_rogue_positions_async(open_positions, to_import, snapshot)
+        if imported:
+            async with managed_trades_lock:
+                for trade_id, meta in imported:
                     managed_trades[trade_id] = meta
     
     except Exception as e:
@@ -1025,8 +1553,8 @@ async def periodic_rogue_check_loop():
     log.info("Starting periodic rogue position checker loop.")
     while True:
         try:
-            # Wait for 1 hour before the next check
-            await asyncio.sleep(3600)
+            # Hourly, or every 6 hours as a safety net while the user-data stream is reporting positions
+            await asyncio.sleep(ROGUE_CHECK_INTERVAL_STREAMING_SEC if user_stream_connected else ROGUE_CHECK_INTERVAL_SEC)
 
             if not running:
                 log.debug("Bot is not running, skipping hourly rogue position check.")
@@ -1043,6 +1571,69 @@ async def periodic_rogue_check_loop():
             await asyncio.sleep(60)
 
 
+ROGUE_CHECK_INTERVAL_SEC = 3600
+ROGUE_CHECK_INTERVAL_STREAMING_SEC = 6 * 3600
+# An unmanaged position from the stream is only checked after this delay, so the bot's own
+# fills (limit entries are adopted by the monitor thread) are registered first.
+USER_STREAM_ROGUE_DELAY_SEC = 30
+
+async def _deferred_rogue_check():
+    await asyncio.sleep(USER_STREAM_ROGUE_DELAY_SEC)
+    await check_and_import_rogue_trades()
+
+async def _on_account_update(msg: Dict[str, Any]):
+    """Schedule a rogue check when an ACCOUNT_UPDATE shows an open position the bot doesn't know about."""
+    global stream_rogue_check_task
+    if not running:
+        return
+    open_symbols = {p.get('s') for p in msg.get('a', {}).get('P', []) if float(p.get('pa') or 0) != 0}
+    if not open_symbols:
+        return
+    async with managed_trades_lock:
+        known = {t['symbol'] for t in managed_trades.values()}
+    async with pending_limit_orders_lock:
+        known.update(o.get('symbol') for o in pending_limit_orders.values())
+    unknown = open_symbols - known - notified_rogue_symbols
+    if not unknown:
+        return
+    # Several updates in a burst share one (delayed) check
+    if stream_rogue_check_task is None or stream_rogue_check_task.done():
+        log.info(f"User stream reported unmanaged position(s) {sorted(unknown)}; scheduling rogue check.")
+        stream_rogue_check_task = asyncio.create_task(_deferred_rogue_check())
+
+async def user_stream_loop():
+    """
+    Listens to the futures user-data stream so rogue positions are picked up within seconds
+    instead of waiting for the periodic REST poll. Reconnects after errors.
+    """
+    global user_stream_connected
+    from binance import AsyncClient, BinanceSocketManager
+
+    while True:
+        aclient = None
+        try:
+            aclient = await AsyncClient.create(BINANCE_API_KEY, BINANCE_API_SECRET)
+            async with BinanceSocketManager(aclient).futures_user_socket() as stream:
+                user_stream_connected = True
+                log.info("Futures user-data stream connected.")
+                while True:
+                    msg = await stream.recv()
+                    if msg and msg.get('e') == 'ACCOUNT_UPDATE':
+                        await _on_account_update(msg)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("User-data stream failed; reconnecting in 30s.")
+        finally:
+            user_stream_connected = False
+            if aclient is not None:
+                try:
+                    await aclient.close_connection()
+                except Exception:
+                    pass
+        await asyncio.sleep(30)
+
+
 def load_state_from_db_sync():
     """
     Loads pending orders and managed trades from the SQLite DB into memory on startup.
@@ -1072,13 +1663,52 @@ def load_state_from_db_sync():
 # -------------------------
 # App Lifespan Manager
 # -------------------------
+def get_chart_pool() -> ProcessPoolExecutor:
+    """
+    Single-process pool that renders charts. 'spawn' so the worker doesn't inherit the
+    bot's threads and held locks. Note spawn re-imports the main module in the worker, so
+    when the bot is started as `python app.py` the worker imports this file too (the
+    __main__ guard keeps it from starting the bot); under uvicorn it only needs charts.py.
+    """
+    global chart_pool
+    with chart_pool_lock:
+        if chart_pool is None:
+            chart_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return chart_pool
+
+
+def render_chart(render_fn, *args) -> bytes:
+    """
+    Runs a charts.py renderer in the chart pool and waits up to CHART_RENDER_TIMEOUT_SEC.
+    If the worker died (OOM, segfault in a backend), the broken pool is replaced and the
+    render retried once.
+    """
+    global chart_pool
+    for attempt in range(2):
+        pool = get_chart_pool()
+        try:
+            return pool.submit(render_fn, *args).result(timeout=CHART_RENDER_TIMEOUT_SEC)
+        except BrokenProcessPool:
+            if attempt:
+                raise
+            log.warning("Chart worker died; starting a new chart pool and retrying once.")
+            with chart_pool_lock:
+                if chart_pool is pool:
+                    chart_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global scan_task, telegram_thread, monitor_thread_obj, pnl_monitor_thread_obj, client, monitor_stop_event, main_loop
+    global telegram_queue, telegram_sender_task, user_stream_task
     log.info("EMA/BB Strategy Bot starting up...")
     
     # --- Startup Logic ---
     init_db()
+
+    telegram_queue = asyncio.Queue()
+    telegram_sender_task = asyncio.create_task(telegram_sender_loop())
     
     await asyncio.to_thread(load_state_from_db_sync)
 
@@ -1110,6 +1740,7 @@ async def lifespan(app: FastAPI):
 
     if client is not None:
         scan_task = main_loop.create_task(scanning_loop())
+        user_stream_task = main_loop.create_task(user_stream_loop())
         monitor_stop_event.clear()
         monitor_thread_obj = threading.Thread(target=monitor_thread_func, daemon=True)
         monitor_thread_obj.start()
@@ -1137,7 +1768,7 @@ async def lifespan(app: FastAPI):
         log.info("Telegram not configured; telegram thread not started.")
     
     try:
-        await asyncio.to_thread(send_telegram, "EMA/BB Strategy Bot started. Running={}".format(running))
+        enqueue_telegram("EMA/BB Strategy Bot started. Running={}".format(running))
     except Exception:
         log.exception("Failed to send startup telegram")
 
@@ -1159,6 +1790,14 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             log.info("Rogue position checker task cancelled successfully.")
 
+    for task in (user_stream_task, stream_rogue_check_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
     monitor_stop_event.set()
     if monitor_thread_obj and monitor_thread_obj.is_alive():
         monitor_thread_obj.join(timeout=5)
@@ -1170,6 +1809,18 @@ async def lifespan(app: FastAPI):
         # We already set the monitor_stop_event which the telegram thread also checks.
         pass
 
+    if chart_pool is not None:
+        chart_pool.shutdown(wait=False, cancel_futures=True)
+    infer_fetch_pool.shutdown(wait=False, cancel_futures=True)
+    monitor_fetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    if telegram_sender_task is not None:
+        try:
+            await asyncio.wait_for(telegram_queue.join(), timeout=10)
+        except asyncio.TimeoutError:
+            log.warning("Dropping %d undelivered Telegram message(s) at shutdown.", telegram_queue.qsize())
+        telegram_sender_task.cancel()
+
     try:
         await asyncio.to_thread(send_telegram, "EMA/BB Strategy Bot shut down.")
     except Exception:
@@ -1215,12 +1866,16 @@ async def debug_scan_once(symbols: Optional[str] = None):
 # -------------------------
 # Utilities
 # -------------------------
-def _shorten_for_telegram(text: str, max_len: int = 3500) -> str:
+_TRUNC_MARKER = "\n\n[...] (truncated)\n\n"
+# Longest text send_telegram passes through untouched (Telegram itself allows 4096)
+TELEGRAM_MAX_MESSAGE_LEN = 3500
+
+def _shorten_for_telegram(text: str, max_len: int = TELEGRAM_MAX_MESSAGE_LEN) -> str:
     if not isinstance(text, str):
         text = str(text)
     if len(text) <= max_len:
         return text
-    return text[: max_len - 200] + "\n\n[...] (truncated)\n\n" + text[-200:]
+    return f"{text[:max_len - 200]}{_TRUNC_MARKER}{text[-200:]}"
 
 
 def format_timedelta(td) -> str:
@@ -1264,12 +1919,12 @@ def default_sl_tp_for_import(symbol: str, entry_price: float, side: str) -> tupl
         raise RuntimeError("No kline data to calc default SL/TP")
 
     # Compute Supertrend (S4 ST2) and ATR
-    s4_params = CONFIG['STRATEGY_4']
-    st2, _ = supertrend(df.copy(), period=s4_params['ST2_PERIOD'], multiplier=s4_params['ST2_MULT'])
-    df['atr'] = atr(df, CONFIG.get("ATR_LENGTH", 14))
+    s4_params = CFG.s4
+    st2, _ = supertrend(df, period=s4_params.st2_period, multiplier=s4_params.st2_mult)
+    atr_series = atr(df, CONFIG.get("ATR_LENGTH", 14))
 
     current_price = safe_last(df['close'])
-    atr_now = max(1e-9, safe_last(df['atr']))  # avoid zero
+    atr_now = max(1e-9, safe_last(atr_series))  # avoid zero
     stop_price = safe_last(st2)
 
     # Validate side and correct if invalid
@@ -1288,9 +1943,12 @@ def default_sl_tp_for_import(symbol: str, entry_price: float, side: str) -> tupl
     take_price = 0.0
     return stop_price, take_price, current_price
 
+_TIMEFRAME_RE = re.compile(r'(\d+)([mhd])')
+
+@lru_cache(maxsize=32)
 def timeframe_to_timedelta(tf: str) -> Optional[timedelta]:
     """Converts a timeframe string like '1m', '5m', '1h', '1d' to a timedelta object."""
-    match = re.match(r'(\d+)([mhd])', tf)
+    match = _TIMEFRAME_RE.match(tf)
     if not match:
         return None
     val, unit = match.groups()
@@ -1335,15 +1993,93 @@ def send_telegram(msg: str, document_content: Optional[bytes] = None, document_n
         log.exception("Failed to send telegram message")
 
 
+def enqueue_telegram(msg: str, **kwargs):
+    """
+    Queue a send_telegram() call from event-loop code and return immediately; the
+    sender task delivers messages in order. Falls back to a fire-and-forget thread
+    call when the queue isn't running (standalone mode, shutdown).
+    """
+    if telegram_queue is not None and telegram_sender_task is not None and not telegram_sender_task.done():
+        telegram_queue.put_nowait((msg, kwargs))
+    else:
+        asyncio.get_running_loop().run_in_executor(None, functools.partial(send_telegram, msg, **kwargs))
+
+def notify_telegram(msg: str, **kwargs):
+    """
+    Fire-and-forget send_telegram() that is safe from any thread: hands the message to the
+    sender task on the main loop. Falls back to a blocking send when the queue isn't running.
+    """
+    loop = main_loop
+    if (loop is not None and not loop.is_closed() and telegram_queue is not None
+            and telegram_sender_task is not None and not telegram_sender_task.done()):
+        try:
+            in_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            telegram_queue.put_nowait((msg, kwargs))
+        else:
+            loop.call_soon_threadsafe(telegram_queue.put_nowait, (msg, kwargs))
+        return
+    send_telegram(msg, **kwargs)
+
+TELEGRAM_COALESCE_SEPARATOR = "\n\n---\n\n"
+
+async def telegram_sender_loop():
+    """
+    Drains telegram_queue so callers never wait on the Telegram API. Plain-text messages that
+    pile up while a send is in flight (e.g. rejections during a scan) go out as one combined
+    message when they fit under the length send_telegram would truncate at. Markdown messages
+    and attachments are always sent on their own, so one bad entity can't sink a whole batch.
+    """
+    carry = None
+    while True:
+        if carry is None:
+            msg, kwargs = await telegram_queue.get()
+        else:
+            (msg, kwargs), carry = carry, None
+        taken = 1
+        if not set(kwargs) - {"parse_mode"} and kwargs.get("parse_mode") is None:
+            parts, total = [msg], len(msg)
+            while not telegram_queue.empty():
+                nxt = telegram_queue.get_nowait()
+                nxt_msg, nxt_kwargs = nxt
+                added = len(TELEGRAM_COALESCE_SEPARATOR) + len(nxt_msg)
+                if nxt_kwargs != kwargs or total + added > TELEGRAM_MAX_MESSAGE_LEN:
+                    carry = nxt
+                    break
+                parts.append(nxt_msg)
+                total += added
+                taken += 1
+            msg = TELEGRAM_COALESCE_SEPARATOR.join(parts)
+        try:
+            await asyncio.to_thread(send_telegram, msg, **kwargs)
+        except Exception:
+            log.exception("Telegram sender failed to deliver a queued message")
+        finally:
+            for _ in range(taken):
+                telegram_queue.task_done()
+
+
+# symbol -> baseAsset from exchange info. Suffix-strip guesses are not stored, so a guess made
+# before exchange info loads is replaced by the real value once it is available.
+_BASE_ASSET_CACHE: Dict[str, str] = {}
+
+
 def _symbol_base_asset(symbol: str) -> str:
     """
     Try to infer the base asset for a symbol like BTCUSDT -> BTC.
-    Falls back to stripping a stable-quote suffix.
+    Falls back to stripping a stable-quote suffix. Exchange-info answers are memoised:
+    a symbol's base asset never changes.
     """
+    base = _BASE_ASSET_CACHE.get(symbol)
+    if base is not None:
+        return base
     try:
         si = get_symbol_info(symbol)
         if si and 'baseAsset' in si:
-            return str(si['baseAsset']).upper()
+            base = _BASE_ASSET_CACHE[symbol] = str(si['baseAsset']).upper()
+            return base
     except Exception:
         pass
     # Fallback heuristics
@@ -1357,7 +2093,89 @@ def _alphavantage_time_from(dt: datetime) -> str:
     """
     Format datetime for Alpha Vantage NEWS_SENTIMENT time_from param: YYYYMMDDTHHMM
     """
-    return dt.strftime("%Y%m%dT%H%M")
+    return _av_time_from_minute(dt.replace(second=0, microsecond=0))
+
+
+@lru_cache(maxsize=8)
+def _av_time_from_minute(minute: datetime) -> str:
+    # Minute precision: every news lookup in the same minute reuses one formatted string
+    return minute.strftime("%Y%m%dT%H%M")
+
+
+# Shared Alpha Vantage session: keep-alive lets the second ticker candidate and later polls
+# skip the TCP/TLS handshake.
+_AV_SESSION = requests.Session()
+_AV_SESSION.headers.update({"User-Agent": "ema-bb-bot/1.0"})
+_AV_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=["GET"]),
+))
+
+
+@lru_cache(maxsize=4)
+def _av_news_base_url(api_key: str) -> str:
+    """The constant part of the NEWS_SENTIMENT query, encoded once per API key."""
+    return ("https://www.alphavantage.co/query?function=NEWS_SENTIMENT&sort=LATEST"
+            f"&apikey={quote_plus(api_key)}")
+
+
+def _fetch_av_articles(ticker: str, time_from: str, api_key: str, max_items: int) -> list[dict]:
+    """
+    Latest `max_items` NEWS_SENTIMENT articles for one ticker format; [] on a non-200 response.
+    With ijson the feed is parsed incrementally off the socket, and parsing stops once
+    `max_items` articles are in hand; the unparsed tail is still drained.
+    """
+    url = f"{_av_news_base_url(api_key)}&time_from={time_from}&tickers={quote_plus(ticker)}"
+    with _AV_SESSION.get(url, timeout=15, stream=ijson is not None) as resp:
+        if resp.status_code != 200:
+            resp.content  # read the body so the connection returns to the pool
+            return []
+        if ijson is not None:
+            resp.raw.decode_content = True
+            articles = _parse_av_feed(ijson.items(resp.raw, "feed.item"), max_items)
+            # A streamed response closed with unread bytes drops its connection; drain it so
+            # _AV_SESSION keeps the keep-alive connection for the next lookup
+            resp.raw.read()
+            return articles
+        return _parse_av_feed(resp.json().get("feed") or [], max_items)
+
+
+def _parse_av_feed(feed, max_items: int) -> list[dict]:
+    articles: list[dict] = []
+    for item in feed:
+        if len(articles) >= max_items:
+            break
+        try:
+            ts = item.get("time_published")
+            # format: 20250101T120000
+            dt = datetime.strptime(ts, "%Y%m%dT%H%M%S") if ts else None
+            title = item.get("title") or ""
+            url_i = item.get("url") or ""
+            summary = item.get("summary") or ""
+            # Vendor sentiment may exist
+            overall = item.get("overall_sentiment_label") or ""
+            articles.append({
+                "time": dt.isoformat() if dt else ts,
+                "title": title[:180],
+                "url": url_i,
+                "summary": summary[:280],
+                "sentiment": overall
+            })
+        except Exception:
+            continue
+    return articles
+
+
+_NEWS_POSITIVE_KW = (
+    "etf approval", "etf inflow", "partnership", "integration", "upgrade",
+    "mainnet", "testnet", "milestone", "adoption", "institutional", "launch", "listing", "raised"
+)
+_NEWS_NEGATIVE_KW = (
+    "hack", "exploit", "outage", "downtime", "regulatory", "ban", "lawsuit",
+    "sec sues", "delist", "bug", "halt", "penalty", "warning", "vulnerability"
+)
+# Zero-width lookahead so overlapping keywords ("delisting" -> delist + listing) all match, like `kw in text`
+_NEWS_KW_RE = re.compile("(?=(" + "|".join(re.escape(k) for k in _NEWS_POSITIVE_KW + _NEWS_NEGATIVE_KW) + "))")
 
 
 def fetch_recent_news_impact(symbol: str, hours: int = 24, max_items: int = 3) -> Dict[str, Any]:
@@ -1375,59 +2193,19 @@ def fetch_recent_news_impact(symbol: str, hours: int = 24, max_items: int = 3) -
     cutoff = datetime.utcnow() - timedelta(hours=hours)
     time_from = _alphavantage_time_from(cutoff)
     articles: list[dict] = []
-    session = requests.Session()
-    session.headers.update({"User-Agent": "ema-bb-bot/1.0"})
+    # Each call spends API quota, so only fall back to the bare ticker when the primary comes back empty
     for t in candidates:
         try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "NEWS_SENTIMENT",
-                "tickers": t,
-                "sort": "LATEST",
-                "time_from": time_from,
-                "apikey": api_key,
-            }
-            resp = session.get(url, params=params, timeout=15)
-            if resp.status_code != 200:
-                continue
-            data = resp.json()
-            feed = data.get("feed") or []
-            for item in feed:
-                try:
-                    ts = item.get("time_published")
-                    # format: 20250101T120000
-                    dt = datetime.strptime(ts, "%Y%m%dT%H%M%S") if ts else None
-                    title = item.get("title") or ""
-                    url_i = item.get("url") or ""
-                    summary = item.get("summary") or ""
-                    # Vendor sentiment may exist
-                    overall = item.get("overall_sentiment_label") or ""
-                    articles.append({
-                        "time": dt.isoformat() if dt else ts,
-                        "title": title[:180],
-                        "url": url_i,
-                        "summary": summary[:280],
-                        "sentiment": overall
-                    })
-                except Exception:
-                    continue
-            if articles:
-                break
+            articles = _fetch_av_articles(t, time_from, api_key, max_items)
         except Exception:
             continue
+        if articles:
+            break
 
     if not articles:
         return {"impact": "None", "reason": "No recent news found.", "articles": []}
 
     # Simple impact scoring
-    positive_kw = [
-        "etf approval", "etf inflow", "partnership", "integration", "upgrade",
-        "mainnet", "testnet", "milestone", "adoption", "institutional", "launch", "listing", "raised"
-    ]
-    negative_kw = [
-        "hack", "exploit", "outage", "downtime", "regulatory", "ban", "lawsuit",
-        "sec sues", "delist", "bug", "halt", "penalty", "warning", "vulnerability"
-    ]
     pos, neg = 0, 0
     reasons = []
     for a in articles[:max_items]:
@@ -1438,15 +2216,17 @@ def fetch_recent_news_impact(symbol: str, hours: int = 24, max_items: int = 3) -
             pos += 1
         elif "negative" in s:
             neg += 1
-        # keyword scoring
-        for kw in positive_kw:
-            if kw in text:
-                pos += 1
-                reasons.append(f"+ {kw}")
-        for kw in negative_kw:
-            if kw in text:
-                neg += 1
-                reasons.append(f"- {kw}")
+        # keyword scoring: one regex pass, each distinct keyword counts once
+        found = {m.group(1) for m in _NEWS_KW_RE.finditer(text)}
+        if found:
+            for kw in _NEWS_POSITIVE_KW:
+                if kw in found:
+                    pos += 1
+                    reasons.append(f"+ {kw}")
+            for kw in _NEWS_NEGATIVE_KW:
+                if kw in found:
+                    neg += 1
+                    reasons.append(f"- {kw}")
 
     if pos > neg and (pos - neg) >= 1:
         impact = "Positive"
@@ -1462,7 +2242,7 @@ def fetch_recent_news_impact(symbol: str, hours: int = 24, max_items: int = 3) -
 def log_and_send_error(context_msg: str, exc: Optional[Exception] = None):
     """
     Logs an exception and sends a formatted error message to Telegram.
-    This is a synchronous, blocking call.
+    The Telegram send is queued (see notify_telegram), so this never waits on the API.
     """
     # Log the full traceback to the console/log file
     if exc:
@@ -1492,7 +2272,7 @@ def log_and_send_error(context_msg: str, exc: Optional[Exception] = None):
     )
     
     # Send the message, using Markdown for formatting
-    send_telegram(telegram_msg, parse_mode='Markdown')
+    notify_telegram(telegram_msg, parse_mode='Markdown')
 
 
 def _json_native(val: Any) -> Any:
@@ -1513,25 +2293,70 @@ def _json_native(val: Any) -> Any:
         # Last resort: stringify
         return str(val)
 
+# Rejection lines are appended to the file in batches by a background thread, so a burst
+# of rejections costs one open/write instead of one per line.
+REJECTIONS_FILE = "rejections.jsonl"
+REJECTION_FLUSH_INTERVAL_SEC = 1.0
+_rejection_queue: "queue.Queue[bytes]" = queue.Queue()
+_rejection_file_lock = threading.Lock()
+_rejection_flusher: Optional[threading.Thread] = None
+_rejection_flusher_lock = threading.Lock()
+
+def _flush_rejections():
+    """Append everything queued so far to the rejections file."""
+    lines = []
+    try:
+        while True:
+            lines.append(_rejection_queue.get_nowait())
+    except queue.Empty:
+        pass
+    if not lines:
+        return
+    with _rejection_file_lock:
+        try:
+            with open(REJECTIONS_FILE, "ab", buffering=1 << 16) as f:
+                f.writelines(lines)
+        except Exception as e:
+            log.error("Failed to write %d rejection(s) to file: %s", len(lines), e)
+
+def _rejection_flusher_loop():
+    # Lines stay in the queue until written, so the atexit drain can't miss one held here
+    while True:
+        time.sleep(REJECTION_FLUSH_INTERVAL_SEC)
+        _flush_rejections()
+
+def _queue_rejection_line(line: bytes):
+    global _rejection_flusher
+    _rejection_queue.put(line)
+    if _rejection_flusher is None:
+        with _rejection_flusher_lock:
+            if _rejection_flusher is None:
+                _rejection_flusher = threading.Thread(target=_rejection_flusher_loop, name="rejections-flusher", daemon=True)
+                _rejection_flusher.start()
+                atexit.register(_flush_rejections)
+
+_REJECTION_INDICATOR_KEYS = ('close', 'rsi', 'adx', 's1_bbu', 's1_bbl', 's2_st', 's4_st1', 's4_st2', 's4_st3')
+# Exact types that are already JSON-native (np.float64 subclasses float, so isinstance won't do)
+_JSON_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
 def _record_rejection(symbol: str, reason: str, details: dict, signal_candle: Optional[pd.Series] = None):
     """Adds a rejected trade event to the deque and persists it to a file."""
     global rejected_trades
 
     # Enrich details with key indicator values from the signal candle if available
     if signal_candle is not None:
-        indicator_keys = ['close', 'rsi', 'adx', 's1_bbu', 's1_bbl', 's2_st', 's4_st1', 's4_st2', 's4_st3']
-        for key in indicator_keys:
-            if key in signal_candle and pd.notna(signal_candle[key]):
-                details[key] = signal_candle[key]
-
-    # Normalize to JSON-native types first (so numpy types don't break json.dumps)
-    native_details = {k: _json_native(v) for k, v in details.items()}
-
-    # Format floats in details to a reasonable precision for display
-    formatted_details = {
-        k: (f"{v:.4f}" if isinstance(v, float) else v)
-        for k, v in native_details.items()
-    }
+        for key in _REJECTION_INDICATOR_KEYS:
+            val = signal_candle.get(key)
+            if val is not None and pd.notna(val):
+                details[key] = val
+
+    # One pass: normalize to JSON-native types (so numpy types don't break json.dumps),
+    # then format floats to a reasonable precision for display
+    formatted_details = {}
+    for k, v in details.items():
+        if type(v) not in _JSON_PRIMITIVE_TYPES:
+            v = _json_native(v)
+        formatted_details[k] = format(v, ".4f") if type(v) is float else v
 
     record = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -1543,15 +2368,12 @@ def _record_rejection(symbol: str, reason: str, details: dict, signal_candle: Op
     # 1. Append to in-memory deque
     rejected_trades.append(record)
     
-    # 2. Persist to file
-    try:
-        with open("rejections.jsonl", "a") as f:
-            f.write(json.dumps(record) + "\n")
-    except Exception as e:
-        log.error(f"Failed to write rejection to file: {e}")
+    # 2. Persist to file (batched by the flusher thread)
+    _queue_rejection_line(json_dumps_line(record))
 
-    # Use info level for rejection logs to make them visible.
-    log.info(f"Rejected trade for {symbol}. Reason: {reason}, Details: {formatted_details}")
+    # Use info level for rejection logs to make them visible. Lazy %-args: every scan
+    # rejects far more often than it accepts, so skip formatting when INFO is off.
+    log.info("Rejected trade for %s. Reason: %s, Details: %s", symbol, reason, formatted_details)
 
     # --- Conditional Telegram Notification ---
     if CONFIG.get("TELEGRAM_NOTIFY_REJECTIONS", False):
@@ -1562,7 +2384,7 @@ def _record_rejection(symbol: str, reason: str, details: dict, signal_candle: Op
             f"Reason: {reason}\n"
             f"Details: {details_str}"
         )
-        send_telegram(msg)
+        notify_telegram(msg)
 
 
 def handle_reject_cmd():
@@ -1625,6 +2447,17 @@ SESSION_FREEZE_WINDOWS = {
     "New York": (12, 14),
     "Tokyo": (23, 1)  # Crosses midnight
 }
+# (bit, start, end) per session, as offsets from the window's start-day midnight; overnight windows
+# end the next day. Merged windows OR their session bits, and _SESSION_FREEZE_NAMES maps every
+# bitmask to its "A & B" label up front.
+_SESSION_FREEZE_OFFSETS = tuple(
+    (1 << i, timedelta(hours=start_hour), timedelta(days=0 if start_hour < end_hour else 1, hours=end_hour))
+    for i, (start_hour, end_hour) in enumerate(SESSION_FREEZE_WINDOWS.values())
+)
+_SESSION_FREEZE_NAMES = tuple(
+    " & ".join(sorted(name for i, name in enumerate(SESSION_FREEZE_WINDOWS) if mask >> i & 1))
+    for mask in range(1 << len(SESSION_FREEZE_WINDOWS))
+)
 
 
 def get_merged_freeze_intervals() -> list[tuple[datetime, datetime, str]]:
@@ -1633,72 +2466,52 @@ def get_merged_freeze_intervals() -> list[tuple[datetime, datetime, str]]:
     This handles overlaps and contiguous sessions, returning a clean list of
     absolute (start_datetime, end_datetime, session_name) intervals.
     """
-    from datetime import timedelta
-
     now_utc = datetime.now(timezone.utc)
-    today = now_utc.date()
-    tomorrow = today + timedelta(days=1)
-    day_after = today + timedelta(days=2)
+    # Filter out intervals that have already completely passed
+    return [m for m in _merged_freeze_intervals_for_day(now_utc.date()) if now_utc < m[1]]
+
+
+@lru_cache(maxsize=2)
+def _merged_freeze_intervals_for_day(today) -> tuple[tuple[datetime, datetime, str], ...]:
+    """The merged windows starting on `today` and the next day; only changes when the UTC date does."""
+    midnight = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
 
     intervals = []
     # Get all intervals for today and tomorrow
-    for name, (start_hour, end_hour) in SESSION_FREEZE_WINDOWS.items():
-        if start_hour < end_hour:  # Same day window
-            # Today's window
-            intervals.append((
-                datetime(today.year, today.month, today.day, start_hour, 0, tzinfo=timezone.utc),
-                datetime(today.year, today.month, today.day, end_hour, 0, tzinfo=timezone.utc),
-                name
-            ))
-            # Tomorrow's window
-            intervals.append((
-                datetime(tomorrow.year, tomorrow.month, tomorrow.day, start_hour, 0, tzinfo=timezone.utc),
-                datetime(tomorrow.year, tomorrow.month, tomorrow.day, end_hour, 0, tzinfo=timezone.utc),
-                name
-            ))
-        else:  # Overnight window
-            # Today into Tomorrow
-            intervals.append((
-                datetime(today.year, today.month, today.day, start_hour, 0, tzinfo=timezone.utc),
-                datetime(tomorrow.year, tomorrow.month, tomorrow.day, end_hour, 0, tzinfo=timezone.utc),
-                name
-            ))
-            # Tomorrow into Day After
-            intervals.append((
-                datetime(tomorrow.year, tomorrow.month, tomorrow.day, start_hour, 0, tzinfo=timezone.utc),
-                datetime(day_after.year, day_after.month, day_after.day, end_hour, 0, tzinfo=timezone.utc),
-                name
-            ))
+    for day in (0, 1):
+        day_start = midnight + timedelta(days=day)
+        for bit, start_off, end_off in _SESSION_FREEZE_OFFSETS:
+            intervals.append((day_start + start_off, day_start + end_off, bit))
 
     # Sort intervals by start time
     intervals.sort(key=lambda x: x[0])
 
     if not intervals:
-        return []
+        return ()
 
     # Merge overlapping intervals
     merged = []
-    current_start, current_end, current_names = intervals[0]
-    current_names = {current_names}
+    current_start, current_end, current_mask = intervals[0]
 
-    for next_start, next_end, next_name in intervals[1:]:
+    for next_start, next_end, next_bit in intervals[1:]:
         if next_start <= current_end:
             # Overlap or contiguous, merge them
             current_end = max(current_end, next_end)
-            current_names.add(next_name)
+            current_mask |= next_bit
         else:
             # No overlap, finish the current merged interval
-            merged.append((current_start, current_end, " & ".join(sorted(list(current_names)))))
+            merged.append((current_start, current_end, _SESSION_FREEZE_NAMES[current_mask]))
             # Start a new one
-            current_start, current_end, current_names = next_start, next_end, {next_name}
+            current_start, current_end, current_mask = next_start, next_end, next_bit
 
     # Add the last merged interval
-    merged.append((current_start, current_end, " & ".join(sorted(list(current_names)))))
-    
-    # Filter out intervals that have already completely passed
-    final_intervals = [m for m in merged if now_utc < m[1]]
+    merged.append((current_start, current_end, _SESSION_FREEZE_NAMES[current_mask]))
+    return tuple(merged)
+
 
-    return final_intervals
+@lru_cache(maxsize=2)
+def _freeze_starts_for_day(today) -> list[datetime]:
+    return [m[0] for m in _merged_freeze_intervals_for_day(today)]
 
 
 def get_session_freeze_status(now: datetime) -> tuple[bool, Optional[str]]:
@@ -1706,10 +2519,12 @@ def get_session_freeze_status(now: datetime) -> tuple[bool, Optional[str]]:
     Checks if the current time is within a session freeze window using the merged intervals.
     Returns a tuple of (is_frozen, session_name).
     """
-    merged_intervals = get_merged_freeze_intervals()
-    for start, end, name in merged_intervals:
-        if start <= now < end:
-            return True, name
+    today = datetime.now(timezone.utc).date()
+    merged = _merged_freeze_intervals_for_day(today)
+    # The merged windows are sorted and disjoint, so only the last one starting at or before now can hold it
+    i = bisect.bisect_right(_freeze_starts_for_day(today), now) - 1
+    if i >= 0 and merged[i][0] <= now < merged[i][1]:
+        return True, merged[i][2]
     return False, None
 
 
@@ -1719,9 +2534,74 @@ def get_session_freeze_status(now: datetime) -> tuple[bool, Optional[str]]:
 # -------------------------
 # DB helpers
 # -------------------------
-def init_db():
+def db_connect() -> sqlite3.Connection:
+    """
+    Open the bot DB. The file is in WAL mode (set by init_db), so with synchronous=NORMAL
+    commits don't fsync and the monitor/report readers don't block on a writer.
+    """
     conn = sqlite3.connect(CONFIG["DB_FILE"])
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=134217728")
+    return conn
+
+_db_local = threading.local()
+
+def db_connection() -> sqlite3.Connection:
+    """
+    This thread's long-lived connection, for the small per-trade reads/writes. Callers must
+    not close it; use `with conn:` around writes so a failure rolls back instead of leaving
+    a transaction (and the write lock) open.
+    """
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None or _db_local.path != CONFIG["DB_FILE"]:
+        conn = db_connect()
+        _db_local.conn, _db_local.path = conn, CONFIG["DB_FILE"]
+    return conn
+
+# Columns added after the tables were first shipped, in the order they were introduced
+TRADES_MIGRATION_COLUMNS = {
+    "risk_usdt": "REAL",
+    # enhanced reporting
+    "entry_reason": "TEXT",
+    "exit_reason": "TEXT",
+    "tp1": "REAL",
+    "tp2": "REAL",
+    # SuperTrend strategy
+    "strategy_id": "INTEGER",
+    "signal_confidence": "REAL",
+    "adx_confirmation": "REAL",
+    "rsi_confirmation": "REAL",
+    "macd_confirmation": "REAL",
+    "atr_at_entry": "REAL",
+}
+MANAGED_TRADES_MIGRATION_COLUMNS = {
+    "strategy_id": "INTEGER",
+    "atr_at_entry": "REAL",
+    # Strategy 3
+    "s3_trailing_active": "INTEGER",
+    "s3_trailing_stop": "REAL",
+    # Strategy 4
+    "s4_trailing_stop": "REAL",
+    "s4_last_candle_ts": "TEXT",
+    "s4_trailing_active": "INTEGER",
+}
+
+def _add_missing_columns(cur: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+    """ALTER in only the columns PRAGMA table_info says the table lacks."""
+    existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+    for col, col_type in columns.items():
+        if col not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}")
+
+def init_db():
+    conn = db_connect()
+    # journal_mode is persistent in the file, so this only needs to happen once
+    conn.execute("PRAGMA journal_mode=WAL")
     cur = conn.cursor()
+    # sqlite3 runs DDL in autocommit mode, so open the transaction explicitly: the schema
+    # setup below then commits once at the end instead of once per statement.
+    cur.execute("BEGIN")
     # Historical trades table
     cur.execute("""
     CREATE TABLE IF NOT EXISTS trades (
@@ -1738,46 +2618,9 @@ def init_db():
         close_time TEXT
     )
     """)
-    # Add column if it doesn't exist for backward compatibility
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN risk_usdt REAL")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e):
-            raise
-    
-    # Add new columns for enhanced reporting
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN entry_reason TEXT")
-    except sqlite3.OperationalError: pass # Ignore if column exists
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN exit_reason TEXT")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN tp1 REAL")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN tp2 REAL")
-    except sqlite3.OperationalError: pass
-
-    # --- New columns for SuperTrend Strategy ---
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN strategy_id INTEGER")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN signal_confidence REAL")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN adx_confirmation REAL")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN rsi_confirmation REAL")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN macd_confirmation REAL")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE trades ADD COLUMN atr_at_entry REAL")
-    except sqlite3.OperationalError: pass
+    _add_missing_columns(cur, "trades", TRADES_MIGRATION_COLUMNS)
+    # Range lookups for prune_trades_db and the month/period reports
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_trades_close_time ON trades(close_time)")
 
     # Persistent open trades table for crash recovery
     cur.execute("""
@@ -1806,30 +2649,8 @@ def init_db():
         atr_at_entry REAL
     )
     """)
-    # Add strategy_id for strategy-specific logic in monitor thread
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN strategy_id INTEGER")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN atr_at_entry REAL")
-    except sqlite3.OperationalError: pass
-    # --- New columns for Strategy 3 ---
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN s3_trailing_active INTEGER")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN s3_trailing_stop REAL")
-    except sqlite3.OperationalError: pass
-    # --- New columns for Strategy 4 ---
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN s4_trailing_stop REAL")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN s4_last_candle_ts TEXT")
-    except sqlite3.OperationalError: pass
-    try:
-        cur.execute("ALTER TABLE managed_trades ADD COLUMN s4_trailing_active INTEGER")
-    except sqlite3.OperationalError: pass
+    _add_missing_columns(cur, "managed_trades", MANAGED_TRADES_MIGRATION_COLUMNS)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_managed_trades_symbol ON managed_trades(symbol)")
 
     # Table for symbols that require manual attention
     cur.execute("""
@@ -1863,12 +2684,14 @@ def init_db():
     """)
 
     conn.commit()
+    # Refresh planner statistics so the indexes above are actually chosen
+    conn.execute("ANALYZE")
     conn.close()
 
     # --- Ensure rejections file exists ---
     try:
         # "touch" the file to ensure it's created on startup if it doesn't exist
-        with open("rejections.jsonl", "a"):
+        with open(REJECTIONS_FILE, "a"):
             pass
         log.info("Ensured rejections.jsonl file exists.")
     except Exception as e:
@@ -1876,9 +2699,6 @@ def init_db():
 
 
 def add_pending_order_to_db(rec: Dict[str, Any]):
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    cur = conn.cursor()
-
     # Coalesce NOT NULL columns to safe defaults
     stop_val = rec.get('stop_price', 0.0)
     if stop_val is None:
@@ -1893,29 +2713,32 @@ def add_pending_order_to_db(rec: Dict[str, Any]):
         rec.get('leverage'), rec.get('risk_usdt'), rec.get('place_time'), rec.get('expiry_time'),
         rec.get('strategy_id'), rec.get('atr_at_entry'), int(rec.get('trailing', False))
     )
-    cur.execute("""
-    INSERT OR REPLACE INTO pending_limit_orders (
-        id, order_id, symbol, side, qty, limit_price, stop_price, take_price,
-        leverage, risk_usdt, place_time, expiry_time, strategy_id, atr_at_entry, trailing
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, values)
-    conn.commit()
-    conn.close()
+    conn = db_connection()
+    with conn:
+        conn.execute("""
+        INSERT OR REPLACE INTO pending_limit_orders (
+            id, order_id, symbol, side, qty, limit_price, stop_price, take_price,
+            leverage, risk_usdt, place_time, expiry_time, strategy_id, atr_at_entry, trailing
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, values)
 
 def remove_pending_order_from_db(pending_order_id: str):
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    cur = conn.cursor()
-    cur.execute("DELETE FROM pending_limit_orders WHERE id = ?", (pending_order_id,))
-    conn.commit()
-    conn.close()
+    conn = db_connection()
+    with conn:
+        conn.execute("DELETE FROM pending_limit_orders WHERE id = ?", (pending_order_id,))
+
+def remove_pending_orders_from_db(pending_order_ids: list[str]):
+    """Delete several pending orders in one transaction."""
+    if not pending_order_ids:
+        return
+    conn = db_connection()
+    with conn:
+        conn.executemany("DELETE FROM pending_limit_orders WHERE id = ?", [(p_id,) for p_id in pending_order_ids])
 
 def load_pending_orders_from_db() -> Dict[str, Dict[str, Any]]:
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM pending_limit_orders")
-    rows = cur.fetchall()
-    conn.close()
+    cur = db_connection().cursor()
+    cur.row_factory = sqlite3.Row  # per cursor: the connection is shared
+    rows = cur.execute("SELECT * FROM pending_limit_orders").fetchall()
 
     orders = {}
     for row in rows:
@@ -1924,89 +2747,110 @@ def load_pending_orders_from_db() -> Dict[str, Dict[str, Any]]:
         orders[rec['id']] = rec
     return orders
 
-def record_trade(rec: Dict[str, Any]):
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    cur = conn.cursor()
-    cur.execute("""
-    INSERT OR REPLACE INTO trades (
-        id,symbol,side,entry_price,exit_price,qty,notional,risk_usdt,pnl,
-        open_time,close_time,entry_reason,exit_reason,tp1,tp2,
-        strategy_id, signal_confidence, adx_confirmation, rsi_confirmation, macd_confirmation,
-        atr_at_entry
-    )
-    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-    """, (
-        rec.get('id'), rec.get('symbol'), rec.get('side'), rec.get('entry_price'), rec.get('exit_price'),
-        rec.get('qty'), rec.get('notional'), rec.get('risk_usdt'), rec.get('pnl'), 
-        rec.get('open_time'), rec.get('close_time'), rec.get('entry_reason'), rec.get('exit_reason'),
-        rec.get('tp1'), rec.get('tp2'),
-        rec.get('strategy_id'), rec.get('signal_confidence'), rec.get('adx_confirmation'),
-        rec.get('rsi_confirmation'), rec.get('macd_confirmation'),
-        rec.get('atr_at_entry')
-    ))
-    conn.commit()
-    conn.close()
+_TRADE_KEYS = (
+    'id', 'symbol', 'side', 'entry_price', 'exit_price', 'qty', 'notional', 'risk_usdt', 'pnl',
+    'open_time', 'close_time', 'entry_reason', 'exit_reason', 'tp1', 'tp2',
+    'strategy_id', 'signal_confidence', 'adx_confirmation', 'rsi_confirmation', 'macd_confirmation',
+    'atr_at_entry',
+)
+_TRADE_DEFAULTS = dict.fromkeys(_TRADE_KEYS)
+_TRADE_GETTER = operator.itemgetter(*_TRADE_KEYS)
+
+_TRADES_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO trades ({','.join(_TRADE_KEYS)}) "
+    f"VALUES ({','.join('?' * len(_TRADE_KEYS))})"
+)
+
+_MANAGED_TRADE_KEYS = (
+    'id', 'symbol', 'side', 'entry_price', 'initial_qty', 'qty', 'notional',
+    'leverage', 'sl', 'tp', 'open_time', 'sltp_orders', 'trailing', 'dyn_sltp',
+    'tp1', 'tp2', 'tp3', 'trade_phase', 'be_moved', 'risk_usdt', 'strategy_id', 'atr_at_entry',
+    's3_trailing_active', 's3_trailing_stop', 's4_trailing_stop', 's4_last_candle_ts',
+    's4_trailing_active',
+)
+# Optional columns only: the required ones (id, symbol, side, prices, qty, ...) still raise KeyError when missing.
+_MANAGED_TRADE_DEFAULTS = {
+    'sl': None, 'tp': None, 'sltp_orders': None, 'trailing': False, 'dyn_sltp': False,
+    'tp1': None, 'tp2': None, 'tp3': None, 'trade_phase': 0, 'be_moved': False,
+    'risk_usdt': None, 'strategy_id': 1, 'atr_at_entry': None,
+    's3_trailing_active': False, 's3_trailing_stop': None,
+    's4_trailing_stop': None, 's4_last_candle_ts': None, 's4_trailing_active': False,
+}
 
-def add_managed_trade_to_db(rec: Dict[str, Any]):
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    cur = conn.cursor()
+_MANAGED_TRADES_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO managed_trades ({','.join(_MANAGED_TRADE_KEYS)}) "
+    f"VALUES ({','.join('?' * len(_MANAGED_TRADE_KEYS))})"
+)
 
-    # Coalesce required NOT NULL fields to safe defaults
-    sl_val = rec.get('sl', 0.0) if rec.get('sl', None) is not None else 0.0
-    tp_val = rec.get('tp', 0.0) if rec.get('tp', None) is not None else 0.0
+def _trade_row(rec: Dict[str, Any]) -> tuple:
+    return _TRADE_GETTER({**_TRADE_DEFAULTS, **rec})
 
-    values = (
-        rec['id'], rec['symbol'], rec['side'], rec['entry_price'], rec['initial_qty'],
-        rec['qty'], rec['notional'], rec['leverage'], sl_val, tp_val,
-        rec['open_time'], json.dumps(rec.get('sltp_orders')),
-        int(rec.get('trailing', False)), int(rec.get('dyn_sltp', False)),
-        rec.get('tp1'), rec.get('tp2'), rec.get('tp3'),
-        rec.get('trade_phase', 0), int(rec.get('be_moved', False)),
-        rec.get('risk_usdt'), rec.get('strategy_id', 1),
-        rec.get('atr_at_entry'),
+def _managed_trade_row(rec: Dict[str, Any]) -> tuple:
+    d = {**_MANAGED_TRADE_DEFAULTS, **rec}
+    # Coalesce required NOT NULL fields to safe defaults
+    sl_val = d['sl']
+    tp_val = d['tp']
+    return (
+        d['id'], d['symbol'], d['side'], d['entry_price'], d['initial_qty'],
+        d['qty'], d['notional'], d['leverage'],
+        0.0 if sl_val is None else sl_val, 0.0 if tp_val is None else tp_val,
+        d['open_time'], json_dumps(d['sltp_orders']),
+        int(d['trailing']), int(d['dyn_sltp']),
+        d['tp1'], d['tp2'], d['tp3'],
+        d['trade_phase'], int(d['be_moved']),
+        d['risk_usdt'], d['strategy_id'], d['atr_at_entry'],
         # S3 specific fields
-        int(rec.get('s3_trailing_active', False)),
-        rec.get('s3_trailing_stop'),
+        int(d['s3_trailing_active']), d['s3_trailing_stop'],
         # S4 specific fields
-        rec.get('s4_trailing_stop'),
-        rec.get('s4_last_candle_ts'),
-        int(rec.get('s4_trailing_active', False))
+        d['s4_trailing_stop'], d['s4_last_candle_ts'], int(d['s4_trailing_active'])
     )
-    cur.execute("""
-    INSERT OR REPLACE INTO managed_trades (
-        id, symbol, side, entry_price, initial_qty, qty, notional,
-        leverage, sl, tp, open_time, sltp_orders, trailing, dyn_sltp,
-        tp1, tp2, tp3, trade_phase, be_moved, risk_usdt, strategy_id, atr_at_entry,
-        s3_trailing_active, s3_trailing_stop, s4_trailing_stop, s4_last_candle_ts,
-        s4_trailing_active
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, values)
-    conn.commit()
-    conn.close()
+
+def record_trade(rec: Dict[str, Any]):
+    conn = db_connection()
+    with conn:
+        conn.execute(_TRADES_INSERT_SQL, _trade_row(rec))
+
+def archive_trades_db(recs: list[Dict[str, Any]]):
+    """Move closed trades from managed_trades into trade history, all in one transaction."""
+    if not recs:
+        return
+    conn = db_connection()
+    with conn:
+        conn.executemany(_TRADES_INSERT_SQL, [_trade_row(r) for r in recs])
+        conn.executemany("DELETE FROM managed_trades WHERE id = ?", [(r['id'],) for r in recs])
+
+def add_managed_trade_to_db(rec: Dict[str, Any]):
+    conn = db_connection()
+    with conn:
+        conn.execute(_MANAGED_TRADES_INSERT_SQL, _managed_trade_row(rec))
 
 def remove_managed_trade_from_db(trade_id: str):
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    cur = conn.cursor()
-    cur.execute("DELETE FROM managed_trades WHERE id = ?", (trade_id,))
-    conn.commit()
-    conn.close()
+    conn = db_connection()
+    with conn:
+        conn.execute("DELETE FROM managed_trades WHERE id = ?", (trade_id,))
 
-def mark_attention_required_sync(symbol: str, reason: str, details: str):
-    """Adds or updates an attention required flag for a symbol in the database."""
+def mark_attention_required_many(items: list[tuple[str, str, str]]):
+    """Adds or updates attention required flags for (symbol, reason, details) items in one transaction."""
+    if not items:
+        return
+    ts = datetime.utcnow().isoformat()
     try:
-        conn = sqlite3.connect(CONFIG["DB_FILE"])
-        cur = conn.cursor()
-        cur.execute("INSERT OR REPLACE INTO attention_required (symbol, reason, details, timestamp) VALUES (?, ?, ?, ?)",
-                    (symbol, reason, details, datetime.utcnow().isoformat()))
-        conn.commit()
-        conn.close()
-        log.info(f"Marked '{symbol}' for attention. Reason: {reason}")
+        conn = db_connection()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO attention_required (symbol, reason, details, timestamp) VALUES (?, ?, ?, ?)",
+                             [(symbol, reason, details, ts) for symbol, reason, details in items])
+        for symbol, reason, _ in items:
+            log.info(f"Marked '{symbol}' for attention. Reason: {reason}")
     except Exception as e:
-        log.exception(f"Failed to mark attention for {symbol}: {e}")
+        log.exception(f"Failed to mark attention for {', '.join(i[0] for i in items)}: {e}")
+
+def mark_attention_required_sync(symbol: str, reason: str, details: str):
+    """Adds or updates an attention required flag for a symbol in the database."""
+    mark_attention_required_many([(symbol, reason, details)])
 
 def prune_trades_db(year: int, month: int):
     """Deletes all trades from the database for a specific month."""
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
+    conn = db_connect()
     cur = conn.cursor()
     
     start_date = f"{year}-{month:02d}-01"
@@ -2032,17 +2876,14 @@ def prune_trades_db(year: int, month: int):
         conn.close()
 
 def load_managed_trades_from_db() -> Dict[str, Dict[str, Any]]:
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM managed_trades")
-    rows = cur.fetchall()
-    conn.close()
+    cur = db_connection().cursor()
+    cur.row_factory = sqlite3.Row  # per cursor: the connection is shared
+    rows = cur.execute("SELECT * FROM managed_trades").fetchall()
 
     trades = {}
     for row in rows:
         rec = dict(row)
-        rec['sltp_orders'] = json.loads(rec.get('sltp_orders', '{}') or '{}')
+        rec['sltp_orders'] = json_loads(rec.get('sltp_orders', '{}') or '{}')
         rec['trailing'] = bool(rec.get('trailing'))
         rec['dyn_sltp'] = bool(rec.get('dyn_sltp'))
         rec['be_moved'] = bool(rec.get('be_moved'))
@@ -2054,23 +2895,105 @@ def load_managed_trades_from_db() -> Dict[str, Dict[str, Any]]:
 # -------------------------
 # Indicators
 # -------------------------
+# -------------------------
+# Incremental indicator cache
+# -------------------------
+@dataclass
+class IndicatorState:
+    """Recursion state of one indicator after the last *closed* bar folded into it."""
+    last_close_time: pd.Timestamp
+    last_close: float
+    carry: tuple
+    history: tuple  # one float64 array per output, aligned to the closed bars
+
+
+# Keyed by (symbol, timeframe, indicator, *params). Entries are pruned per scan cycle.
+indicator_cache: Dict[tuple, IndicatorState] = {}
+indicator_cache_lock = threading.Lock()
+INDICATOR_MAX_STEP_BARS = 5  # beyond this many new closed bars a cold start is cheaper/safer
+
+
+def _incremental_indicator(key: Optional[tuple], index: pd.Index, high: np.ndarray, low: np.ndarray, close: np.ndarray, cold_fn, step_fn) -> tuple:
+    """
+    Returns a tuple of float64 arrays aligned to `index`.
+    cold_fn() -> (outputs, carry_after_bar[-2]) is the full recompute; step_fn(carry, h, l, c) -> (outputs, carry)
+    extends the state by one bar. The last bar is the still-forming candle: it's derived from the carried
+    state but never committed, so the next scan re-derives it from the closed bars only.
+    """
+    n = len(index)
+    if key is None or n < 3:
+        return cold_fn()[0]
+
+    with indicator_cache_lock:
+        st = indicator_cache.get(key)
+
+    outputs = None
+    new_state = None
+    if st is not None:
+        j = int(index.get_indexer([st.last_close_time])[0])
+        hist_len = len(st.history[0])
+        if n - 2 - INDICATOR_MAX_STEP_BARS <= j <= n - 2 and hist_len >= j + 1 and float(close[j]) == st.last_close:
+            carry = st.carry
+            new_rows = []
+            for i in range(j + 1, n - 1):
+                out, carry = step_fn(carry, float(high[i]), float(low[i]), float(close[i]))
+                new_rows.append(out)
+            forming, _ = step_fn(carry, float(high[-1]), float(low[-1]), float(close[-1]))
+            closed = tuple(
+                np.concatenate((hist[hist_len - (j + 1):], np.array([r[m] for r in new_rows], dtype=np.float64)))
+                for m, hist in enumerate(st.history)
+            )
+            outputs = tuple(np.append(c, f) for c, f in zip(closed, forming))
+            new_state = IndicatorState(index[-2], float(close[-2]), carry, closed)
+
+    if outputs is None:
+        outputs, carry = cold_fn()
+        if carry is not None and all(np.isfinite(carry)):
+            new_state = IndicatorState(index[-2], float(close[-2]), tuple(float(x) for x in carry), tuple(o[:-1].copy() for o in outputs))
+
+    if new_state is not None:
+        with indicator_cache_lock:
+            indicator_cache[key] = new_state
+    return outputs
+
+
+def prune_indicator_cache(active_symbols) -> None:
+    """Drops cached indicator state for symbols that are no longer scanned."""
+    active = set(active_symbols)
+    with indicator_cache_lock:
+        for key in [k for k in indicator_cache if k[0] not in active]:
+            del indicator_cache[key]
+
+
 def atr(df: pd.DataFrame, length: int) -> pd.Series:
+    tr = _true_range_nb(
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        df['close'].to_numpy(dtype=np.float64),
+    )
+    return pd.Series(_rolling_mean_nb(tr, int(length), 1), index=df.index)
+
+def atr_wilder(df: pd.DataFrame, length: int, cache_key: Optional[tuple] = None) -> pd.Series:
+    """
+    Calculates the Average True Range (ATR) using Wilder's smoothing.
+    Pass cache_key=(symbol, timeframe) to extend the previous scan's state instead of recomputing.
+    """
     high = df['high']; low = df['low']; close = df['close']
-    tr1 = high - low
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    return tr.rolling(length, min_periods=1).mean()
-
-def atr_wilder(df: pd.DataFrame, length: int) -> pd.Series:
-    """Calculates the Average True Range (ATR) using Wilder's smoothing."""
-    high = df['high']; low = df['low']; close = df['close']
-    tr1 = high - low
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    # Wilder's smoothing is an EMA with alpha = 1/length
-    return tr.ewm(alpha=1/length, adjust=False).mean()
+
+    def _cold():
+        tr = _true_range_nb(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64), close.to_numpy(dtype=np.float64))
+        # Wilder's smoothing is an EMA with alpha = 1/length
+        vals = _ewm_nb(tr, 1.0 / length)
+        carry = (vals[-2], float(close.iloc[-2])) if len(vals) >= 2 else None
+        return (vals,), carry
+
+    key = cache_key + ("atr_wilder", int(length)) if cache_key else None
+    alpha = 1.0 / length
+    (vals,) = _incremental_indicator(
+        key, df.index, high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64), close.to_numpy(dtype=np.float64),
+        _cold, lambda st, h, l, c: step_atr_wilder(st, h, l, c, alpha),
+    )
+    return pd.Series(vals, index=df.index)
 
 def hhv(series: pd.Series, length: int) -> pd.Series:
     """Calculates the Highest High Value over a given period."""
@@ -2087,9 +3010,25 @@ def sma(series: pd.Series, length: int) -> pd.Series:
     """Calculates the Simple Moving Average (SMA)."""
     return series.rolling(window=length).mean()
 
-def ema(series: pd.Series, length: int) -> pd.Series:
-    """Calculates the Exponential Moving Average (EMA)."""
-    return series.ewm(span=length, adjust=False).mean()
+def ema(series: pd.Series, length: int, cache_key: Optional[tuple] = None) -> pd.Series:
+    """
+    Calculates the Exponential Moving Average (EMA).
+    Pass cache_key=(symbol, timeframe) to extend the previous scan's state instead of recomputing.
+    """
+    if not cache_key:
+        return series.ewm(span=length, adjust=False).mean()
+
+    def _cold():
+        vals = series.ewm(span=length, adjust=False).mean().to_numpy(dtype=np.float64)
+        return (vals,), ((vals[-2],) if len(vals) >= 2 else None)
+
+    alpha = 2.0 / (length + 1.0)
+    arr = series.to_numpy(dtype=np.float64)
+    (vals,) = _incremental_indicator(
+        cache_key + ("ema", int(length)), series.index, arr, arr, arr,
+        _cold, lambda st, h, l, c: step_ema(st, h, l, c, alpha),
+    )
+    return pd.Series(vals, index=series.index)
 
 def swing_low(series_low: pd.Series, lookback: int = 5) -> float:
     """Returns the most recent swing low over a lookback window."""
@@ -2104,24 +3043,16 @@ def swing_high(series_high: pd.Series, lookback: int = 5) -> float:
     return float(series_high.iloc[-lookback:].max())
 
 def rsi(series: pd.Series, length: int) -> pd.Series:
-    """Calculates the Relative Strength Index (RSI)."""
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=length).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=length).mean()
-    
-    # Avoid division by zero
-    rs = gain / loss
-    rs = rs.replace([np.inf, -np.inf], np.nan).fillna(0)
-    
-    return 100 - (100 / (1 + rs))
+    """
+    Calculates the Relative Strength Index (RSI) from rolling-mean gains/losses.
+    An undefined or infinite RS (warm-up bars, no losses in the window) reads as 0.
+    """
+    return pd.Series(_rsi_sma_nb(series.to_numpy(dtype=np.float64), int(length)), index=series.index)
 
 def bollinger_bands(series: pd.Series, length: int, std: float) -> tuple[pd.Series, pd.Series]:
-    """Calculates Bollinger Bands."""
-    ma = series.rolling(window=length).mean()
-    std_dev = series.rolling(window=length).std()
-    upper_band = ma + (std_dev * std)
-    lower_band = ma - (std_dev * std)
-    return upper_band, lower_band
+    """Calculates Bollinger Bands (rolling mean and sample std in one numba pass)."""
+    ma, std_dev = _rolling_mean_std_nb(series.to_numpy(dtype=np.float64), int(length))
+    return pd.Series(ma + std_dev * std, index=series.index), pd.Series(ma - std_dev * std, index=series.index)
 
 
 def safe_latest_atr_from_df(df: Optional[pd.DataFrame]) -> float:
@@ -2152,35 +3083,15 @@ def adx(df: pd.DataFrame, period: int = 14):
     """
     Calculates ADX, +DI, and -DI and adds them to the DataFrame.
     """
-    high = df['high']
-    low = df['low']
-    close = df['close']
-
-    # Calculate +DM, -DM and TR
-    plus_dm = high.diff()
-    minus_dm = low.diff().mul(-1)
-    
-    plus_dm[plus_dm < 0] = 0
-    plus_dm[plus_dm < minus_dm] = 0
-    
-    minus_dm[minus_dm < 0] = 0
-    minus_dm[minus_dm < plus_dm] = 0
-
-    tr = pd.concat([high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-
-    # Smoothed values using Wilder's smoothing (approximated by EMA with alpha=1/period)
-    alpha = 1 / period
-    atr_smooth = tr.ewm(alpha=alpha, adjust=False).mean()
-    
-    # To avoid division by zero
-    atr_smooth.replace(0, 1e-10, inplace=True)
-
-    df['+DI'] = 100 * (plus_dm.ewm(alpha=alpha, adjust=False).mean() / atr_smooth)
-    df['-DI'] = 100 * (minus_dm.ewm(alpha=alpha, adjust=False).mean() / atr_smooth)
-    
-    dx_denominator = (df['+DI'] + df['-DI']).replace(0, 1e-10)
-    dx = 100 * (abs(df['+DI'] - df['-DI']) / dx_denominator)
-    df['adx'] = dx.ewm(alpha=alpha, adjust=False).mean()
+    plus_di, minus_di, adx_vals = _adx_nb(
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        df['close'].to_numpy(dtype=np.float64),
+        int(period),
+    )
+    df['+DI'] = plus_di
+    df['-DI'] = minus_di
+    df['adx'] = adx_vals
 
 
 # -------------------------
@@ -2277,35 +3188,64 @@ def apply_min_sl_move_filter(current_sl: float, candidate_sl: float, price: floa
         return False
 
 
-def supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0, atr_series: Optional[pd.Series] = None, source: Optional[pd.Series] = None) -> tuple[pd.Series, pd.Series]:
+# Live signals have always run SuperTrend at pandas-ta's default length: the old
+# df.ta.supertrend(period=...) call passed a keyword pandas-ta ignores (it takes length=).
+# Kept as-is so the numba port doesn't move any S2/S4/S5/S10/S12 entries.
+SUPERTREND_LENGTH = 7
+
+def supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0, atr_series: Optional[pd.Series] = None, source: Optional[pd.Series] = None, cache_key: Optional[tuple] = None, tr: Optional[np.ndarray] = None) -> tuple[pd.Series, pd.Series]:
     """
-    Calculates the SuperTrend indicator using the pandas-ta library.
+    Calculates the SuperTrend indicator (pandas-ta math) using the numba kernel.
     Returns two series: supertrend and supertrend_direction.
+    Pass cache_key=(symbol, timeframe) to extend the previous scan's state instead of recomputing.
+    Pass tr (df's true range) when computing several SuperTrends on the same frame.
+    The ATR length is SUPERTREND_LENGTH; period is accepted for the callers' configs only.
     """
-    # Calculate SuperTrend using pandas_ta.
-    # It returns a DataFrame with columns like 'SUPERT_10_3.0', 'SUPERTd_10_3.0', etc.
-    st_df = df.ta.supertrend(period=period, multiplier=multiplier)
-
-    if st_df is None or st_df.empty:
-        log.error(f"Pandas-TA failed to generate SuperTrend for period={period}, mult={multiplier}.")
+    period = SUPERTREND_LENGTH; multiplier = float(multiplier)
+    if df is None or len(df) <= period:
+        log.error(f"Not enough bars to generate SuperTrend for period={period}, mult={multiplier}.")
         return pd.Series(dtype='float64', index=df.index), pd.Series(dtype='float64', index=df.index)
 
-    # --- Robustly find column names to avoid fragility with float formatting ---
-    # The main supertrend line, e.g., 'SUPERT_7_3.0'
-    supertrend_col = next((col for col in st_df.columns if col.startswith('SUPERT_') and 'd' not in col and 'l' not in col and 's' not in col), None)
-    # The direction column, e.g., 'SUPERTd_7_3.0'
-    direction_col = next((col for col in st_df.columns if col.startswith('SUPERTd_')), None)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
 
-    # Check if the expected columns were found
-    if supertrend_col is None or direction_col is None:
-        log.error(f"Pandas-TA did not generate expected SuperTrend columns for period={period}, mult={multiplier}. Got columns: {st_df.columns}")
-        return pd.Series(dtype='float64', index=df.index), pd.Series(dtype='float64', index=df.index)
+    def _cold():
+        if tr is None:
+            st_vals, st_dir, ub, lb, atr_vals = _supertrend_bands_nb(high, low, close, period, multiplier)
+        else:
+            st_vals, st_dir, ub, lb, atr_vals = _supertrend_bands_tr_nb(high, low, close, tr, period, multiplier)
+        carry = (atr_vals[-2], ub[-2], lb[-2], st_dir[-2], close[-2])
+        return (st_vals, st_dir), carry
+
+    key = cache_key + ("supertrend", period, multiplier) if cache_key else None
+    alpha = 1.0 / period
+    st_vals, st_dir = _incremental_indicator(
+        key, df.index, high, low, close,
+        _cold, lambda st, h, l, c: step_supertrend(st, h, l, c, alpha, multiplier),
+    )
+    return pd.Series(st_vals, index=df.index), pd.Series(st_dir, index=df.index)
 
-    # Extract the required series.
-    st_series = st_df[supertrend_col]
-    st_dir_series = st_df[direction_col]
-    
-    return st_series, st_dir_series
+
+def rsi_wilder(series: pd.Series, length: int, cache_key: Optional[tuple] = None) -> pd.Series:
+    """
+    Wilder RSI (pandas-ta math). Unlike rsi() this uses RMA instead of a rolling mean.
+    Pass cache_key=(symbol, timeframe) to extend the previous scan's state instead of recomputing.
+    """
+    close = series.to_numpy(dtype=np.float64)
+
+    def _cold():
+        vals, avg_gain, avg_loss = _rsi_avgs_nb(close, int(length))
+        carry = (avg_gain[-2], avg_loss[-2], close[-2]) if len(vals) >= 2 else None
+        return (vals,), carry
+
+    key = cache_key + ("rsi_wilder", int(length)) if cache_key else None
+    alpha = 1.0 / length
+    (vals,) = _incremental_indicator(
+        key, series.index, close, close, close,
+        _cold, lambda st, h, l, c: step_rsi_wilder(st, h, l, c, alpha),
+    )
+    return pd.Series(vals, index=series.index)
 
 
 def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9):
@@ -2322,9 +3262,10 @@ def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9):
 
 def dema(series: pd.Series, length: int) -> pd.Series:
     """Calculates the Double Exponential Moving Average (DEMA)."""
-    ema1 = series.ewm(span=length, adjust=False).mean()
-    ema2 = ema1.ewm(span=length, adjust=False).mean()
-    return 2 * ema1 - ema2
+    alpha = 2.0 / (length + 1.0)
+    ema1 = _ewm_nb(series.to_numpy(dtype=np.float64), alpha)
+    ema2 = _ewm_nb(ema1, alpha)
+    return pd.Series(2 * ema1 - ema2, index=series.index)
 
 
 def candle_body_crosses_dema(candle: pd.Series, dema_value: float) -> bool:
@@ -2352,7 +3293,8 @@ def init_binance_client_sync():
         return False, "Missing BINANCE_API_KEY or BINANCE_API_SECRET"
 
     try:
-        requests_params = {"timeout": 60}
+        # (connect, read): fail fast on a dead connection, stay patient on a slow response
+        requests_params = {"timeout": (5, 60)}
         client = Client(BINANCE_API_KEY, BINANCE_API_SECRET, requests_params=requests_params)
 
         # --- Configure robust session with retries on the client's existing session ---
@@ -2364,7 +3306,10 @@ def init_binance_client_sync():
             allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "DELETE"],
             raise_on_status=False
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # The default pool keeps 10 sockets per host; concurrent kline fetches plus the monitor
+        # thread overflow that and every discarded socket costs a new TCP+TLS handshake.
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry_strategy)
+        session.headers.update({"Connection": "keep-alive"})
         session.mount("https://", adapter)
         session.mount("http://", adapter)
         log.info("Binance client in MAINNET mode (forced) with retry logic.")
@@ -2420,32 +3365,84 @@ def init_binance_client_sync():
 # -------------------------
 # Exchange info cache helper
 # -------------------------
+def _step_decimals(size: str) -> int:
+    """Number of decimal places in an exchange step/tick string, e.g. '0.00100000' -> 3."""
+    _, _, frac = str(size).partition('.')
+    return len(frac.rstrip('0'))
+
+def _build_step_table(info: Dict[str, Any]) -> Dict[str, tuple]:
+    table = {}
+    for s in info.get('symbols', []):
+        tick = step = price_dec = qty_dec = None
+        for f in s.get('filters', []):
+            ftype = f.get('filterType')
+            if ftype == 'PRICE_FILTER':
+                tick_str = f.get('tickSize', '0.00000001')
+                tick, price_dec = float(tick_str), _step_decimals(tick_str)
+            elif ftype == 'LOT_SIZE':
+                step_str = f.get('stepSize', '1')
+                step, qty_dec = float(step_str), _step_decimals(step_str)
+        table[s.get('symbol')] = (tick, step, price_dec, qty_dec)
+    return table
+
+def _build_min_notional_table(info: Dict[str, Any]) -> Dict[str, float]:
+    table = {}
+    for s in info.get('symbols', []):
+        for f in s.get('filters', []):
+            if f.get('filterType') == 'MIN_NOTIONAL' and f.get('notional'):
+                table[s.get('symbol')] = float(f['notional'])
+                break
+    return table
+
+def get_step_table_entry(symbol: str) -> Optional[tuple]:
+    """(tick_size, step_size, price_decimals, qty_decimals) for symbol, or None if unknown."""
+    if not get_exchange_info_sync():
+        return None
+    return STEP_TABLE.get(symbol)
+
+def _quantize(value: float, size: float, decimals: int, rounding=ROUND_DOWN) -> float:
+    """
+    Snap value to a multiple of size. The epsilon absorbs float division error so an
+    already-aligned value (e.g. 0.3 / 0.1 = 2.9999999999999996) stays put.
+    """
+    n = value / size
+    if rounding == ROUND_CEILING:
+        units = math.ceil(n - 1e-9)
+    else:
+        units = math.floor(n + 1e-9)
+    return round(units * size, decimals)
+
 def get_exchange_info_sync():
-    global EXCHANGE_INFO_CACHE, client
+    global EXCHANGE_INFO_CACHE, STEP_TABLE, SYMBOL_INFO_TABLE, MIN_NOTIONAL_TABLE, client
     now = time.time()
     if EXCHANGE_INFO_CACHE["data"] and (now - EXCHANGE_INFO_CACHE["ts"] < EXCHANGE_INFO_CACHE["ttl"]):
         return EXCHANGE_INFO_CACHE["data"]
     if client is None:
         return None
+    # With a stale copy on hand, don't queue behind a refresh that's already in flight
+    if not exchange_info_refresh_lock.acquire(blocking=EXCHANGE_INFO_CACHE["data"] is None):
+        return EXCHANGE_INFO_CACHE["data"]
     try:
+        if EXCHANGE_INFO_CACHE["data"] and (time.time() - EXCHANGE_INFO_CACHE["ts"] < EXCHANGE_INFO_CACHE["ttl"]):
+            return EXCHANGE_INFO_CACHE["data"]  # refreshed while we waited
         info = client.futures_exchange_info()
+        STEP_TABLE = _build_step_table(info)
+        SYMBOL_INFO_TABLE = {s.get('symbol'): s for s in info.get('symbols', [])}
+        MIN_NOTIONAL_TABLE = _build_min_notional_table(info)
         EXCHANGE_INFO_CACHE["data"] = info
         EXCHANGE_INFO_CACHE["ts"] = now
         return info
     except Exception:
         log.exception("Failed to fetch exchange info for cache")
         return EXCHANGE_INFO_CACHE["data"]
+    finally:
+        exchange_info_refresh_lock.release()
 
 # ... (rest of the functions are unchanged)
 def get_symbol_info(symbol: str) -> Optional[Dict[str, Any]]:
-    info = get_exchange_info_sync()
-    if not info:
-        return None
-    try:
-        symbols = info.get('symbols', [])
-        return next((s for s in symbols if s.get('symbol') == symbol), None)
-    except Exception:
+    if not get_exchange_info_sync():
         return None
+    return SYMBOL_INFO_TABLE.get(symbol)
 
 def get_min_notional_sync(symbol: str) -> float:
     """
@@ -2457,35 +3454,20 @@ def get_min_notional_sync(symbol: str) -> float:
         if not info or not isinstance(info, dict):
             return float(CONFIG.get("MIN_NOTIONAL_USDT", 5.0))
 
-        symbol_info = next((s for s in info.get('symbols', []) if s.get('symbol') == symbol), None)
-        if not symbol_info:
-            return float(CONFIG.get("MIN_NOTIONAL_USDT", 5.0))
+        notional_val = MIN_NOTIONAL_TABLE.get(symbol)
+        if notional_val:
+            # Add a small buffer to avoid floating point issues
+            return notional_val * 1.01
 
-        for f in symbol_info.get('filters', []):
-            if f.get('filterType') == 'MIN_NOTIONAL':
-                notional_val = f.get('notional')
-                if notional_val:
-                    # Add a small buffer to avoid floating point issues
-                    return float(notional_val) * 1.01
-        
         return float(CONFIG.get("MIN_NOTIONAL_USDT", 5.0))
     except Exception as e:
         log.exception(f"Failed to get min notional for {symbol}, using config fallback. Error: {e}")
         return float(CONFIG.get("MIN_NOTIONAL_USDT", 5.0))
 
-def get_step_size(symbol: str) -> Optional[Decimal]:
+def get_step_size(symbol: str) -> Optional[float]:
     """Retrieves the lot step size for a given symbol from exchange info."""
-    try:
-        info = get_exchange_info_sync()
-        if not info or not isinstance(info, dict): return None
-        symbol_info = next((s for s in info.get('symbols', []) if s.get('symbol') == symbol), None)
-        if not symbol_info: return None
-        for f in symbol_info.get('filters', []):
-            if f.get('filterType') == 'LOT_SIZE':
-                return Decimal(str(f.get('stepSize', '1')))
-    except Exception:
-        log.exception("get_step_size failed")
-    return None
+    entry = get_step_table_entry(symbol)
+    return entry[1] if entry else None
 
 def get_max_leverage(symbol: str) -> int:
     try:
@@ -2508,49 +3490,26 @@ def round_qty(symbol: str, qty: float, rounding=ROUND_DOWN) -> float:
     Can use ROUND_CEILING to meet minimum notional value.
     """
     try:
-        info = get_exchange_info_sync()
-        if not info or not isinstance(info, dict):
-            return float(qty)
-        symbol_info = next((s for s in info.get('symbols', []) if s.get('symbol') == symbol), None)
-        if not symbol_info:
-            return float(qty)
-        for f in symbol_info.get('filters', []):
-            if f.get('filterType') == 'LOT_SIZE':
-                step = Decimal(str(f.get('stepSize', '1')))
-                getcontext().prec = 28
-                q = Decimal(str(qty))
-                quantized_q = (q / step).to_integral_value(rounding=rounding) * step
-                if quantized_q <= 0:
-                    return 0.0
-                return float(quantized_q)
+        entry = get_step_table_entry(symbol)
+        if entry and entry[1]:
+            _, step, _, qty_dec = entry
+            quantized_q = _quantize(float(qty), step, qty_dec, rounding)
+            if quantized_q <= 0:
+                return 0.0
+            return quantized_q
     except Exception:
         log.exception("round_qty failed; falling back to float")
     return float(qty)
 
 def round_price(symbol: str, price: float) -> str:
     try:
-        info = get_exchange_info_sync()
-        if not info or not isinstance(info, dict):
-            return f"{price:.8f}"  # Fallback
-        symbol_info = next((s for s in info.get('symbols', []) if s.get('symbol') == symbol), None)
-        if not symbol_info:
-            return f"{price:.8f}"  # Fallback
-        for f in symbol_info.get('filters', []):
-            if f.get('filterType') == 'PRICE_FILTER':
-                tick_size_str = f.get('tickSize', '0.00000001')
-                tick_size = Decimal(tick_size_str)
-                
-                # Determine the number of decimal places from the tick_size for formatting
-                decimal_places = abs(tick_size.as_tuple().exponent)
-
-                getcontext().prec = 28
-                p = Decimal(str(price))
-                
-                # Correctly round down to the nearest multiple of tick_size
-                rounded_price = (p / tick_size).to_integral_value(rounding=ROUND_DOWN) * tick_size
-                
-                # Format with the correct number of decimal places to preserve trailing zeros
-                return f"{rounded_price:.{decimal_places}f}"
+        entry = get_step_table_entry(symbol)
+        if entry and entry[0]:
+            tick_size, _, decimal_places, _ = entry
+            # Round down to the nearest multiple of tick_size
+            rounded_price = _quantize(float(price), tick_size, decimal_places, ROUND_DOWN)
+            # Format with the correct number of decimal places to preserve trailing zeros
+            return f"{rounded_price:.{decimal_places}f}"
     except Exception:
         log.exception("round_price failed; falling back to basic formatting")
     return f"{price:.8f}"
@@ -2561,23 +3520,11 @@ def round_price_to(symbol: str, price: float, rounding=ROUND_DOWN) -> str:
     Round a price to the symbol's tick size using the specified rounding mode.
     """
     try:
-        info = get_exchange_info_sync()
-        if not info or not isinstance(info, dict):
-            # Fallback formatting
-            return f"{price:.8f}"
-        symbol_info = next((s for s in info.get('symbols', []) if s.get('symbol') == symbol), None)
-        if not symbol_info:
-            return f"{price:.8f}"
-        for f in symbol_info.get('filters', []):
-            if f.get('filterType') == 'PRICE_FILTER':
-                tick_size_str = f.get('tickSize', '0.00000001')
-                tick_size = Decimal(tick_size_str)
-                decimal_places = abs(tick_size.as_tuple().exponent)
-
-                getcontext().prec = 28
-                p = Decimal(str(price))
-                rounded_price = (p / tick_size).to_integral_value(rounding=rounding) * tick_size
-                return f"{rounded_price:.{decimal_places}f}"
+        entry = get_step_table_entry(symbol)
+        if entry and entry[0]:
+            tick_size, _, decimal_places, _ = entry
+            rounded_price = _quantize(float(price), tick_size, decimal_places, rounding)
+            return f"{rounded_price:.{decimal_places}f}"
     except Exception:
         log.exception("round_price_to failed; falling back to basic formatting")
     return f"{price:.8f}"
@@ -3462,7 +4409,7 @@ def validate_and_sanity_check_sync(send_report: bool = True) -> Dict[str, Any]:
             # Calculate new indicators for the validation report
             sma_s = sma(raw_df['close'], CONFIG["SMA_LEN"])
             rsi_s = rsi(raw_df['close'], CONFIG["RSI_LEN"])
-            bbu_s, bbl_s = bollinger_bands(raw_df['close'], CONFIG["STRATEGY_1"]["BB_LENGTH"], CONFIG["STRATEGY_1"]["BB_STD"])
+            bbu_s, bbl_s = bollinger_bands(raw_df['close'], CFG.s1.bb_length, CFG.s1.bb_std)
             
             results["checks"].append({"type": "indicators_sample", "ok": True, "detail": {
                 "sma": safe_last(sma_s), "rsi": safe_last(rsi_s),
@@ -3486,19 +4433,209 @@ def candles_since_close(df: pd.DataFrame, close_time: Optional[datetime]) -> int
         close_time = close_time.replace(tzinfo=timezone.utc)
     return int((df.index > close_time).sum())
 
+_KLINE_OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _klines_to_df(raw: list) -> pd.DataFrame:
+    """
+    Raw Binance kline rows -> OHLCV frame indexed by UTC close_time. Only the columns the bot
+    reads are converted: close_time straight from int64 ms, OHLCV parsed once into a float64
+    block (so the numba kernels and BarView read the columns without a conversion copy).
+    """
+    n = len(raw)
+    close_ms = np.fromiter((row[6] for row in raw), dtype=np.int64, count=n)
+    index = pd.DatetimeIndex(pd.to_datetime(close_ms, unit='ms', utc=True), name='close_time')
+    ohlcv = np.array([row[1:6] for row in raw], dtype=np.float64).reshape(n, 5)
+    # Column-major, so each column of the frame's block is a contiguous array
+    return pd.DataFrame(np.asfortranarray(ohlcv), index=index, columns=_KLINE_OHLCV_COLUMNS)
+
+
+class BarView:
+    """
+    Struct-of-arrays view over an OHLCV frame: one contiguous float64 array per field
+    plus close times as int64 ns. Built once per frame; strategy scans index these
+    arrays instead of going through pandas per bar.
+    """
+    __slots__ = ("o", "h", "l", "c", "v", "ts")
+
+    def __init__(self, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray, v: np.ndarray, ts: np.ndarray):
+        self.o, self.h, self.l, self.c, self.v, self.ts = o, h, l, c, v, ts
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "BarView":
+        def col(name):
+            return np.ascontiguousarray(df[name].to_numpy(np.float64))
+        return cls(col('open'), col('high'), col('low'), col('close'), col('volume'),
+                   df.index.as_unit('ns').asi8 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df), dtype=np.int64))
+
+    def __len__(self) -> int:
+        return self.c.shape[0]
+
+
+# Last downloaded klines per (symbol, interval) -> (largest limit requested, frame). Later
+# fetches only download the bars that closed since, plus the still-forming one.
+kline_store: Dict[tuple[str, str], tuple[int, pd.DataFrame]] = {}
+kline_store_lock = threading.Lock()
+
+
+def prune_kline_store(active_symbols) -> None:
+    """Drops stored klines for symbols that are neither scanned nor held in an open trade."""
+    active = set(active_symbols)
+    with kline_store_lock:
+        for key in [k for k in kline_store if k[0] not in active]:
+            del kline_store[key]
+
+
+def _kline_tail_count(df: pd.DataFrame, interval: str) -> Optional[int]:
+    """Bars to re-download so the fetch overlaps the stored forming candle, or None if unknown."""
+    step = timeframe_to_timedelta(interval)
+    if step is None or df.empty:
+        return None
+    elapsed = pd.Timestamp.now(tz='UTC') - df.index[-1]
+    return max(0, int(math.ceil(elapsed / step))) + 2
+
+
+# Binance futures returns at most this many klines per request
+KLINES_MAX_PER_REQUEST = 1500
+
+
+def _fetch_raw_klines(symbol: str, interval: str, limit: int) -> list:
+    """
+    The latest `limit` raw klines. Past the per-request cap, pages backwards with endTime
+    and stitches the pages together, so the frame is still built once.
+    """
+    if limit <= KLINES_MAX_PER_REQUEST:
+        return client.futures_klines(symbol=symbol, interval=interval, limit=limit)
+    pages = []
+    remaining = limit
+    end_time = None
+    while remaining > 0:
+        params = {"symbol": symbol, "interval": interval, "limit": min(remaining, KLINES_MAX_PER_REQUEST)}
+        if end_time is not None:
+            params["endTime"] = end_time
+        page = client.futures_klines(**params)
+        if not page:
+            break  # no older history for this symbol
+        pages.append(page)
+        remaining -= len(page)
+        end_time = int(page[0][0]) - 1  # just before this page's first open_time
+    return [row for page in reversed(pages) for row in page]
+
+
 def fetch_klines_sync(symbol: str, interval: str, limit: int = 200) -> pd.DataFrame:
     global client
     if client is None:
         raise RuntimeError("Binance client not initialized")
-    raw = client.futures_klines(symbol=symbol, interval=interval, limit=limit)
-    cols = ['open_time','open','high','low','close','volume','close_time','qav','num_trades','taker_base','taker_quote','ignore']
-    df = pd.DataFrame(raw, columns=cols)
-    df['open_time'] = pd.to_datetime(df['open_time'], unit='ms', utc=True)
-    df['close_time'] = pd.to_datetime(df['close_time'], unit='ms', utc=True)
-    for c in ['open','high','low','close','volume']:
-        df[c] = df[c].astype('float32')
-    df.set_index('close_time', inplace=True)
-    return df[['open','high','low','close','volume']]
+    key = (symbol, interval)
+    with kline_store_lock:
+        stored = kline_store.get(key)
+
+    if stored is not None and stored[0] >= limit:
+        keep_limit, cached = stored
+        tail_n = _kline_tail_count(cached, interval)
+        if tail_n is not None and tail_n < min(limit, 100):
+            tail = _klines_to_df(client.futures_klines(symbol=symbol, interval=interval, limit=tail_n))
+            # The tail must overlap the stored bars, otherwise there is a gap: fall back to a full fetch
+            if not tail.empty and tail.index[0] <= cached.index[-1]:
+                df = pd.concat([cached[cached.index < tail.index[0]], tail]).iloc[-keep_limit:]
+                with kline_store_lock:
+                    kline_store[key] = (keep_limit, df)
+                return df.iloc[-limit:].copy()
+
+    df = _klines_to_df(_fetch_raw_klines(symbol, interval, limit))
+    with kline_store_lock:
+        prev = kline_store.get(key)
+        if prev is None or prev[0] <= limit:
+            kline_store[key] = (limit, df)
+    return df.copy()
+
+
+class CycleCache:
+    """
+    Klines fetched during one scan cycle, keyed by (symbol, interval). Strategies that
+    need the same higher timeframe for a symbol share a single download instead of
+    each fetching (and then re-running indicators on) their own copy.
+    """
+    def __init__(self):
+        self._frames: Dict[tuple[str, str], tuple[int, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def klines(self, symbol: str, interval: str, limit: int) -> pd.DataFrame:
+        key = (symbol, interval)
+        with self._lock:
+            hit = self._frames.get(key)
+        if hit is None or hit[0] < limit:
+            df = fetch_klines_sync(symbol, interval, limit)
+            with self._lock:
+                self._frames[key] = (limit, df)
+        else:
+            df = hit[1].iloc[-limit:]
+        # Shallow copy: callers add indicator columns without touching the shared frame
+        return df.copy(deep=False)
+
+
+# Replaced at the start of every run_scan_cycle(); None outside a scan.
+cycle_cache: Optional[CycleCache] = None
+
+
+def fetch_htf_klines_sync(symbol: str, interval: str, limit: int = 200) -> pd.DataFrame:
+    """fetch_klines_sync() through the current scan cycle's cache, when there is one."""
+    cache = cycle_cache
+    if cache is None:
+        return fetch_klines_sync(symbol, interval, limit)
+    return cache.klines(symbol, interval, limit)
+
+
+# Higher-timeframe klines each strategy reads through fetch_htf_klines_sync(): {strategy_id: ((interval, limit), ...)}
+STRATEGY_HTF_KLINES: Dict[int, tuple[tuple[str, int], ...]] = {
+    5: (('1h', 300),),
+    6: (('4h', 400), ('1d', 400)),
+    7: (('1h', 300),),
+    8: (('4h', 400), ('1d', 400), ('1h', 300)),
+    9: (('1h', 300), ('4h', 400), ('1d', 400), ('5m', 300), ('1m', 600)),
+    10: (('1h', 300), ('5m', 300)),
+    11: (('1h', 300), ('4h', 300)),
+}
+
+# S5's M15 ATR% band rejects most symbols before its 1h is read, so S5 keeps fetching that lazily
+_HTF_PREFETCH_SKIP = frozenset({5})
+
+
+def htf_prefetch_strategy_ids(symbol: str, modes) -> list[int]:
+    """Enabled strategies whose higher timeframes are worth prefetching: the symbol passes their allowlist."""
+    ids = []
+    for sid in STRATEGY_HTF_KLINES:
+        if sid in _HTF_PREFETCH_SKIP or not (sid in modes or 0 in modes):
+            continue
+        allowed = {s.strip().upper() for s in getattr(getattr(CFG, f"s{sid}"), "symbols", ()) if s.strip()}
+        if allowed and symbol not in allowed:
+            continue
+        ids.append(sid)
+    return ids
+
+
+# Caps concurrent klines requests across all symbols to stay well inside Binance weight limits
+klines_fetch_sem = asyncio.Semaphore(8)
+
+
+async def prefetch_htf_klines(symbol: str, strategy_ids) -> None:
+    """Loads every higher timeframe the given strategies need into the cycle cache, concurrently."""
+    cache = cycle_cache
+    if cache is None:
+        return
+    needed: Dict[str, int] = {}
+    for sid in strategy_ids:
+        for interval, limit in STRATEGY_HTF_KLINES.get(sid, ()):
+            needed[interval] = max(needed.get(interval, 0), limit)
+
+    async def _fetch(interval: str, limit: int):
+        async with klines_fetch_sem:
+            return await asyncio.to_thread(cache.klines, symbol, interval, limit)
+
+    results = await asyncio.gather(*(_fetch(tf, lim) for tf, lim in needed.items()), return_exceptions=True)
+    for interval, res in zip(needed, results):
+        if isinstance(res, Exception):
+            # Not fatal: the strategy fetches again itself and reports the error in context
+            log.warning(f"Prefetch of {interval} klines for {symbol} failed: {res}")
 
 
 def get_renko_data(df_raw: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
@@ -3525,7 +4662,8 @@ def get_renko_data(df_raw: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
         df_for_renko = df_raw.copy()
         df_for_renko.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}, inplace=True)
         
-        # 3. Initialize Renko object and build bricks
+        # 3. Initialize Renko object and build bricks (imported here: only Renko callers need it)
+        from stocktrends import Renko
         renko_processor = Renko(df_for_renko)
         renko_processor.set_brick_size(box_size=brick_size, auto=False)
         renko_df = renko_processor.get_bricks()
@@ -3552,7 +4690,7 @@ def get_renko_data(df_raw: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
 
 def calculate_signal_confidence(signal_candle, side: str) -> tuple[float, dict]:
     """Calculate dynamic confidence score for potential signals."""
-    st_settings = CONFIG['STRATEGY_2']
+    st_settings = CFG.s2
     scores = {
         'primary': 0.0,
         'adx': 0.0,
@@ -3566,10 +4704,10 @@ def calculate_signal_confidence(signal_candle, side: str) -> tuple[float, dict]:
         scores['primary'] = min(40.0, trend_strength * 10)
     
     # ADX confirmation (Trend Strength) - 25%
-    if 'adx' in signal_candle and signal_candle['adx'] > st_settings['ADX_THRESHOLD']:
+    if 'adx' in signal_candle and signal_candle['adx'] > st_settings.adx_threshold:
         adx_val = signal_candle['adx']
         # Scale score from 0-25 based on ADX value between threshold and 60
-        adx_score = ((adx_val - st_settings['ADX_THRESHOLD']) / (60 - st_settings['ADX_THRESHOLD'])) * 25
+        adx_score = ((adx_val - st_settings.adx_threshold) / (60 - st_settings.adx_threshold)) * 25
         adx_score = max(0.0, min(25.0, adx_score))
         if (side == 'BUY' and signal_candle['+DI'] > signal_candle['-DI']) or \
            (side == 'SELL' and signal_candle['-DI'] > signal_candle['+DI']):
@@ -3578,11 +4716,11 @@ def calculate_signal_confidence(signal_candle, side: str) -> tuple[float, dict]:
     # RSI confirmation (Momentum) - 20%
     if 'RSI' in signal_candle:
         rsi_val = signal_candle['RSI']
-        if side == 'BUY' and st_settings['MIN_RSI_BUY'] < rsi_val < st_settings['MAX_RSI_BUY']:
+        if side == 'BUY' and st_settings.min_rsi_buy < rsi_val < st_settings.max_rsi_buy:
             # Peak at 45, score decreases as it moves away
             rsi_score = 20.0 - abs(45 - rsi_val)
             scores['rsi'] = max(0.0, min(20.0, rsi_score))
-        elif side == 'SELL' and st_settings['MIN_RSI_SELL'] < rsi_val < st_settings['MAX_RSI_SELL']:
+        elif side == 'SELL' and st_settings.min_rsi_sell < rsi_val < st_settings.max_rsi_sell:
             # Peak at 55, score decreases as it moves away
             rsi_score = 20.0 - abs(55 - rsi_val)
             scores['rsi'] = max(0.0, min(20.0, rsi_score))
@@ -3599,6 +4737,10 @@ def calculate_signal_confidence(signal_candle, side: str) -> tuple[float, dict]:
     return min(100.0, max(0.0, total_score)), scores
 
 
+# S3 is only selected while ATR(20) is at most this percent of price
+S3_VOLATILITY_MAX_ATR20_PCT = 3.0
+
+
 def select_strategy(df: pd.DataFrame, symbol: str) -> Optional[int]:
     """
     Determines which strategy to use for a symbol based on market conditions and configuration.
@@ -3616,26 +4758,26 @@ def select_strategy(df: pd.DataFrame, symbol: str) -> Optional[int]:
         return None
 
     # --- Pre-condition Filters for each strategy ---
-    s1_params = CONFIG['STRATEGY_1']
-    s2_params = CONFIG['STRATEGY_2']
-    s3_params = CONFIG['STRATEGY_3']
-    s5_params = CONFIG.get('STRATEGY_5', {})
+    s1_params = CFG.s1
+    s2_params = CFG.s2
+    s3_params = CFG.s3
+    s5_params = CFG.s5
     
     volatility_ratio_s1 = last['atr'] / last['close'] if last['close'] > 0 else 0
-    s1_allowed = volatility_ratio_s1 <= s1_params.get('MAX_VOLATILITY_FOR_ENTRY', 0.03)
+    s1_allowed = volatility_ratio_s1 <= s1_params.max_volatility_for_entry
     
     adx_value = last['adx']
-    s2_allowed = adx_value >= s2_params.get('MIN_ADX_FOR_ENTRY', 15)
+    s2_allowed = adx_value >= s2_params.min_adx_for_entry
 
     atr20_pct = (last['atr20'] / last['close']) * 100 if last['close'] > 0 else 0
-    s3_allowed = atr20_pct <= s3_params.get('VOLATILITY_MAX_ATR20_PCT', 3.0)
+    s3_allowed = atr20_pct <= S3_VOLATILITY_MAX_ATR20_PCT
     
     # S4 is an evolution of S3, assume it runs under similar volatility conditions.
     s4_allowed = s3_allowed
 
     # S5 volatility band filter on M15
     atr_pct = (last['atr'] / last['close']) if last['close'] > 0 else 0
-    s5_allowed = (s5_params and (s5_params.get('VOL_MIN_PCT', 0.003) <= atr_pct <= s5_params.get('VOL_MAX_PCT', 0.035)))
+    s5_allowed = (s5_params and (s5_params.vol_min_pct <= atr_pct <= s5_params.vol_max_pct))
 
     log.info(f"Strategy selection checks for {symbol}: S1_allowed={s1_allowed}, S2_allowed={s2_allowed}, S3_allowed={s3_allowed}, S4_allowed={s4_allowed}, S5_allowed={s5_allowed}")
 
@@ -3753,8 +4895,6 @@ def check_for_liquidity_grab(df: pd.DataFrame, symbol: str) -> bool:
     return False # No liquidity grab detected
 
 
-indicator_cache = {}
-
 def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Pure-like function: accepts df (OHLCV), returns df with added indicator columns.
@@ -3788,36 +4928,40 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
 
     if 0 in modes or 1 in modes:
         # ---- Strategy 1 (BB) ----
-        s1_params = CONFIG['STRATEGY_1']
-        out['s1_bbu'], out['s1_bbl'] = bollinger_bands(out['close'], s1_params['BB_LENGTH'], s1_params['BB_STD'])
+        s1_params = CFG.s1
+        out['s1_bbu'], out['s1_bbl'] = bollinger_bands(out['close'], s1_params.bb_length, s1_params.bb_std)
     
     if 0 in modes or 2 in modes:
         # ---- Strategy 2 (SuperTrend) ----
-        s2_params = CONFIG['STRATEGY_2']
-        out['s2_st'], out['s2_st_dir'] = supertrend(out, period=s2_params['SUPERTREND_PERIOD'], multiplier=s2_params['SUPERTREND_MULTIPLIER'])
+        s2_params = CFG.s2
+        out['s2_st'], out['s2_st_dir'] = supertrend(out, period=s2_params.supertrend_period, multiplier=s2_params.supertrend_multiplier)
     
     if 0 in modes or 3 in modes:
         # ---- Strategy 3 (MA Cross) ----
-        s3_params = CONFIG['STRATEGY_3']
-        out['s3_ma_fast'] = sma(out['close'], s3_params['FAST_MA'])
-        out['s3_ma_slow'] = sma(out['close'], s3_params['SLOW_MA'])
+        s3_params = CFG.s3
+        out['s3_ma_fast'] = sma(out['close'], s3_params.fast_ma)
+        out['s3_ma_slow'] = sma(out['close'], s3_params.slow_ma)
 
     if 0 in modes or 4 in modes:
         # ---- Strategy 4 (3x SuperTrend) ----
-        s4_params = CONFIG['STRATEGY_4']
-        out['s4_st1'], out['s4_st1_dir'] = supertrend(out, period=s4_params['ST1_PERIOD'], multiplier=s4_params['ST1_MULT'])
-        out['s4_st2'], out['s4_st2_dir'] = supertrend(out, period=s4_params['ST2_PERIOD'], multiplier=s4_params['ST2_MULT'])
-        out['s4_st3'], out['s4_st3_dir'] = supertrend(out, period=s4_params['ST3_PERIOD'], multiplier=s4_params['ST3_MULT'])
+        s4_params = CFG.s4
+        # The three SuperTrends differ only in period/multiplier, so they share one true-range pass
+        s4_tr = _true_range_nb(
+            out['high'].to_numpy(dtype=np.float64), out['low'].to_numpy(dtype=np.float64), out['close'].to_numpy(dtype=np.float64)
+        )
+        out['s4_st1'], out['s4_st1_dir'] = supertrend(out, period=s4_params.st1_period, multiplier=s4_params.st1_mult, tr=s4_tr)
+        out['s4_st2'], out['s4_st2_dir'] = supertrend(out, period=s4_params.st2_period, multiplier=s4_params.st2_mult, tr=s4_tr)
+        out['s4_st3'], out['s4_st3_dir'] = supertrend(out, period=s4_params.st3_period, multiplier=s4_params.st3_mult, tr=s4_tr)
         # Conditionally calculate the EMA filter only if it's enabled in the config
-        if s4_params.get('EMA_FILTER_ENABLED', False):
-            if s4_params.get('EMA_FILTER_PERIOD', 0) > 0:
-                out['s4_ema_filter'] = ema(out['close'], length=s4_params['EMA_FILTER_PERIOD'])
+        if s4_params.ema_filter_enabled:
+            if s4_params.ema_filter_period > 0:
+                out['s4_ema_filter'] = ema(out['close'], length=s4_params.ema_filter_period)
 
     if 0 in modes or 5 in modes:
         # ---- Strategy 5 (M15 execution EMAs) ----
-        s5 = CONFIG['STRATEGY_5']
-        out['s5_m15_ema_fast'] = ema(out['close'], s5['EMA_FAST'])
-        out['s5_m15_ema_slow'] = ema(out['close'], s5['EMA_SLOW'])
+        s5 = CFG.s5
+        out['s5_m15_ema_fast'] = ema(out['close'], s5.ema_fast)
+        out['s5_m15_ema_slow'] = ema(out['close'], s5.ema_slow)
 
     return out
 
@@ -3858,11 +5002,14 @@ async def evaluate_and_enter(symbol: str):
         if frozen or not running:
             _log_env_rejection(symbol, "Bot Paused", {"running": running, "frozen": frozen})
             return
-        if symbol in symbol_trade_cooldown and datetime.now(timezone.utc) < symbol_trade_cooldown[symbol]:
-            _log_env_rejection(symbol, "Post-Trade Cooldown", {"ends_at": symbol_trade_cooldown[symbol].strftime('%H:%M:%S')})
+        now_ts = time.time()
+        if symbol_trade_cooldown.get(symbol, 0.0) > now_ts:
+            ends_at = datetime.fromtimestamp(symbol_trade_cooldown[symbol], timezone.utc)
+            _log_env_rejection(symbol, "Post-Trade Cooldown", {"ends_at": ends_at.strftime('%H:%M:%S')})
             return
-        if symbol in symbol_loss_cooldown and datetime.now(timezone.utc) < symbol_loss_cooldown[symbol]:
-            _log_env_rejection(symbol, "Loss Cooldown", {"ends_at": symbol_loss_cooldown[symbol].strftime('%H:%M:%S')})
+        if symbol_loss_cooldown.get(symbol, 0.0) > now_ts:
+            ends_at = datetime.fromtimestamp(symbol_loss_cooldown[symbol], timezone.utc)
+            _log_env_rejection(symbol, "Loss Cooldown", {"ends_at": ends_at.strftime('%H:%M:%S')})
             return
         async with managed_trades_lock, pending_limit_orders_lock:
             if not CONFIG["HEDGING_ENABLED"] and any(t['symbol'] == symbol for t in managed_trades.values()):
@@ -3890,8 +5037,13 @@ async def evaluate_and_enter(symbol: str):
 
 
             # Fetch a larger dataset if S4/Renko is active, otherwise default.
+            # Higher timeframes for the strategies that will look at this symbol are fetched alongside it.
             limit = 1000 if run_s4 else 250
-            df_raw = await asyncio.to_thread(fetch_klines_sync, symbol, CONFIG["TIMEFRAME"], limit)
+            htf_ids = htf_prefetch_strategy_ids(symbol, modes) if run_others else []
+            df_raw, _ = await asyncio.gather(
+                asyncio.to_thread(fetch_klines_sync, symbol, CONFIG["TIMEFRAME"], limit),
+                prefetch_htf_klines(symbol, htf_ids),
+            )
 
             if df_raw is None or df_raw.empty:
                 log.warning(f"fetch_klines_sync returned empty for {symbol}. Skipping all evaluations.")
@@ -4103,7 +5255,7 @@ async def evaluate_strategy_bb(symbol: str, df: pd.DataFrame):
         f"**Risk:** `{risk_usdt:.2f} USDT`\n"
         f"**Leverage:** `{leverage}x`"
     )
-    await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+    enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
 def simulate_strategy_supertrend(symbol: str, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     if df is None or len(df) < 30: return None
@@ -4128,7 +5280,7 @@ def simulate_strategy_supertrend(symbol: str, df: pd.DataFrame) -> Optional[Dict
     entry_price = float(signal_candle['close'])
     distance = abs(entry_price - sl_price)
     if distance <= 0: return None
-    tp_distance = atr_val * CONFIG["STRATEGY_EXIT_PARAMS"]['2']["ATR_MULTIPLIER"] * 1.5
+    tp_distance = atr_val * EXIT_ATR_MULT[2] * 1.5
     take_price = entry_price + tp_distance if side == 'BUY' else entry_price - tp_distance
     return {"strategy": "S2-ST", "side": side, "entry_price": entry_price, "sl_price": sl_price, "tp_price": take_price, "timestamp": signal_candle.name.isoformat()}
 
@@ -4200,7 +5352,7 @@ async def evaluate_strategy_supertrend(symbol: str, df: pd.DataFrame):
     leverage = int(math.floor(notional / max(margin_to_use, 1e-9)))
     max_leverage = min(CONFIG.get("MAX_BOT_LEVERAGE", 30), get_max_leverage(symbol))
     leverage = max(1, min(leverage, max_leverage))
-    tp_distance = atr_val * CONFIG["STRATEGY_EXIT_PARAMS"]['2']["ATR_MULTIPLIER"] * 1.5
+    tp_distance = atr_val * EXIT_ATR_MULT[2] * 1.5
     take_price = entry_price + tp_distance if side == 'BUY' else entry_price - tp_distance
 
     limit_order_resp = await asyncio.to_thread(place_limit_order_sync, symbol, side, final_qty, entry_price)
@@ -4238,7 +5390,7 @@ async def evaluate_strategy_supertrend(symbol: str, df: pd.DataFrame):
         f"**Risk:** `{risk_usdt:.2f} USDT`\n"
         f"**Leverage:** `{leverage}x`"
     )
-    await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+    enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
 def simulate_strategy_3(symbol: str, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     if df is None or len(df) < 50: return None
@@ -4369,14 +5521,14 @@ async def evaluate_strategy_3(symbol: str, df: pd.DataFrame):
         f"**Risk:** `{risk_usdt:.2f} USDT`\n"
         f"**Leverage:** `{leverage}x`"
     )
-    await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+    enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
 def simulate_strategy_4(symbol: str, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     """
     Simulation version of the 3x SuperTrend strategy (S4).
     Returns signal details if a signal is found, otherwise None.
     """
-    s4_params = CONFIG['STRATEGY_4']
+    s4_params = CFG.s4
     
     # --- Indicator & Data Check ---
     required_cols = ['s4_st1_dir', 's4_st2_dir', 's4_st3_dir', 's4_st2', 'open', 'close']
@@ -4384,31 +5536,25 @@ def simulate_strategy_4(symbol: str, df: pd.DataFrame) -> Optional[Dict[str, Any
         return None
 
     # --- Define Candles ---
-    signal_candle = df.iloc[-2]
-    prev_candle = df.iloc[-3]
-    current_candle = df.iloc[-1]
-    entry_price = current_candle['open']
+    # Plain array reads: /simulate calls this once per bar, and iloc[-k] builds a row Series each time
+    st1_dir = df['s4_st1_dir'].to_numpy()
+    st2_dir = df['s4_st2_dir'].to_numpy()
+    st3_dir = df['s4_st3_dir'].to_numpy()
+    sig, prev = -2, -3
+    entry_price = df['open'].to_numpy()[-1]
 
     # --- Signal Detection ---
     side = None
     # BUY Signal: All three STs are bullish now, and at least one was bearish before.
-    all_buy_now = (signal_candle['s4_st1_dir'] == 1 and 
-                   signal_candle['s4_st2_dir'] == 1 and 
-                   signal_candle['s4_st3_dir'] == 1)
-    any_sell_before = (prev_candle['s4_st1_dir'] == -1 or 
-                       prev_candle['s4_st2_dir'] == -1 or 
-                       prev_candle['s4_st3_dir'] == -1)
+    all_buy_now = st1_dir[sig] == 1 and st2_dir[sig] == 1 and st3_dir[sig] == 1
+    any_sell_before = st1_dir[prev] == -1 or st2_dir[prev] == -1 or st3_dir[prev] == -1
 
     if all_buy_now and any_sell_before:
         side = 'BUY'
     
     # SELL Signal: All three STs are bearish now, and at least one was bullish before.
-    all_sell_now = (signal_candle['s4_st1_dir'] == -1 and 
-                    signal_candle['s4_st2_dir'] == -1 and 
-                    signal_candle['s4_st3_dir'] == -1)
-    any_buy_before = (prev_candle['s4_st1_dir'] == 1 or 
-                      prev_candle['s4_st2_dir'] == 1 or 
-                      prev_candle['s4_st3_dir'] == 1)
+    all_sell_now = st1_dir[sig] == -1 and st2_dir[sig] == -1 and st3_dir[sig] == -1
+    any_buy_before = st1_dir[prev] == 1 or st2_dir[prev] == 1 or st3_dir[prev] == 1
     
     if all_sell_now and any_buy_before:
         side = 'SELL'
@@ -4417,7 +5563,7 @@ def simulate_strategy_4(symbol: str, df: pd.DataFrame) -> Optional[Dict[str, Any
         return None
         
     # --- Passed all filters, return signal ---
-    sl_price = signal_candle['s4_st2']
+    sl_price = df['s4_st2'].to_numpy()[sig]
     
     # S4 has no predefined TP, so set it to 0
     tp_price = 0 
@@ -4428,7 +5574,7 @@ def simulate_strategy_4(symbol: str, df: pd.DataFrame) -> Optional[Dict[str, Any
         "entry_price": entry_price,
         "sl_price": sl_price,
         "tp_price": tp_price,
-        "timestamp": signal_candle.name.isoformat()
+        "timestamp": df.index[sig].isoformat()
     }
 
 async def evaluate_strategy_4(symbol: str, df: pd.DataFrame, test_signal: Optional[str] = None, full_test: bool = False):
@@ -4444,7 +5590,7 @@ async def evaluate_strategy_4(symbol: str, df: pd.DataFrame, test_signal: Option
         return
 
     # --- Pre-Trade Checks ---
-    s4_params = CONFIG['STRATEGY_4']
+    s4_params = CFG.s4
     async with managed_trades_lock, pending_limit_orders_lock:
         if not CONFIG["HEDGING_ENABLED"] and any(t['symbol'] == symbol for t in managed_trades.values()):
             return
@@ -4462,8 +5608,8 @@ async def evaluate_strategy_4(symbol: str, df: pd.DataFrame, test_signal: Option
 
     # --- Primary EMA Trend Filter ---
     allowed_side = 'BOTH' # Default to allowing both sides
-    if s4_params.get('EMA_FILTER_ENABLED', False):
-        ema_period = s4_params.get('EMA_FILTER_PERIOD', 0)
+    if s4_params.ema_filter_enabled:
+        ema_period = s4_params.ema_filter_period
         if ema_period > 0 and 's4_ema_filter' in df.columns:
             # This is intentional: we check the CURRENT open price against the EMA
             # of the CLOSED signal candle to ensure the trend is still valid for entry.
@@ -4546,7 +5692,7 @@ async def evaluate_strategy_4(symbol: str, df: pd.DataFrame, test_signal: Option
     current_candle = df.iloc[-1] 
     entry_price = current_candle['open']
     stop_loss_price = signal_candle['s4_st2']
-    risk_usd = s4_params['RISK_USD']
+    risk_usd = s4_params.risk_usd
     
     price_distance = abs(entry_price - stop_loss_price)
     if price_distance <= 0:
@@ -4594,7 +5740,7 @@ async def evaluate_strategy_4(symbol: str, df: pd.DataFrame, test_signal: Option
         log.info(f"S4: Placing MARKET {side} order for {final_qty} {symbol} at ~{entry_price}")
 
         # --- Set post-trade cooldown immediately to prevent duplicates ---
-        symbol_trade_cooldown[symbol] = datetime.now(timezone.utc) + timedelta(minutes=16)
+        symbol_trade_cooldown[symbol] = time.time() + 16 * 60
         log.info(f"S4: Set 16-minute post-trade cooldown for {symbol} to prevent duplicates before placing order.")
 
         await asyncio.to_thread(open_market_position_sync, symbol, side, final_qty, leverage)
@@ -4639,7 +5785,7 @@ async def evaluate_strategy_4(symbol: str, df: pd.DataFrame, test_signal: Option
             f"**Risk:** `{actual_risk_usdt:.2f} USDT`\n"
             f"**Leverage:** `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_trade_msg, parse_mode='Markdown')
+        enqueue_telegram(new_trade_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"Failed to execute S4 trade for {symbol}", e)
@@ -4650,14 +5796,14 @@ async def evaluate_strategy_5(symbol: str, df_m15: pd.DataFrame):
     - H1 trend via EMA(21/55) and SuperTrend(10,3) filter
     - M15 execution with EMA pullback + momentum/volume filter
     - Initial stop: structure/ATR hybrid
-    - Risk: fixed USDT like S4 (CONFIG['STRATEGY_5']['RISK_USD'])
+    - Risk: fixed USDT like S4 (CFG.s5.risk_usd)
     - Management: handled in monitor thread (BE at +0.5R, 30% at 1R, ATR/swing trailing)
     """
     try:
-        s5 = CONFIG['STRATEGY_5']
+        s5 = CFG.s5
 
         # Restrict to selected majors only (configurable)
-        s5_allowed = s5.get("SYMBOLS")
+        s5_allowed = s5.symbols
         if isinstance(s5_allowed, str):
             s5_allowed = [x.strip().upper() for x in s5_allowed.split(",") if x.strip()]
         if not s5_allowed or not isinstance(s5_allowed, (list, tuple)):
@@ -4678,8 +5824,8 @@ async def evaluate_strategy_5(symbol: str, df_m15: pd.DataFrame):
         # Compute additional M15 indicators
         df_m15 = df_m15.copy()
         # Use Wilder ATR for stop sizing consistency
-        df_m15['s5_atr'] = atr_wilder(df_m15, int(s5.get('ATR_PERIOD', 14)))
-        df_m15['s5_rsi'] = rsi(df_m15['close'], int(s5.get('RSI_PERIOD', 14)))
+        df_m15['s5_atr'] = atr_wilder(df_m15, int(s5.atr_period), cache_key=(symbol, CONFIG['TIMEFRAME']))
+        df_m15['s5_rsi'] = rsi(df_m15['close'], int(s5.rsi_period))
         df_m15['s5_vol_ma10'] = df_m15['volume'].rolling(10).mean()
 
         sig = df_m15.iloc[-2]
@@ -4687,20 +5833,21 @@ async def evaluate_strategy_5(symbol: str, df_m15: pd.DataFrame):
 
         # Volatility band filter (M15 ATR%)
         atr_pct = (sig['s5_atr'] / sig['close']) if sig['close'] > 0 else 0
-        if not (s5['VOL_MIN_PCT'] <= atr_pct <= s5['VOL_MAX_PCT']):
+        if not (s5.vol_min_pct <= atr_pct <= s5.vol_max_pct):
             _record_rejection(symbol, "S5-ATR pct out of band", {"atr_pct": atr_pct})
             return
 
         # Fetch H1 data for trend filter
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
+        df_h1 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300)
         if df_h1 is None or len(df_h1) < 80:
             _record_rejection(symbol, "S5-Not enough H1 data", {"len": len(df_h1) if df_h1 is not None else 0})
             return
 
         df_h1 = df_h1.copy()
-        df_h1['ema_fast'] = ema(df_h1['close'], s5['EMA_FAST'])
-        df_h1['ema_slow'] = ema(df_h1['close'], s5['EMA_SLOW'])
-        df_h1['st_h1'], df_h1['st_h1_dir'] = supertrend(df_h1, period=s5['H1_ST_PERIOD'], multiplier=s5['H1_ST_MULT'])
+        h1_key = (symbol, '1h')
+        df_h1['ema_fast'] = ema(df_h1['close'], s5.ema_fast, cache_key=h1_key)
+        df_h1['ema_slow'] = ema(df_h1['close'], s5.ema_slow, cache_key=h1_key)
+        df_h1['st_h1'], df_h1['st_h1_dir'] = supertrend(df_h1, period=s5.h1_st_period, multiplier=s5.h1_st_mult, cache_key=h1_key)
         h1_last = df_h1.iloc[-2]  # last closed H1
 
         # H1 trend direction
@@ -4746,7 +5893,7 @@ async def evaluate_strategy_5(symbol: str, df_m15: pd.DataFrame):
             return
 
         # Risk model: same as S4 (fixed USDT risk)
-        risk_usd = float(s5['RISK_USD'])
+        risk_usd = float(s5.risk_usd)
         ideal_qty = risk_usd / distance
         ideal_qty = await asyncio.to_thread(round_qty, symbol, ideal_qty, rounding=ROUND_DOWN)
 
@@ -4828,7 +5975,7 @@ async def evaluate_strategy_5(symbol: str, df_m15: pd.DataFrame):
             f"**Risk:** `{actual_risk_usdt:.2f} USDT`\n"
             f"**Leverage:** `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S5 evaluation error for {symbol}", e)
@@ -4851,26 +5998,26 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
       - Place LIMIT at H1 close with both SL and TP persisted in pending order meta
     """
     try:
-        s11 = CONFIG.get('STRATEGY_11', {})
-        bb_len = int(s11.get('BB_LENGTH', 20))
-        bb_std = float(s11.get('BB_STD', 2.0))
-        rsi_p4h = int(s11.get('RSI_PERIOD_4H', 14))
-        rsi_long_min = float(s11.get('RSI_LONG_MIN', 55))
-        rsi_short_max = float(s11.get('RSI_SHORT_MAX', 45))
-        adx_h1_period = int(s11.get('ADX_PERIOD_H1', 14))
-        adx_4h_period = int(s11.get('ADX_PERIOD_4H', 14))
-        adx_min_h1 = float(s11.get('ADX_MIN_H1', 20))
-        adx_min_4h = float(s11.get('ADX_MIN_4H', 25))
-        atr_p_h1 = int(s11.get('ATR_PERIOD_H1', 14))
-        risk_usd = float(s11.get('RISK_USD', 0.50))
-        expiry_hours = int(s11.get('ORDER_EXPIRY_HOURS', 2))
+        s11 = CFG.s11
+        bb_len = int(s11.bb_length)
+        bb_std = float(s11.bb_std)
+        rsi_p4h = int(s11.rsi_period_4h)
+        rsi_long_min = float(s11.rsi_long_min)
+        rsi_short_max = float(s11.rsi_short_max)
+        adx_h1_period = int(s11.adx_period_h1)
+        adx_4h_period = int(s11.adx_period_4h)
+        adx_min_h1 = float(s11.adx_min_h1)
+        adx_min_4h = float(s11.adx_min_4h)
+        atr_p_h1 = int(s11.atr_period_h1)
+        risk_usd = float(s11.risk_usd)
+        expiry_hours = int(s11.order_expiry_hours)
 
         # Fetch H1 and H4 datasets
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
+        df_h1 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300)
         if df_h1 is None or len(df_h1) < max(bb_len + 5, 50):
             _record_rejection(symbol, "S11-Not enough H1 data", {"len": len(df_h1) if df_h1 is not None else 0})
             return
-        df_4h = await asyncio.to_thread(fetch_klines_sync, symbol, '4h', 200)
+        df_4h = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '4h', 200)
         if df_4h is None or len(df_4h) < max(rsi_p4h + 5, 50):
             _record_rejection(symbol, "S11-Not enough H4 data", {"len": len(df_4h) if df_4h is not None else 0})
             return
@@ -4882,7 +6029,7 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
         df_h1['s11_bbu'] = up_h1
         df_h1['s11_bbl'] = lo_h1
         df_h1['s11_basis'] = basis_h1
-        df_h1['s11_atr'] = atr_wilder(df_h1, atr_p_h1)
+        df_h1['s11_atr'] = atr_wilder(df_h1, atr_p_h1, cache_key=(symbol, '1h'))
         adx(df_h1, period=adx_h1_period)
 
         df_4h = df_4h.copy()
@@ -4993,7 +6140,7 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
             f"**Leverage:** `{leverage}x`\n"
             f"**TP (H1 basis):** `{round_price(symbol, take_price)}`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S11 evaluation error for {symbol}", e)
@@ -5003,7 +6150,7 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
 
 async def evaluate_strategy_12(symbol: str, df_current: pd.DataFrame):
     """
-    Strategy 12: Small-account system — SuperTrend + MACD + RSI (pandas-ta)
+    Strategy 12: Small-account system — SuperTrend + MACD + RSI
     Entry (on next candle open):
       - Long: close > SuperTrend, RSI > 50, MACD > Signal
       - Short: close < SuperTrend, RSI < 50, MACD < Signal
@@ -5012,17 +6159,17 @@ async def evaluate_strategy_12(symbol: str, df_current: pd.DataFrame):
     Sizing: same fixed-USDT risk model as S4.
     """
     try:
-        params = CONFIG.get('STRATEGY_12', {})
-        st_period = int(params.get('ST_PERIOD', 10))
-        st_mult = float(params.get('ST_MULT', 3.0))
-        rsi_len = int(params.get('RSI_LEN', 14))
-        macd_fast = int(params.get('MACD_FAST', 12))
-        macd_slow = int(params.get('MACD_SLOW', 26))
-        macd_signal = int(params.get('MACD_SIGNAL', 9))
-        swing_lookback = int(params.get('SWING_LOOKBACK', 5))
-        rr = float(params.get('RR', 1.5))
-        risk_usd = float(params.get('RISK_USD', CONFIG.get('STRATEGY_4', {}).get('RISK_USD', 0.50)))
-        expiry_candles = int(params.get('ORDER_EXPIRY_CANDLES', CONFIG.get('ORDER_EXPIRY_CANDLES', 2)))
+        params = CFG.s12
+        st_period = int(params.st_period)
+        st_mult = float(params.st_mult)
+        rsi_len = int(params.rsi_len)
+        macd_fast = int(params.macd_fast)
+        macd_slow = int(params.macd_slow)
+        macd_signal = int(params.macd_signal)
+        swing_lookback = int(params.swing_lookback)
+        rr = float(params.rr)
+        risk_usd = float(params.risk_usd)
+        expiry_candles = int(params.order_expiry_candles)
 
         # Need enough bars for indicators and swing calc
         if df_current is None or len(df_current) < max(30, st_period + 5, macd_slow + macd_signal + 5, rsi_len + 5, swing_lookback + 5):
@@ -5031,30 +6178,23 @@ async def evaluate_strategy_12(symbol: str, df_current: pd.DataFrame):
 
         df = df_current.copy()
 
-        # Indicators via pandas-ta
-        st_df = df.ta.supertrend(period=st_period, multiplier=st_mult)
-        if st_df is None or st_df.empty:
+        # Indicators via the numba kernels (pandas-ta math)
+        close = df['close'].to_numpy(dtype=np.float64)
+        tf_key = (symbol, CONFIG['TIMEFRAME'])
+        st_vals, _ = supertrend(df, period=st_period, multiplier=st_mult, cache_key=tf_key)
+        if st_vals.isna().all():
             _record_rejection(symbol, "S12-SuperTrend not ready", {})
             return
-        st_col = next((c for c in st_df.columns if c.startswith('SUPERT_') and 'd' not in c and 'l' not in c and 's' not in c), None)
-        if not st_col:
-            _record_rejection(symbol, "S12-SuperTrend not ready", {"cols": list(st_df.columns)})
-            return
-        df['s12_st'] = st_df[st_col]
+        df['s12_st'] = st_vals
 
-        macd_df = df.ta.macd(fast=macd_fast, slow=macd_slow, signal=macd_signal)
-        if macd_df is None or macd_df.empty:
+        macd_line, macd_sig, _ = _macd_nb(close, macd_fast, macd_slow, macd_signal)
+        if np.isnan(macd_sig).all():
             _record_rejection(symbol, "S12-MACD not ready", {})
             return
-        macd_line_col = next((c for c in macd_df.columns if c.startswith('MACD_') and not c.startswith('MACDh_')), None)
-        macd_sig_col = next((c for c in macd_df.columns if c.startswith('MACDs_')), None)
-        if not macd_line_col or not macd_sig_col:
-            _record_rejection(symbol, "S12-MACD not ready", {"cols": list(macd_df.columns)})
-            return
-        df['s12_macd'] = macd_df[macd_line_col]
-        df['s12_macds'] = macd_df[macd_sig_col]
+        df['s12_macd'] = macd_line
+        df['s12_macds'] = macd_sig
 
-        df['s12_rsi'] = df.ta.rsi(length=rsi_len)
+        df['s12_rsi'] = rsi_wilder(df['close'], rsi_len, cache_key=tf_key)
 
         # Use the last closed candle as signal; enter on next candle open
         sig = df.iloc[-2]
@@ -5153,7 +6293,7 @@ async def evaluate_strategy_12(symbol: str, df_current: pd.DataFrame):
             f"**Leverage:** `{leverage}x`\n"
             f"**TP (1.5R):** `{round_price(symbol, take_price)}`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S12 evaluation error for {symbol}", e)
@@ -5162,9 +6302,9 @@ async def evaluate_strategy_12(symbol: str, df_current: pd.DataFrame):
 # ------------- Strategy 6 (Price-Action Only) helpers -------------
 def _s6_in_session_window(ts: pd.Timestamp) -> bool:
     try:
-        s6 = CONFIG['STRATEGY_6']
-        start_h = int(s6.get('SESSION_START_UTC_HOUR', 7))
-        end_h = int(s6.get('SESSION_END_UTC_HOUR', 15))
+        s6 = CFG.s6
+        start_h = int(s6.session_start_utc_hour)
+        end_h = int(s6.session_end_utc_hour)
         hour = ts.tz_convert('UTC').hour if ts.tzinfo is not None else ts.hour
         if start_h <= end_h:
             return start_h <= hour < end_h
@@ -5202,36 +6342,28 @@ def _s6_trend_from_swings(df_htf: pd.DataFrame, swing_lookback: int = 10) -> Opt
         return 'BEAR'
     return None
 
+def _direction_code(direction: str) -> int:
+    return BUY if direction == 'BUY' else SELL
+
 def _s6_is_pin_bar(candle: pd.Series, direction: str) -> bool:
-    o = float(candle['open']); h = float(candle['high']); l = float(candle['low']); c = float(candle['close'])
-    rng = max(1e-9, h - l)
-    body = abs(c - o)
-    upper_wick = h - max(o, c)
-    lower_wick = min(o, c) - l
-    wick_ratio = (lower_wick if direction == 'BUY' else upper_wick) / rng
     # wick >= 60% of range and close inside prior range handled elsewhere
-    return wick_ratio >= 0.60 and body / rng <= 0.40
+    return bool(is_pin_bar(float(candle['open']), float(candle['high']), float(candle['low']), float(candle['close']),
+                           _direction_code(direction)))
 
 def _s6_is_engulfing_reclaim(curr: pd.Series, prev: pd.Series, direction: str, poi_price: float) -> bool:
     # Engulfing body and reclaim the POI
-    co, cc = float(curr['open']), float(curr['close'])
-    po, pc = float(prev['open']), float(prev['close'])
-    if direction == 'BUY':
-        engulf = cc > co and cc >= max(po, pc) and co <= min(po, pc)
-        reclaim = cc > poi_price
-        return engulf and reclaim
-    else:
-        engulf = cc < co and cc <= min(po, pc) and co >= max(po, pc)
-        reclaim = cc < poi_price
-        return engulf and reclaim
+    cc = float(curr['close'])
+    if not is_engulfing(float(curr['open']), cc, float(prev['open']), float(prev['close']), _direction_code(direction)):
+        return False
+    return cc > poi_price if direction == 'BUY' else cc < poi_price
 
 def _s6_follow_through_ok(rej: pd.Series, ft: pd.Series, direction: str, vol_ma: float, ratio: float) -> bool:
-    rej_range = float(rej['high'] - rej['low'])
-    ft_range = float(ft['high'] - ft['low'])
-    in_dir = (direction == 'BUY' and ft['close'] > ft['open']) or (direction == 'SELL' and ft['close'] < ft['open'])
-    vol_ok = float(ft['volume']) >= float(vol_ma) if np.isfinite(vol_ma) and vol_ma > 0 else False
-    range_ok = ft_range >= ratio * rej_range if np.isfinite(rej_range) else False
-    return in_dir and (range_ok or vol_ok)
+    # A direction other than BUY/SELL never follows through
+    if direction not in ('BUY', 'SELL'):
+        return False
+    return bool(is_follow_through(float(rej['high']), float(rej['low']),
+                                  float(ft['open']), float(ft['high']), float(ft['low']), float(ft['close']),
+                                  float(ft['volume']), float(vol_ma), _direction_code(direction), float(ratio)))
 
 def _s6_within_poi(candle: pd.Series, poi_level: float, atr_val: float) -> bool:
     # consider touch if wick crosses within 0.25*ATR of the POI level
@@ -5239,6 +6371,16 @@ def _s6_within_poi(candle: pd.Series, poi_level: float, atr_val: float) -> bool:
     tol = 0.25 * float(atr_val)
     return (l <= poi_level <= h) or (abs(h - poi_level) <= tol) or (abs(l - poi_level) <= tol)
 
+def _ob_zone_before(bars: BarView, bos_idx: int, direction: str, scan: int = 10, cluster: int = 3) -> Optional[tuple[float, float]]:
+    """Order block: the last `cluster` opposite-colour candles within `scan` bars before the BOS bar."""
+    start = max(0, bos_idx - scan)
+    oo, cc = bars.o[start:bos_idx], bars.c[start:bos_idx]
+    opp = np.flatnonzero(cc < oo if direction == 'BUY' else cc > oo)
+    if opp.size == 0:
+        return None
+    idx = opp[-cluster:] + start
+    return float(bars.l[idx].min()), float(bars.h[idx].max())
+
 async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
     """
     Strategy 10: Combined Active-Adaptive (AA: SMC + retest on M15) + Volatility Breakout Momentum (VBM on M5)
@@ -5247,9 +6389,9 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
     - Execution: limit-first at signal close; expiry windows per config.
     """
     try:
-        s10 = CONFIG.get('STRATEGY_10', {})
+        s10 = CFG.s10
         # Symbol universe (defaults to S5 symbols)
-        allowed = [s.strip().upper() for s in s10.get('SYMBOLS', []) if s.strip()]
+        allowed = [s.strip().upper() for s in s10.symbols if s.strip()]
         if allowed and symbol not in allowed:
             _record_rejection(symbol, "S10-Restricted symbol", {"allowed": ",".join(allowed)})
             return
@@ -5261,10 +6403,11 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
 
         # Clone and compute needed M15 indicators locally (don't rely on global indicator pass)
         df_m15 = df_m15.copy()
-        atr_m15 = atr_wilder(df_m15, int(s10.get('ATR_PERIOD_M15', 14)))
+        m15_key = (symbol, CONFIG['TIMEFRAME'])
+        atr_m15 = atr_wilder(df_m15, int(s10.atr_period_m15), cache_key=m15_key)
         df_m15['s10_atr_m15'] = atr_m15
-        df_m15['s10_ema_fast_m15'] = ema(df_m15['close'], int(s10.get('EMA_FAST', 21)))
-        df_m15['s10_ema_slow_m15'] = ema(df_m15['close'], int(s10.get('EMA_SLOW', 55)))
+        df_m15['s10_ema_fast_m15'] = ema(df_m15['close'], int(s10.ema_fast), cache_key=m15_key)
+        df_m15['s10_ema_slow_m15'] = ema(df_m15['close'], int(s10.ema_slow), cache_key=m15_key)
         df_m15['s10_vol_ma10'] = df_m15['volume'].rolling(10).mean()
 
         sig_m15 = df_m15.iloc[-2]
@@ -5272,14 +6415,15 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
         ft_m15 = df_m15.iloc[-1]
 
         # Fetch H1 for bias and BOS
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
+        df_h1 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300)
         if df_h1 is None or len(df_h1) < 120:
             _record_rejection(symbol, "S10-Not enough H1 data", {"len": len(df_h1) if df_h1 is not None else 0})
             return
         df_h1 = df_h1.copy()
-        df_h1['ema_fast'] = ema(df_h1['close'], int(s10.get('EMA_FAST', 21)))
-        df_h1['ema_slow'] = ema(df_h1['close'], int(s10.get('EMA_SLOW', 55)))
-        df_h1['st_h1'], df_h1['st_h1_dir'] = supertrend(df_h1, period=int(s10.get('H1_ST_PERIOD', 10)), multiplier=float(s10.get('H1_ST_MULT', 3.0)))
+        h1_key = (symbol, '1h')
+        df_h1['ema_fast'] = ema(df_h1['close'], int(s10.ema_fast), cache_key=h1_key)
+        df_h1['ema_slow'] = ema(df_h1['close'], int(s10.ema_slow), cache_key=h1_key)
+        df_h1['st_h1'], df_h1['st_h1_dir'] = supertrend(df_h1, period=int(s10.h1_st_period), multiplier=float(s10.h1_st_mult), cache_key=h1_key)
         h1_sig = df_h1.iloc[-2]
 
         # HF bias on H1 (simple, consistent with S5)
@@ -5298,8 +6442,8 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
         aa_entry = None
         aa_stop = None
 
-        REJ_WICK = float(s10.get('REJECTION_WICK_RATIO', 0.6))
-        CONF_VOL_MULT = float(s10.get('CONFIRM_VOL_MULT', 1.5))
+        REJ_WICK = float(s10.rejection_wick_ratio)
+        CONF_VOL_MULT = float(s10.confirm_vol_mult)
 
         # POI level (simplified): use BOS swing level from H1 window
         poi_level = prev_window_high if bos_dir == 'BUY' else (prev_window_low if bos_dir == 'SELL' else None)
@@ -5359,16 +6503,16 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
         vbm_entry = None
         vbm_stop = None
 
-        df_m5 = await asyncio.to_thread(fetch_klines_sync, symbol, '5m', 300)
+        df_m5 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '5m', 300)
         if df_m5 is not None and len(df_m5) >= 80:
             df_m5 = df_m5.copy()
-            atr_m5 = atr_wilder(df_m5, int(s10.get('ATR_PERIOD_M5', 14)))
+            atr_m5 = atr_wilder(df_m5, int(s10.atr_period_m5), cache_key=(symbol, '5m'))
             df_m5['s10_atr_m5'] = atr_m5
             avg_range_10 = (df_m5['high'] - df_m5['low']).rolling(10).mean()
             avg_vol_10 = df_m5['volume'].rolling(10).mean()
 
-            min_w = int(s10.get('VBM_RANGE_MIN_M5', 6))
-            max_w = int(s10.get('VBM_RANGE_MAX_M5', 12))
+            min_w = int(s10.vbm_range_min_m5)
+            max_w = int(s10.vbm_range_max_m5)
             breakout = df_m5.iloc[-2]
             window_len = max(min_w, min(max_w, 10))
             rng_high = float(df_m5['high'].iloc[-(window_len+2):-2].max())
@@ -5381,7 +6525,7 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
             breakout_range = float(breakout['high'] - breakout['low'])
             breakout_vol = float(breakout['volume'])
 
-            size_ok = (np.isfinite(prev_avg_range) and breakout_range >= float(s10.get('VBM_MIN_RANGE_PCT_OF_AVG', 1.2)) * prev_avg_range)
+            size_ok = (np.isfinite(prev_avg_range) and breakout_range >= float(s10.vbm_min_range_pct_of_avg) * prev_avg_range)
             vol_ok = (np.isfinite(prev_avg_vol) and breakout_vol >= 2.0 * prev_avg_vol)
 
             # Direction by breakout
@@ -5454,7 +6598,7 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
 
         # Sizing: reuse S5 model (fixed-USDT risk with min-notional)
         balance = await asyncio.to_thread(get_account_balance_usdt)
-        risk_usd = float(s10.get('RISK_USD', CONFIG.get('STRATEGY_5', {}).get('RISK_USD', 0.5)))
+        risk_usd = float(s10.risk_usd)
         ideal_qty = risk_usd / distance
         ideal_qty = await asyncio.to_thread(round_qty, symbol, ideal_qty, rounding=ROUND_DOWN)
 
@@ -5505,7 +6649,7 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
 
         # Expiry: use M15 expiry for AA/stacked; for VBM-only, still keep conservative default M15 expiry
         candle_duration = timeframe_to_timedelta(CONFIG['TIMEFRAME'])
-        expiry_candles = int(s10.get("LIMIT_EXPIRY_M15_CANDLES", 3))
+        expiry_candles = int(s10.limit_expiry_m15_candles)
         expiry_time = df_m15.index[-1] + (candle_duration * (expiry_candles - 1))
 
         pending_meta = {
@@ -5552,7 +6696,7 @@ async def evaluate_strategy_10(symbol: str, df_m15: pd.DataFrame):
             f"Component: `{pending_meta.get('s10_component', 'N/A')}`\n"
             f"News impact: `{news.get('impact', 'None')}` — {news.get('reason', '')}"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S10 evaluation error for {symbol}", e)
@@ -5572,54 +6716,66 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
     - Sizing: same as S4 fixed-risk model.
     """
     try:
-        s11 = CONFIG.get("STRATEGY_11", {})
+        s11 = CFG.s11
         # Fetch H1 and H4 data
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
-        if df_h1 is None or len(df_h1) < max(50, int(s11.get("BB_LENGTH", 20)) + 5):
+        df_h1 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300)
+        if df_h1 is None or len(df_h1) < max(50, int(s11.bb_length) + 5):
             _record_rejection(symbol, "S11-Not enough H1 data", {"len": len(df_h1) if df_h1 is not None else 0})
             return
-        df_h4 = await asyncio.to_thread(fetch_klines_sync, symbol, '4h', 300)
+        df_h4 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '4h', 300)
         if df_h4 is None or len(df_h4) < 50:
             _record_rejection(symbol, "S11-Not enough H4 data", {"len": len(df_h4) if df_h4 is not None else 0})
             return
 
-        # Compute indicators
-        df_h1 = df_h1.copy()
-        df_h4 = df_h4.copy()
+        # Only the last closed bar of each indicator is used, so evaluate them on raw
+        # arrays at index -2 rather than adding full columns to the frames.
+        close_h1 = df_h1['close'].to_numpy(dtype=np.float64)
+        close_h4 = df_h4['close'].to_numpy(dtype=np.float64)
 
-        # 1H Bollinger Bands
-        bb_len = int(s11.get("BB_LENGTH", 20))
-        bb_std = float(s11.get("BB_STD", 2.0))
-        bbu_h1, bbl_h1 = bollinger_bands(df_h1['close'], bb_len, bb_std)
-        df_h1['bb_upper'] = bbu_h1
-        df_h1['bb_lower'] = bbl_h1
+        # 1H Bollinger Bands (same sample std as bollinger_bands())
+        bb_len = int(s11.bb_length)
+        bb_std = float(s11.bb_std)
+        bb_win = close_h1[-1 - bb_len:-1]
+        bb_mid = bb_win.mean()
+        bb_dev = bb_win.std(ddof=1) * bb_std
+        bb_upper = float(bb_mid + bb_dev)
+        bb_lower = float(bb_mid - bb_dev)
 
         # ATR on 1H for SL sizing (Wilder for stability)
-        df_h1['atr_h1'] = atr_wilder(df_h1, int(s11.get("ATR_PERIOD_H1", 14)))
+        atr_h1_series = atr_wilder(df_h1, int(s11.atr_period_h1), cache_key=(symbol, '1h'))
 
         # ADX on 1H and 4H
-        adx(df_h1, period=int(s11.get("ADX_PERIOD_H1", 14)))
-        adx(df_h4, period=int(s11.get("ADX_PERIOD_4H", 14)))
+        _, _, adx_h1_vals = _adx_nb(
+            df_h1['high'].to_numpy(dtype=np.float64), df_h1['low'].to_numpy(dtype=np.float64),
+            close_h1, int(s11.adx_period_h1),
+        )
+        _, _, adx_h4_vals = _adx_nb(
+            df_h4['high'].to_numpy(dtype=np.float64), df_h4['low'].to_numpy(dtype=np.float64),
+            close_h4, int(s11.adx_period_4h),
+        )
 
-        # 4H RSI filter
-        rsi_period_4h = int(s11.get("RSI_PERIOD_4H", 14))
-        df_h4['rsi_4h'] = rsi(df_h4['close'], rsi_period_4h)
+        # 4H RSI filter: rsi() on the last closed bar, i.e. SMA of gains/losses over the
+        # trailing window. Like rsi(), a window with no losses yields 0.
+        rsi_period_4h = int(s11.rsi_period_4h)
+        rsi_delta = np.diff(close_h4[-2 - rsi_period_4h:-1])
+        rsi_gain = rsi_delta[rsi_delta > 0].sum() / rsi_period_4h
+        rsi_loss = -rsi_delta[rsi_delta < 0].sum() / rsi_period_4h
+        rsi_rs = rsi_gain / rsi_loss if rsi_loss > 0 else 0.0
 
         # Extract last closed candles
         sig_h1 = df_h1.iloc[-2]   # signal on last closed H1
-        last4h = df_h4.iloc[-2]   # filters on last closed 4H
         # Enter on the next H1 candle open, per spec
-        entry_price = float(df_h1.iloc[-1]['open'])
+        entry_price = float(df_h1['open'].iloc[-1])
 
         # Filters
-        rsi_long_min = float(s11.get("RSI_LONG_MIN", 55.0))
-        rsi_short_max = float(s11.get("RSI_SHORT_MAX", 45.0))
-        adx_min_h1 = float(s11.get("ADX_MIN_H1", 20.0))
-        adx_min_4h = float(s11.get("ADX_MIN_4H", 25.0))
+        rsi_long_min = float(s11.rsi_long_min)
+        rsi_short_max = float(s11.rsi_short_max)
+        adx_min_h1 = float(s11.adx_min_h1)
+        adx_min_4h = float(s11.adx_min_4h)
 
-        rsi4h = float(last4h.get('rsi_4h', 0.0))
-        adx_h1 = float(sig_h1.get('adx', 0.0))
-        adx_4h = float(last4h.get('adx', 0.0))
+        rsi4h = float(100 - (100 / (1 + rsi_rs)))
+        adx_h1 = float(np.nan_to_num(adx_h1_vals[-2]))
+        adx_4h = float(np.nan_to_num(adx_h4_vals[-2]))
 
         # Determine allowed direction from RSI filter
         allow_long = rsi4h > rsi_long_min
@@ -5635,16 +6791,17 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
 
         # Mean reversion signal from 1H BB
         side = None
-        if allow_long and float(sig_h1['close']) < float(sig_h1['bb_lower']):
+        sig_close = float(close_h1[-2])
+        if allow_long and sig_close < bb_lower:
             side = 'BUY'
-        elif allow_short and float(sig_h1['close']) > float(sig_h1['bb_upper']):
+        elif allow_short and sig_close > bb_upper:
             side = 'SELL'
         else:
-            _record_rejection(symbol, "S11-No BB breach", {"close": float(sig_h1['close']), "bb_upper": float(sig_h1['bb_upper']), "bb_lower": float(sig_h1['bb_lower'])}, signal_candle=sig_h1)
+            _record_rejection(symbol, "S11-No BB breach", {"close": sig_close, "bb_upper": bb_upper, "bb_lower": bb_lower}, signal_candle=sig_h1)
             return
 
         # Stop loss using signal candle extreme +/- 4.5*ATR(1H)
-        atr_h1 = float(sig_h1.get('atr_h1', 0.0))
+        atr_h1 = float(atr_h1_series.iloc[-2])
         if side == 'BUY':
             stop_price = float(sig_h1['low']) - 4.5 * atr_h1
         else:
@@ -5657,7 +6814,7 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
 
         # Position sizing: same as S4 (fixed USDT risk)
         balance = await asyncio.to_thread(get_account_balance_usdt)
-        risk_usd = float(s11.get("RISK_USD", CONFIG.get('STRATEGY_4', {}).get('RISK_USD', 0.5)))
+        risk_usd = float(s11.risk_usd)
         ideal_qty = risk_usd / distance
         ideal_qty = await asyncio.to_thread(round_qty, symbol, ideal_qty, rounding=ROUND_DOWN)
 
@@ -5685,7 +6842,7 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
         pending_order_id = f"{symbol}_{order_id}"
 
         # Expiry: simpler hour-based expiry
-        expiry_hours = int(s11.get("ORDER_EXPIRY_HOURS", 2))
+        expiry_hours = int(s11.order_expiry_hours)
         expiry_time = datetime.utcnow() + timedelta(hours=expiry_hours)
 
         pending_meta = {
@@ -5715,7 +6872,7 @@ async def evaluate_strategy_11(symbol: str, df_current: pd.DataFrame):
             f"Leverage: `{leverage}x`\n"
             f"RSI4H: `{rsi4h:.2f}` | ADX1H: `{adx_h1:.2f}` | ADX4H: `{adx_4h:.2f}`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S11 evaluation error for {symbol}", e)
@@ -5733,10 +6890,10 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
     - One setup per symbol per day
     """
     try:
-        s6 = CONFIG['STRATEGY_6']
+        s6 = CFG.s6
 
         # Restrict S6 to the majors set unless overridden via env
-        allowed_s6 = s6.get("SYMBOLS", [])
+        allowed_s6 = s6.symbols
         if isinstance(allowed_s6, str):
             allowed_s6 = [x.strip().upper() for x in allowed_s6.split(",") if x.strip()]
         if not allowed_s6 or not isinstance(allowed_s6, (list, tuple)):
@@ -5760,15 +6917,17 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
 
         # Prepare M15 indicators
         df_m15 = df_m15.copy()
-        atr_period = s6.get('ATR_PERIOD', 14)
+        atr_period = s6.atr_period
         df_m15['s6_atr'] = df_m15.get('s6_atr_m15', atr(df_m15, atr_period))
-        df_m15['s6_vol_ma'] = df_m15.get('s6_vol_ma', df_m15['volume'].rolling(int(s6.get('VOL_MA_LEN',10))).mean())
+        df_m15['s6_vol_ma'] = df_m15.get('s6_vol_ma', df_m15['volume'].rolling(int(s6.vol_ma_len)).mean())
 
         sig = df_m15.iloc[-2]; prev = df_m15.iloc[-3]
 
         # Fetch HTF data
-        df_h4 = await asyncio.to_thread(fetch_klines_sync, symbol, '4h', 400)
-        df_d = await asyncio.to_thread(fetch_klines_sync, symbol, '1d', 400)
+        df_h4, df_d = await asyncio.gather(
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '4h', 400),
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '1d', 400),
+        )
         if df_h4 is None or df_d is None or len(df_h4) < 50 or len(df_d) < 50:
             _record_rejection(symbol, "S6-Not enough HTF data", {"h4": len(df_h4) if df_h4 is not None else 0, "d": len(df_d) if df_d is not None else 0})
             return
@@ -5822,7 +6981,7 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
         # Follow-through confirmation by next candle (or same if strong)
         ft = df_m15.iloc[-1]
         vol_ma = float(df_m15['s6_vol_ma'].iloc[-2]) if pd.notna(df_m15['s6_vol_ma'].iloc[-2]) else float('nan')
-        ratio = float(s6.get('FOLLOW_THROUGH_RANGE_RATIO', 0.7))
+        ratio = float(s6.follow_through_range_ratio)
         if not _s6_follow_through_ok(sig, ft, direction, vol_ma, ratio):
             _record_rejection(symbol, "S6-No follow-through", {"vol_ma": vol_ma, "ratio": ratio})
             return
@@ -5831,11 +6990,11 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
         entry_price = float(sig['close'])  # limit at rejection close
         if direction == 'BUY':
             wick_low = float(sig['low'])
-            stop_price = wick_low - s6.get('ATR_BUFFER_MULT', 0.25) * atr_sig
+            stop_price = wick_low - s6.atr_buffer_mult * atr_sig
             side = 'BUY'
         else:
             wick_high = float(sig['high'])
-            stop_price = wick_high + s6.get('ATR_BUFFER_MULT', 0.25) * atr_sig
+            stop_price = wick_high + s6.atr_buffer_mult * atr_sig
             side = 'SELL'
 
         # Distance and sizing (S4 risk model)
@@ -5844,7 +7003,7 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
             _record_rejection(symbol, "S6-Invalid SL distance", {"entry": entry_price, "sl": stop_price})
             return
 
-        risk_usd = float(s6.get('RISK_USD', CONFIG['STRATEGY_4']['RISK_USD']))
+        risk_usd = float(s6.risk_usd)
         ideal_qty = risk_usd / distance
         ideal_qty = await asyncio.to_thread(round_qty, symbol, ideal_qty, rounding=ROUND_DOWN)
 
@@ -5869,7 +7028,7 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
         pending_order_id = f"{symbol}_{order_id}"
 
         candle_duration = timeframe_to_timedelta(CONFIG['TIMEFRAME'])
-        expiry_candles = int(s6.get("LIMIT_EXPIRY_CANDLES", 3))
+        expiry_candles = int(s6.limit_expiry_candles)
         expiry_time = df_m15.index[-1] + (candle_duration * (expiry_candles - 1))
 
         pending_meta = {
@@ -5889,10 +7048,10 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
             await asyncio.to_thread(add_pending_order_to_db, pending_meta)
 
         # Enforce one trade per day if configured: cooldown until UTC end of day
-        if s6.get('ENFORCE_ONE_TRADE_PER_DAY', True):
+        if s6.enforce_one_trade_per_day:
             now = datetime.now(timezone.utc)
             eod = datetime(now.year, now.month, now.day, 23, 59, 59, tzinfo=timezone.utc)
-            symbol_trade_cooldown[symbol] = eod
+            symbol_trade_cooldown[symbol] = eod.timestamp()
             log.info(f"S6: Set end-of-day cooldown for {symbol} to enforce one setup per day.")
 
         title = "⏳ New Pending Order: S6-PA"
@@ -5905,7 +7064,7 @@ async def evaluate_strategy_6(symbol: str, df_m15: pd.DataFrame):
             f"Risk: `{actual_risk_usdt:.2f} USDT`\n"
             f"Leverage: `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S6 evaluation error for {symbol}", e)
         return
@@ -5921,8 +7080,8 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
     - Qty: minimum notional only (no fixed risk by default)
     """
     try:
-        s7 = CONFIG['STRATEGY_7']
-        allowed = [s.strip().upper() for s in s7.get('SYMBOLS', []) if s.strip()]
+        s7 = CFG.s7
+        allowed = [s.strip().upper() for s in s7.symbols if s.strip()]
         if allowed and symbol not in allowed:
             _record_rejection(symbol, "S7-Restricted symbol", {"allowed": ",".join(allowed)})
             return
@@ -5933,7 +7092,7 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
 
         # Clone and compute local ATR/vol
         df_m15 = df_m15.copy()
-        atr_period = int(s7.get('ATR_PERIOD', 14))
+        atr_period = int(s7.atr_period)
         df_m15['s7_atr'] = atr(df_m15, atr_period)
         s7_atr = float(df_m15['s7_atr'].iloc[-2]) if 's7_atr' in df_m15.columns else 0.0
         if s7_atr <= 0:
@@ -5941,43 +7100,30 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
             return
 
         # HTF: H1 BOS detection
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
+        df_h1 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300)
         if df_h1 is None or len(df_h1) < 120:
             _record_rejection(symbol, "S7-Not enough H1 data", {"len": len(df_h1) if df_h1 is not None else 0})
             return
-        df_h1 = df_h1.copy()
-        lookback = int(s7.get('BOS_LOOKBACK_H1', 72))
-        sig_h1 = df_h1.iloc[-2]  # last closed H1
-        prev_window_high = float(df_h1['high'].iloc[-(lookback+2):-2].max())
-        prev_window_low = float(df_h1['low'].iloc[-(lookback+2):-2].min())
+        lookback = int(s7.bos_lookback_h1)
+        h1 = BarView.from_df(df_h1)
+        bos_idx = len(h1) - 2  # last closed H1
+        sig_h1_close = float(h1.c[bos_idx])
+        prev_window_high = float(h1.h[-(lookback+2):-2].max())
+        prev_window_low = float(h1.l[-(lookback+2):-2].min())
 
         direction = None
-        if float(sig_h1['close']) > prev_window_high:
+        if sig_h1_close > prev_window_high:
             direction = 'BUY'
-        elif float(sig_h1['close']) < prev_window_low:
+        elif sig_h1_close < prev_window_low:
             direction = 'SELL'
         else:
-            _record_rejection(symbol, "S7-No BOS on H1", {"close": float(sig_h1['close']), "HH": prev_window_high, "LL": prev_window_low})
+            _record_rejection(symbol, "S7-No BOS on H1", {"close": sig_h1_close, "HH": prev_window_high, "LL": prev_window_low})
             return
 
-        # POI: simple H1 OB zone near BOS
-        # Find last opposite color candle(s) before the BOS candle
-        bos_idx = df_h1.index.get_loc(sig_h1.name)
-        start_scan = max(0, bos_idx - 10)
-        segment = df_h1.iloc[start_scan:bos_idx]
-        ob_lows = []
-        ob_highs = []
-        for i in range(len(segment)-1, -1, -1):
-            c = segment.iloc[i]
-            is_opp = (direction == 'BUY' and c['close'] < c['open']) or (direction == 'SELL' and c['close'] > c['open'])
-            if is_opp:
-                ob_lows.append(float(c['low']))
-                ob_highs.append(float(c['high']))
-                if len(ob_lows) >= 3:  # use up to 3-bar cluster
-                    break
-        if ob_lows and ob_highs:
-            ob_low = min(ob_lows)
-            ob_high = max(ob_highs)
+        # POI: simple H1 OB zone near BOS (up to 3-bar cluster of opposite candles)
+        ob_zone = _ob_zone_before(h1, bos_idx, direction)
+        if ob_zone is not None:
+            ob_low, ob_high = ob_zone
             poi_level = (ob_low + ob_high) / 2.0
             ob_range = ob_high - ob_low
         else:
@@ -6002,7 +7148,7 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
             return
 
         # Rejection: pin bar or engulfing reclaim of POI
-        ob_min_body_ratio = float(s7.get('OB_MIN_BODY_RATIO', 0.5))
+        ob_min_body_ratio = float(s7.ob_min_body_ratio)
         # Use existing S6 helpers
         is_pin = _s6_is_pin_bar(sig, direction)
         is_engulf = _s6_is_engulfing_reclaim(sig, prev, direction, poi_level)
@@ -6020,11 +7166,11 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
         entry_price = float(sig['close'])
         if direction == 'BUY':
             zone_extreme = ob_low if ob_range > 0 else float(sig['low'])
-            stop_price = zone_extreme - float(s7.get('ATR_BUFFER', 0.25)) * s7_atr
+            stop_price = zone_extreme - float(s7.atr_buffer) * s7_atr
             side = 'BUY'
         else:
             zone_extreme = ob_high if ob_range > 0 else float(sig['high'])
-            stop_price = zone_extreme + float(s7.get('ATR_BUFFER', 0.25)) * s7_atr
+            stop_price = zone_extreme + float(s7.atr_buffer) * s7_atr
             side = 'SELL'
 
         # Sizing: min-notional only by default
@@ -6048,7 +7194,7 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
         pending_order_id = f"{symbol}_{order_id}"
 
         candle_duration = timeframe_to_timedelta(CONFIG['TIMEFRAME'])
-        expiry_candles = int(s7.get("LIMIT_EXPIRY_CANDLES", 4))
+        expiry_candles = int(s7.limit_expiry_candles)
         expiry_time = df_m15.index[-1] + (candle_duration * (expiry_candles - 1))
 
         pending_meta = {
@@ -6076,7 +7222,7 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
             f"Qty: `{final_qty}`\n"
             f"Leverage: `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S7 evaluation error for {symbol}", e)
@@ -6085,15 +7231,15 @@ async def evaluate_strategy_7(symbol: str, df_m15: pd.DataFrame):
 # ------------- Strategy 8 (SMC + Chart-Pattern Sniper Entry) helpers -------------
 def _s8_htf_direction(symbol: str) -> Optional[str]:
     try:
-        df_h4 = fetch_klines_sync(symbol, '4h', 400)
-        df_d = fetch_klines_sync(symbol, '1d', 400)
+        df_h4 = fetch_htf_klines_sync(symbol, '4h', 400)
+        df_d = fetch_htf_klines_sync(symbol, '1d', 400)
         if df_h4 is None or df_d is None or len(df_h4) < 50 or len(df_d) < 50:
             return None
         bias_d = _s6_trend_from_swings(df_d, swing_lookback=20)
         bias_h4 = _s6_trend_from_swings(df_h4, swing_lookback=20)
         if bias_d in ('BULL', 'BEAR'):
             return 'BUY' if bias_d == 'BULL' else 'SELL'
-        df_h1 = fetch_klines_sync(symbol, '1h', 300)
+        df_h1 = fetch_htf_klines_sync(symbol, '1h', 300)
         if df_h1 is None or len(df_h1) < 80 or bias_h4 not in ('BULL', 'BEAR'):
             return None
         bias_h1 = _s6_trend_from_swings(df_h1, swing_lookback=20)
@@ -6106,45 +7252,31 @@ def _s8_htf_direction(symbol: str) -> Optional[str]:
 def _s8_last_bos_and_poi(df_h1: pd.DataFrame, lookback: int) -> tuple[Optional[str], Optional[tuple[float, float]], Optional[tuple[float, float]]]:
     if df_h1 is None or len(df_h1) < lookback + 5:
         return None, None, None
-    sig_h1 = df_h1.iloc[-2]
-    prev_high = float(df_h1['high'].iloc[-(lookback+2):-2].max())
-    prev_low = float(df_h1['low'].iloc[-(lookback+2):-2].min())
+    bars = BarView.from_df(df_h1)
+    o, c = bars.o, bars.c
+    bos_idx = len(bars) - 2
+    sig_close = float(c[bos_idx])
+    prev_high = float(bars.h[-(lookback+2):-2].max())
+    prev_low = float(bars.l[-(lookback+2):-2].min())
     direction = None
-    if float(sig_h1['close']) > prev_high:
+    if sig_close > prev_high:
         direction = 'BUY'
-    elif float(sig_h1['close']) < prev_low:
+    elif sig_close < prev_low:
         direction = 'SELL'
     else:
         return None, None, None
-    bos_idx = df_h1.index.get_loc(sig_h1.name)
-    start_scan = max(0, bos_idx - 10)
-    segment = df_h1.iloc[start_scan:bos_idx]
-    ob_lows, ob_highs = [], []
-    for i in range(len(segment)-1, -1, -1):
-        c = segment.iloc[i]
-        is_opp = (direction == 'BUY' and float(c['close']) < float(c['open'])) or (direction == 'SELL' and float(c['close']) > float(c['open']))
-        if is_opp:
-            ob_lows.append(float(c['low']))
-            ob_highs.append(float(c['high']))
-            if len(ob_lows) >= 3:
-                break
-    ob_zone = (min(ob_lows), max(ob_highs)) if ob_lows and ob_highs else None
-
-    # Find last strict body gap (FVG) near BOS
-    def find_last_fvg(idx: int, dir_side: str) -> Optional[tuple[float, float]]:
-        start = max(1, idx - 5)
-        end = min(len(df_h1) - 1, idx)
-        for j in range(end, start - 1, -1):
-            prev = df_h1.iloc[j - 1]
-            curr = df_h1.iloc[j]
-            prev_close = float(prev['close']); curr_open = float(curr['open'])
-            if dir_side == 'BUY' and curr_open > prev_close:
-                return (prev_close, curr_open)
-            if dir_side == 'SELL' and curr_open < prev_close:
-                return (curr_open, prev_close)
-        return None
-
-    fvg_zone = find_last_fvg(bos_idx, direction)
+    ob_zone = _ob_zone_before(bars, bos_idx, direction)
+
+    # Last strict body gap (FVG) near BOS: open of bar j vs close of bar j-1, j in [bos_idx-5, bos_idx]
+    start = max(1, bos_idx - 5)
+    curr_open = o[start:bos_idx + 1]
+    prev_close = c[start - 1:bos_idx]
+    gaps = np.flatnonzero(curr_open > prev_close if direction == 'BUY' else curr_open < prev_close)
+    fvg_zone = None
+    if gaps.size:
+        j = gaps[-1]
+        pc, co = float(prev_close[j]), float(curr_open[j])
+        fvg_zone = (pc, co) if direction == 'BUY' else (co, pc)
     return direction, ob_zone, fvg_zone
 
 def _s8_zone_touch(cndl: pd.Series, zone: tuple[float,float], atr_val: float) -> bool:
@@ -6174,10 +7306,10 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
     - Sizing: reuse central risk model (small account friendly)
     """
     try:
-        s8 = CONFIG['STRATEGY_8']
+        s8 = CFG.s8
 
         # Restrict S8 to the majors set unless overridden via env
-        allowed_s8 = s8.get("SYMBOLS")
+        allowed_s8 = s8.symbols
         if isinstance(allowed_s8, str):
             allowed_s8 = [x.strip().upper() for x in allowed_s8.split(",") if x.strip()]
         if not allowed_s8 or not isinstance(allowed_s8, (list, tuple)):
@@ -6194,7 +7326,7 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
             return
 
         df_m15 = df_m15.copy()
-        atr_period = int(s8.get('ATR_PERIOD', 14))
+        atr_period = int(s8.atr_period)
         df_m15['s8_atr'] = atr(df_m15, atr_period)
         atr_m15 = float(df_m15['s8_atr'].iloc[-2]) if 's8_atr' in df_m15.columns else 0.0
         if atr_m15 <= 0:
@@ -6208,12 +7340,12 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
             return
 
         # H1 BOS + POI
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
+        df_h1 = await asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300)
         if df_h1 is None or len(df_h1) < 120:
             _record_rejection(symbol, "S8-Not enough H1 data", {"len": len(df_h1) if df_h1 is not None else 0})
             return
-        lookback = int(s8.get('BOS_LOOKBACK_H1', 72))
-        direction_bos, ob_zone, fvg_zone = _s8_last_bos_and_poi(df_h1.copy(), lookback)
+        lookback = int(s8.bos_lookback_h1)
+        direction_bos, ob_zone, fvg_zone = _s8_last_bos_and_poi(df_h1, lookback)
         if direction_bos is None:
             _record_rejection(symbol, "S8-No BOS on H1", {})
             return
@@ -6221,8 +7353,8 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
             _record_rejection(symbol, "S8-BOS dir != HTF bias", {"bos": direction_bos, "htf": direction_bias})
             return
 
-        use_ob = bool(s8.get('USE_OB', True))
-        use_fvg = bool(s8.get('USE_FVG', True))
+        use_ob = bool(s8.use_ob)
+        use_fvg = bool(s8.use_fvg)
 
         poi_zone = None
         zone_type = None
@@ -6241,15 +7373,17 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
         sig = df_m15.iloc[-2]   # breakout candle (for break+retest), or pin for micro pattern
         ret = df_m15.iloc[-1]   # retest/confirm candle
         prev = df_m15.iloc[-3]
+        m15 = BarView.from_df(df_m15)
+        m15_h, m15_l = m15.h, m15.l
 
-        range_high = float(df_m15['high'].iloc[-(N+1):-1].max())
-        range_low = float(df_m15['low'].iloc[-(N+1):-1].min())
+        range_high = float(m15_h[-(N+1):-1].max())
+        range_low = float(m15_l[-(N+1):-1].min())
         # Ensure pattern forms inside or touching POI
         if not _s8_zone_touch(sig, poi_zone, atr_m15) and not _s8_zone_touch(prev, poi_zone, atr_m15):
             _record_rejection(symbol, "S8-Pattern not inside/touching POI", {"zone": zone_type})
             return
 
-        vol_ma_len = int(s8.get('VOL_MA_LEN', 10))
+        vol_ma_len = int(s8.vol_ma_len)
         vol_ma10 = float(df_m15['volume'].rolling(vol_ma_len).mean().iloc[-2]) if vol_ma_len > 0 else float('nan')
 
         side = None
@@ -6265,8 +7399,8 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
             retest_ok = (float(ret['low']) <= range_high <= float(ret['high'])) and float(ret['close']) > range_high
             # Retrace size 20–50% of prior impulse
             impL = 14
-            imp_high = float(df_m15['high'].iloc[-(N+1+impL):-(N+1)].max()) if len(df_m15) >= (N+1+impL) else float('nan')
-            imp_low = float(df_m15['low'].iloc[-(N+1+impL):-(N+1)].min()) if len(df_m15) >= (N+1+impL) else float('nan')
+            imp_high = float(m15_h[-(N+1+impL):-(N+1)].max()) if len(df_m15) >= (N+1+impL) else float('nan')
+            imp_low = float(m15_l[-(N+1+impL):-(N+1)].min()) if len(df_m15) >= (N+1+impL) else float('nan')
             impulse_len = imp_high - imp_low if (np.isfinite(imp_high) and np.isfinite(imp_low)) else float('nan')
             pullback = imp_high - range_low if np.isfinite(imp_high) else float('nan')
             retrace_pct = (pullback / impulse_len) if (np.isfinite(pullback) and impulse_len and impulse_len > 0) else float('nan')
@@ -6278,17 +7412,17 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
                 # Stop beyond OB extremes if OB exists, else below pattern extreme
                 if zone_type == 'OB':
                     ob_low, ob_high = poi_zone
-                    stop_price = float(ob_low) - float(s8.get('ATR_BUFFER', 0.25)) * atr_m15
+                    stop_price = float(ob_low) - float(s8.atr_buffer) * atr_m15
                 else:
-                    stop_price = float(range_low) - float(s8.get('ATR_BUFFER', 0.25)) * atr_m15
+                    stop_price = float(range_low) - float(s8.atr_buffer) * atr_m15
                 pattern_ok = True
                 pattern_name = "Break+Retest"
         else:  # SELL
             breakout_ok = float(sig['close']) < range_low
             retest_ok = (float(ret['low']) <= range_low <= float(ret['high'])) and float(ret['close']) < range_low
             impL = 14
-            imp_low = float(df_m15['low'].iloc[-(N+1+impL):-(N+1)].min()) if len(df_m15) >= (N+1+impL) else float('nan')
-            imp_high = float(df_m15['high'].iloc[-(N+1+impL):-(N+1)].max()) if len(df_m15) >= (N+1+impL) else float('nan')
+            imp_low = float(m15_l[-(N+1+impL):-(N+1)].min()) if len(df_m15) >= (N+1+impL) else float('nan')
+            imp_high = float(m15_h[-(N+1+impL):-(N+1)].max()) if len(df_m15) >= (N+1+impL) else float('nan')
             impulse_len = imp_high - imp_low if (np.isfinite(imp_high) and np.isfinite(imp_low)) else float('nan')
             pullback = range_high - imp_low if np.isfinite(imp_low) else float('nan')
             retrace_pct = (pullback / impulse_len) if (np.isfinite(pullback) and impulse_len and impulse_len > 0) else float('nan')
@@ -6299,9 +7433,9 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
                 entry_price = float(ret['close'])
                 if zone_type == 'OB':
                     ob_low, ob_high = poi_zone
-                    stop_price = float(ob_high) + float(s8.get('ATR_BUFFER', 0.25)) * atr_m15
+                    stop_price = float(ob_high) + float(s8.atr_buffer) * atr_m15
                 else:
-                    stop_price = float(range_high) + float(s8.get('ATR_BUFFER', 0.25)) * atr_m15
+                    stop_price = float(range_high) + float(s8.atr_buffer) * atr_m15
                 pattern_ok = True
                 pattern_name = "Break+Retest"
 
@@ -6313,9 +7447,9 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
                 side = direction_bos
                 entry_price = float(ret['close'])
                 if direction_bos == 'BUY':
-                    stop_price = float(sig['low']) - float(s8.get('ATR_BUFFER', 0.25)) * atr_m15
+                    stop_price = float(sig['low']) - float(s8.atr_buffer) * atr_m15
                 else:
-                    stop_price = float(sig['high']) + float(s8.get('ATR_BUFFER', 0.25)) * atr_m15
+                    stop_price = float(sig['high']) + float(s8.atr_buffer) * atr_m15
                 pattern_ok = True
                 pattern_name = "MicroPin+Confirm"
 
@@ -6353,7 +7487,7 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
         pending_order_id = f"{symbol}_{order_id}"
 
         candle_duration = timeframe_to_timedelta(CONFIG['TIMEFRAME'])
-        expiry_candles = int(s8.get("RETEST_EXPIRY_CANDLES", 3))
+        expiry_candles = int(s8.retest_expiry_candles)
         expiry_time = df_m15.index[-1] + (candle_duration * (expiry_candles - 1))
 
         pending_meta = {
@@ -6384,7 +7518,7 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
             f"Risk: `{risk_usdt:.2f} USDT`\n"
             f"Leverage: `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S8 evaluation error for {symbol}", e)
@@ -6393,9 +7527,9 @@ async def evaluate_strategy_8(symbol: str, df_m15: pd.DataFrame):
 # --------- Strategy 9 (SMC Scalping — High-Win Probability) helpers ---------
 def _s9_in_session_window(ts: pd.Timestamp) -> bool:
     try:
-        s9 = CONFIG.get('STRATEGY_9', {})
-        start_h = int(s9.get('SESSION_START_UTC_HOUR', 7))
-        end_h = int(s9.get('SESSION_END_UTC_HOUR', 15))
+        s9 = CFG.s9
+        start_h = int(s9.session_start_utc_hour)
+        end_h = int(s9.session_end_utc_hour)
         hour = ts.tz_convert('UTC').hour if ts.tzinfo is not None else ts.hour
         if start_h <= end_h:
             return start_h <= hour < end_h
@@ -6407,10 +7541,11 @@ def _s9_recent_h1_bos(df_h1: pd.DataFrame, min_lb: int, max_lb: int) -> Optional
     try:
         if df_h1 is None or len(df_h1) < max_lb + 5:
             return None
-        sig_h1 = df_h1.iloc[-2]
-        prev_high = float(df_h1['high'].iloc[-(max_lb+2):-2].max())
-        prev_low = float(df_h1['low'].iloc[-(max_lb+2):-2].min())
-        c = float(sig_h1['close'])
+        h = df_h1['high'].to_numpy(np.float64)
+        l = df_h1['low'].to_numpy(np.float64)
+        prev_high = float(h[-(max_lb+2):-2].max())
+        prev_low = float(l[-(max_lb+2):-2].min())
+        c = float(df_h1['close'].iat[-2])
         if c > prev_high:
             return 'BUY'
         if c < prev_low:
@@ -6423,22 +7558,8 @@ def _s9_h1_ob_zone(df_h1: pd.DataFrame, direction: str) -> Optional[tuple[float,
     try:
         if df_h1 is None or len(df_h1) < 20:
             return None
-        sig_h1 = df_h1.iloc[-2]
-        bos_idx = df_h1.index.get_loc(sig_h1.name)
-        start_scan = max(0, bos_idx - 10)
-        segment = df_h1.iloc[start_scan:bos_idx]
-        ob_lows, ob_highs = [], []
-        for i in range(len(segment)-1, -1, -1):
-            c = segment.iloc[i]
-            is_opp = (direction == 'BUY' and float(c['close']) < float(c['open'])) or (direction == 'SELL' and float(c['close']) > float(c['open']))
-            if is_opp:
-                ob_lows.append(float(c['low']))
-                ob_highs.append(float(c['high']))
-                if len(ob_lows) >= 3:
-                    break
-        if ob_lows and ob_highs:
-            return (min(ob_lows), max(ob_highs))
-        return None
+        bars = BarView.from_df(df_h1)
+        return _ob_zone_before(bars, len(bars) - 2, direction)
     except Exception:
         return None
 
@@ -6471,32 +7592,24 @@ def _s9_detect_sweep_reclaim(df_m1: pd.DataFrame, direction: str, sweep_lookback
         pre_start = max(0, pre_end - sweep_lookback)
         if pre_end <= pre_start:
             return False
-        pre_window_high = float(df_m1['high'].iloc[pre_start:pre_end].max())
-        pre_window_low = float(df_m1['low'].iloc[pre_start:pre_end].min())
-        sweep_window = df_m1.iloc[pre_end:sig_idx+1]  # includes signal candle for reclaim
-        swept = False
-        reclaimed = False
+        m1 = BarView.from_df(df_m1)
+        h, l, c = m1.h, m1.l, m1.c
+        # Sweep window includes the signal candle for the reclaim
+        win_h, win_l, win_c = h[pre_end:sig_idx+1], l[pre_end:sig_idx+1], c[pre_end:sig_idx+1]
         if direction == 'BUY':
-            # Any low that pierces pre_window_low
-            for i in range(len(sweep_window)):
-                c = sweep_window.iloc[i]
-                if float(c['low']) < pre_window_low:
-                    swept = True
-                    # Reclaim: any close afterwards back above pre_window_low within the window
-                    after = sweep_window.iloc[i:min(i+reclaim_max_bars+1, len(sweep_window))]
-                    if any(float(x['close']) > pre_window_low for _, x in after.iterrows()):
-                        reclaimed = True
-                    break
-        else:
-            for i in range(len(sweep_window)):
-                c = sweep_window.iloc[i]
-                if float(c['high']) > pre_window_high:
-                    swept = True
-                    after = sweep_window.iloc[i:min(i+reclaim_max_bars+1, len(sweep_window))]
-                    if any(float(x['close']) < pre_window_high for _, x in after.iterrows()):
-                        reclaimed = True
-                    break
-        return swept and reclaimed
+            # First low that pierces the pre-window low, then any close back above it
+            level = float(l[pre_start:pre_end].min())
+            hits = np.flatnonzero(win_l < level)
+            if hits.size == 0:
+                return False
+            i = hits[0]
+            return bool((win_c[i:i+reclaim_max_bars+1] > level).any())
+        level = float(h[pre_start:pre_end].max())
+        hits = np.flatnonzero(win_h > level)
+        if hits.size == 0:
+            return False
+        i = hits[0]
+        return bool((win_c[i:i+reclaim_max_bars+1] < level).any())
     except Exception:
         return False
 
@@ -6512,18 +7625,20 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
     - Sizing: same fixed-risk model as S6 (RISK_USD / SL distance), min-notional enforced, leverage from actual risk.
     """
     try:
-        s9 = CONFIG.get('STRATEGY_9', {})
-        allowed = [s.strip().upper() for s in s9.get('SYMBOLS', []) if s.strip()]
+        s9 = CFG.s9
+        allowed = [s.strip().upper() for s in s9.symbols if s.strip()]
         if allowed and symbol not in allowed:
             _record_rejection(symbol, "S9-Restricted symbol", {"allowed": ",".join(allowed)})
             return
 
         # Fetch required TFs
-        df_h1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1h', 300)
-        df_h4 = await asyncio.to_thread(fetch_klines_sync, symbol, '4h', 400)
-        df_d  = await asyncio.to_thread(fetch_klines_sync, symbol, '1d', 400)
-        df_m5 = await asyncio.to_thread(fetch_klines_sync, symbol, '5m', 300)
-        df_m1 = await asyncio.to_thread(fetch_klines_sync, symbol, '1m', 600)
+        df_h1, df_h4, df_d, df_m5, df_m1 = await asyncio.gather(
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '1h', 300),
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '4h', 400),
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '1d', 400),
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '5m', 300),
+            asyncio.to_thread(fetch_htf_klines_sync, symbol, '1m', 600),
+        )
 
         if any(x is None or len(x) < 60 for x in [df_h1, df_h4, df_d, df_m5, df_m1]):
             _record_rejection(symbol, "S9-Insufficient TF data", {
@@ -6542,8 +7657,8 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             return
 
         # HTF bias from Daily, confirm H4 does not contradict
-        bias_d = _s6_trend_from_swings(df_d.copy(), swing_lookback=20)
-        bias_h4 = _s6_trend_from_swings(df_h4.copy(), swing_lookback=20)
+        bias_d = _s6_trend_from_swings(df_d, swing_lookback=20)
+        bias_h4 = _s6_trend_from_swings(df_h4, swing_lookback=20)
         if bias_d is None:
             _record_rejection(symbol, "S9-Daily bias unclear", {})
             return
@@ -6553,13 +7668,13 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
         direction = 'BUY' if bias_d == 'BULL' else 'SELL'
 
         # H1 BOS (12–48 bars)
-        bos_dir = _s9_recent_h1_bos(df_h1.copy(), int(s9.get('BOS_LOOKBACK_H1_MIN', 12)), int(s9.get('BOS_LOOKBACK_H1_MAX', 48)))
+        bos_dir = _s9_recent_h1_bos(df_h1, int(s9.bos_lookback_h1_min), int(s9.bos_lookback_h1_max))
         if bos_dir is None or bos_dir != direction:
             _record_rejection(symbol, "S9-No matching H1 BOS", {"bos": bos_dir, "dir": direction})
             return
 
         # H1 OB zone near BOS
-        ob_zone = _s9_h1_ob_zone(df_h1.copy(), direction)
+        ob_zone = _s9_h1_ob_zone(df_h1, direction)
         if not ob_zone:
             _record_rejection(symbol, "S9-No OB zone", {})
             return
@@ -6567,9 +7682,9 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
 
         # Micro sweep + reclaim on M1
         sweep_ok = _s9_detect_sweep_reclaim(
-            df_m1.copy(), direction,
-            int(s9.get('MICRO_SWEEP_LOOKBACK_M1', 20)),
-            int(s9.get('SWEEP_RECLAIM_MAX_BARS', 5))
+            df_m1, direction,
+            int(s9.micro_sweep_lookback_m1),
+            int(s9.sweep_reclaim_max_bars)
         )
         if not sweep_ok:
             _record_rejection(symbol, "S9-No micro sweep+reclaim", {})
@@ -6582,12 +7697,12 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             return
 
         wick_ratio = _s9_rejection_wick_ratio(sig, direction)
-        if wick_ratio < float(s9.get('REJECTION_WICK_RATIO', 0.7)):
+        if wick_ratio < float(s9.rejection_wick_ratio):
             _record_rejection(symbol, "S9-Rejection wick too small", {"ratio": wick_ratio})
             return
 
         # Confirm candle size vs avg M1 range
-        m1_len = int(s9.get('M1_RANGE_AVG_LEN', 20))
+        m1_len = int(s9.m1_range_avg_len)
         avg_m1_range = _s9_avg_range(df_m1['high'], df_m1['low'], m1_len)
         sig_range = float(sig['high'] - sig['low'])
         if not (sig_range >= 0.60 * avg_m1_range):
@@ -6595,8 +7710,8 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             return
 
         # ATR on M5 and max stop constraint
-        atr_p = int(s9.get('M5_ATR_PERIOD', 14))
-        atr_m5_series = atr_wilder(df_m5.copy(), atr_p)
+        atr_p = int(s9.m5_atr_period)
+        atr_m5_series = atr_wilder(df_m5, atr_p)
         atr_m5 = float(atr_m5_series.iloc[-2]) if atr_m5_series is not None and len(atr_m5_series) >= 2 else 0.0
         if atr_m5 <= 0:
             _record_rejection(symbol, "S9-M5 ATR invalid", {})
@@ -6607,11 +7722,11 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
         entry_price = float(sig['close'])
         if direction == 'BUY':
             zone_extreme = ob_low
-            stop_price = zone_extreme - float(s9.get('ATR_BUFFER_MULT_M5', 0.6)) * atr_m5
+            stop_price = zone_extreme - float(s9.atr_buffer_mult_m5) * atr_m5
             side = 'BUY'
         else:
             zone_extreme = ob_high
-            stop_price = zone_extreme + float(s9.get('ATR_BUFFER_MULT_M5', 0.6)) * atr_m5
+            stop_price = zone_extreme + float(s9.atr_buffer_mult_m5) * atr_m5
             side = 'SELL'
 
         distance = abs(entry_price - stop_price)
@@ -6619,14 +7734,14 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             _record_rejection(symbol, "S9-Invalid SL distance", {"entry": entry_price, "sl": stop_price})
             return
 
-        max_stop_ok = distance <= float(s9.get('MAX_STOP_TO_AVG_RANGE_M5', 1.5)) * avg_m5_range
+        max_stop_ok = distance <= float(s9.max_stop_to_avg_range_m5) * avg_m5_range
         if not max_stop_ok:
-            _record_rejection(symbol, "S9-Stop too wide vs M5 range", {"distance": distance, "max_allowed": float(s9.get('MAX_STOP_TO_AVG_RANGE_M5', 1.5)) * avg_m5_range})
+            _record_rejection(symbol, "S9-Stop too wide vs M5 range", {"distance": distance, "max_allowed": float(s9.max_stop_to_avg_range_m5) * avg_m5_range})
             return
 
         # Sizing: fixed-risk (S6 model) with min-notional enforcement
         balance = await asyncio.to_thread(get_account_balance_usdt)
-        risk_usd = float(s9.get('RISK_USD', 0.50))
+        risk_usd = float(s9.risk_usd)
         ideal_qty = risk_usd / distance
         ideal_qty = await asyncio.to_thread(round_qty, symbol, ideal_qty, rounding=ROUND_DOWN)
 
@@ -6657,7 +7772,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
         pending_order_id = f"{symbol}_{order_id}"
 
         candle_duration = timeframe_to_timedelta("1m")
-        expiry_candles = int(s9.get("LIMIT_EXPIRY_M1_CANDLES", 3))
+        expiry_candles = int(s9.limit_expiry_m1_candles)
         expiry_time = df_m1.index[-1] + (candle_duration * (expiry_candles - 1))
 
         pending_meta = {
@@ -6686,7 +7801,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             f"Leverage: `{leverage}x`\n"
             f"Target: `0.5R`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
         return
     except Exception as e:
@@ -6697,7 +7812,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             return
 
         # Sizing (use S6 model): fixed RISK_USD, min-notional enforcement, leverage by actual risk
-        risk_usd = float(s9.get('RISK_USD', CONFIG.get('STRATEGY_6', {}).get('RISK_USD', 0.5)))
+        risk_usd = float(s9.risk_usd)
         ideal_qty = risk_usd / distance
         ideal_qty = await asyncio.to_thread(round_qty, symbol, ideal_qty, rounding=ROUND_DOWN)
 
@@ -6717,7 +7832,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
         leverage = max(1, min(uncapped_leverage, max_leverage))
 
         # High win-rate TP: 0.5R
-        r_mult = float(s9.get('HIGH_WIN_TP_R_MULT', 0.5))
+        r_mult = float(s9.high_win_tp_r_mult)
         take_price = entry_price + r_mult * distance if side == 'BUY' else entry_price - r_mult * distance
 
         # Place limit order at rejection close
@@ -6727,7 +7842,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
 
         # Expiry: 3 M1 candles
         candle_duration = timedelta(minutes=1)
-        expiry_candles = int(s9.get("LIMIT_EXPIRY_M1_CANDLES", 3))
+        expiry_candles = int(s9.limit_expiry_m1_candles)
         expiry_time = df_m1.index[-1] + (candle_duration * (expiry_candles - 1))
 
         pending_meta = {
@@ -6755,7 +7870,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             f"Risk: `{actual_risk_usdt:.2f} USDT`\n"
             f"Leverage: `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
         return
     except Exception as e:
@@ -6788,7 +7903,7 @@ async def evaluate_strategy_9(symbol: str, df_m15: pd.DataFrame):
             f"Risk: `{actual_risk_usdt:.2f} USDT`\n"
             f"Leverage: `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, new_order_msg, parse_mode='Markdown')
+        enqueue_telegram(new_order_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"S9 evaluation error for {symbol}", e)
@@ -6804,13 +7919,13 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
     # Pre-trade check: is a trade already open for this symbol?
     async with managed_trades_lock:
         if not CONFIG["HEDGING_ENABLED"] and any(t['symbol'] == symbol for t in managed_trades.values()):
-            await asyncio.to_thread(send_telegram, f"❌ Cannot force trade. A trade for `{symbol}` already exists and hedging is disabled.", parse_mode='Markdown')
+            enqueue_telegram(f"❌ Cannot force trade. A trade for `{symbol}` already exists and hedging is disabled.", parse_mode='Markdown')
             return
 
     try:
         df = await asyncio.to_thread(fetch_klines_sync, symbol, CONFIG["TIMEFRAME"], 300)
         if df is None or df.empty:
-            await asyncio.to_thread(send_telegram, f"❌ Cannot force trade. Could not fetch kline data for `{symbol}`.", parse_mode='Markdown')
+            enqueue_telegram(f"❌ Cannot force trade. Could not fetch kline data for `{symbol}`.", parse_mode='Markdown')
             return
         current_price = safe_last(df['close'])
         
@@ -6822,10 +7937,10 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
         trade_meta_extra = {}
 
         if strategy_id == 1:
-            s_params = CONFIG['STRATEGY_1']
+            s_params = CFG.s1
             df['atr'] = atr(df, CONFIG["ATR_LENGTH"])
             atr_now = safe_last(df['atr'])
-            sl_distance = CONFIG["STRATEGY_EXIT_PARAMS"]['1']["ATR_MULTIPLIER"] * atr_now
+            sl_distance = EXIT_ATR_MULT[1] * atr_now
             sl_price = current_price - sl_distance if side == 'BUY' else current_price + sl_distance
             
             price_distance = abs(current_price - sl_price)
@@ -6835,8 +7950,8 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
             trade_meta_extra = {"atr_at_entry": atr_now}
 
         elif strategy_id == 2:
-            s_params = CONFIG['STRATEGY_2']
-            df['supertrend'], _ = supertrend(df, period=s_params['SUPERTREND_PERIOD'], multiplier=s_params['SUPERTREND_MULTIPLIER'])
+            s_params = CFG.s2
+            df['supertrend'], _ = supertrend(df, period=s_params.supertrend_period, multiplier=s_params.supertrend_multiplier)
             sl_price = safe_last(df['supertrend'])
             
             price_distance = abs(current_price - sl_price)
@@ -6847,12 +7962,12 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
             trade_meta_extra = {"atr_at_entry": safe_latest_atr_from_df(df)}
 
         elif strategy_id == 3:
-            s_params = CONFIG['STRATEGY_3']
+            s_params = CFG.s3
             df['atr'] = atr(df, CONFIG["ATR_LENGTH"])
             atr_now = safe_last(df['atr'])
             
-            atr_mult = s_params.get("ATR_SL_MULT", 1.5)
-            fallback_sl_pct = s_params.get("FALLBACK_SL_PCT", 0.015)
+            atr_mult = s_params.atr_sl_mult
+            fallback_sl_pct = s_params.fallback_sl_pct
             
             if atr_now > 0:
                 sl_price = current_price - atr_mult * atr_now if side == 'BUY' else current_price + atr_mult * atr_now
@@ -6871,10 +7986,10 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
             }
 
         elif strategy_id == 4:
-            s_params = CONFIG['STRATEGY_4']
+            s_params = CFG.s4
             
             # --- Correct logic: Calculate indicators and use the main SuperTrend for initial SL ---
-            df = calculate_all_indicators(df.copy()) # Get all indicators
+            df = calculate_all_indicators(df) # Get all indicators (returns a new frame)
             # For a forced entry, we should use the most recent available data for the SL.
             sl_price = safe_last(df['s4_st2'])
 
@@ -6886,7 +8001,7 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
                 log.warning(f"S4 Force Trade: Calculated SL {sl_price} is below current price {current_price}. Using 2% fallback SL.")
                 sl_price = current_price * 1.02
 
-            risk_usdt = s_params['RISK_USD']
+            risk_usdt = s_params.risk_usd
             price_distance = abs(current_price - sl_price)
             qty = risk_usdt / price_distance if price_distance > 0 else 0.0
 
@@ -6897,7 +8012,7 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
             }
         
         else:
-            await asyncio.to_thread(send_telegram, f"❌ Invalid strategy ID `{strategy_id}` for force trade.", parse_mode='Markdown')
+            enqueue_telegram(f"❌ Invalid strategy ID `{strategy_id}` for force trade.", parse_mode='Markdown')
             return
 
         # --- Common Sizing & Leverage Calculation ---
@@ -6913,7 +8028,7 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
         qty = max(ideal_qty, qty_min)
 
         if qty <= 0:
-            await asyncio.to_thread(send_telegram, f"❌ Calculated quantity for force trade is zero. Aborting.", parse_mode='Markdown')
+            enqueue_telegram(f"❌ Calculated quantity for force trade is zero. Aborting.", parse_mode='Markdown')
             return
             
         actual_risk_usdt = abs(current_price - sl_price) * qty
@@ -6986,24 +8101,23 @@ async def force_trade_entry(strategy_id: int, symbol: str, side: str):
             f"**Risk:** `{actual_risk_usdt:.2f} USDT`\n"
             f"**Leverage:** `{leverage}x`"
         )
-        await asyncio.to_thread(send_telegram, msg, parse_mode='Markdown')
+        enqueue_telegram(msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"Failed to execute force trade for S{strategy_id} on {symbol}", e)
 
 
-def calculate_trailing_distance(strategy_id: str, volatility_ratio: float, trend_strength: float) -> float:
+def calculate_trailing_distance(strategy_id: int, volatility_ratio: float, trend_strength: float) -> float:
     """Calculate dynamic trailing distance based on multiple factors."""
     # Ensure strategy_id is a valid key
-    strategy_id_str = str(strategy_id)
-    if strategy_id_str not in CONFIG['STRATEGY_EXIT_PARAMS']:
-        strategy_id_str = '1' # Default to BB strategy params if not found
+    if strategy_id not in CFG.exit_params:
+        strategy_id = 1 # Default to BB strategy params if not found
 
     # Base multiplier from config
-    base_multiplier = CONFIG['STRATEGY_EXIT_PARAMS'][strategy_id_str]["ATR_MULTIPLIER"]
+    base_multiplier = EXIT_ATR_MULT[strategy_id]
 
     # New adaptive logic for Strategy 2
-    if strategy_id_str == '2':
+    if strategy_id == 2:
         if volatility_ratio > 0.02:
             return 2.5
         if volatility_ratio < 0.008:
@@ -7047,7 +8161,7 @@ def monitor_thread_func():
             continue
         try:
             # Check for symbols that require manual attention
-            conn = sqlite3.connect(CONFIG["DB_FILE"])
+            conn = db_connect()
             cur = conn.cursor()
             cur.execute("SELECT * FROM attention_required")
             attention_needed = cur.fetchall()
@@ -7055,16 +8169,16 @@ def monitor_thread_func():
 
             for row in attention_needed:
                 symbol, reason, details, ts = row
-                now = datetime.utcnow()
+                now = time.monotonic()
                 last_alert = last_attention_alert_time.get(symbol)
                 # Alert every 5 minutes
-                if last_alert is None or (now - last_alert).total_seconds() > 300:
+                if last_alert is None or now - last_alert > 300:
                     send_telegram(f"🚨 ATTENTION REQUIRED on {symbol} 🚨\nReason: {reason}\nDetails: {details}\nTimestamp: {ts}", parse_mode='Markdown')
                     last_attention_alert_time[symbol] = now
         except Exception as e:
             log.exception(f"Failed to check for attention_required symbols: {e}")
 
-        loop_start_time = time.time()
+        loop_start_time = time.monotonic()
         log.info("Monitor thread loop started.")
         try:
             if client is None:
@@ -7138,7 +8252,7 @@ def monitor_thread_func():
                                 managed_trades[trade_id] = meta
 
                             # --- Set post-trade cooldown ---
-                            symbol_trade_cooldown[p_meta['symbol']] = datetime.now(timezone.utc) + timedelta(minutes=16)
+                            symbol_trade_cooldown[p_meta['symbol']] = time.time() + 16 * 60
                             log.info(f"Set 16-minute post-trade cooldown for {p_meta['symbol']} after limit order fill.")
                             
                             # Use a simplified record_trade call, as many fields are for the new management style
@@ -7212,7 +8326,7 @@ def monitor_thread_func():
                     with pending_limit_orders_lock:
                         for p_id in to_remove_pending:
                             pending_limit_orders.pop(p_id, None)
-                            remove_pending_order_from_db(p_id)
+                        remove_pending_orders_from_db(to_remove_pending)
 
             positions = []
             try:
@@ -7288,10 +8402,14 @@ def monitor_thread_func():
             # --- Pre-fetch kline data for all active symbols to reduce API calls ---
             active_symbols = {meta['symbol'] for meta in trades_snapshot.values()}
             kline_data_cache = {}
-            for sym_key in active_symbols:
+            # Fetch enough data for S4 DEMA(200) calculation, all symbols concurrently
+            kline_futures = {
+                sym_key: monitor_fetch_pool.submit(fetch_klines_sync, sym_key, CONFIG["TIMEFRAME"], 250)
+                for sym_key in active_symbols
+            }
+            for sym_key, fut in kline_futures.items():
                 try:
-                    # Fetch enough data for S4 DEMA(200) calculation
-                    kline_data_cache[sym_key] = fetch_klines_sync(sym_key, CONFIG["TIMEFRAME"], 250)
+                    kline_data_cache[sym_key] = fut.result()
                 except Exception as e:
                     log.error(f"Failed to pre-fetch klines for {sym_key} in monitor loop: {e}")
                     kline_data_cache[sym_key] = None
@@ -7368,7 +8486,7 @@ def monitor_thread_func():
                     # --- Post-Loss Cooldown Logic ---
                     if unreal_pnl_for_trade < 0:
                         cooldown_end_time = close_time + timedelta(hours=CONFIG['LOSS_COOLDOWN_HOURS'])
-                        symbol_loss_cooldown[sym] = cooldown_end_time
+                        symbol_loss_cooldown[sym] = cooldown_end_time.timestamp()
                         log.info(f"Symbol {sym} has been placed on a {CONFIG['LOSS_COOLDOWN_HOURS']}h cooldown (until {cooldown_end_time}). PnL: {unreal_pnl_for_trade:.4f}.")
                         send_telegram(f"🧊 {sym} is on a {CONFIG['LOSS_COOLDOWN_HOURS']}h cooldown after a loss.")
 
@@ -7381,8 +8499,7 @@ def monitor_thread_func():
                         'close_time': meta['close_time'],
                         'exit_reason': exit_reason
                     })
-                    record_trade(trade_record)
-                    remove_managed_trade_from_db(tid)
+                    archive_trades_db([trade_record])
                     with managed_trades_lock:
                         last_trade_close_time[sym] = close_time
                     
@@ -7404,13 +8521,13 @@ def monitor_thread_func():
 
                 # --- New In-Trade Management Logic ---
                 try:
-                    strategy_id = str(meta.get('strategy_id', 1))
-                    exit_params = CONFIG['STRATEGY_EXIT_PARAMS'].get(strategy_id, CONFIG['STRATEGY_EXIT_PARAMS']['1'])
+                    strategy_id = int(meta.get('strategy_id') or 1)
+                    exit_idx = _exit_index(strategy_id)
                     current_price = df_monitor['close'].iloc[-1]
                     entry_price = meta['entry_price']
                     side = meta['side']
 
-                    if strategy_id == '2':
+                    if strategy_id == 2:
                         # --- SuperTrend Strategy Exit Logic (Multi-Stage TP) ---
                         trade_phase = meta.get('trade_phase', 0)
                         initial_qty = meta['initial_qty']
@@ -7475,10 +8592,10 @@ def monitor_thread_func():
                                 continue
                         continue # End of S2 logic
                     
-                    elif strategy_id == '3':
+                    elif strategy_id == 3:
                         # --- Strategy 3: Simple ATR Trailing Stop ---
-                        s3_params = CONFIG['STRATEGY_3']
-                        if not meta.get('trailing', True) or not s3_params.get('TRAILING_ENABLED', True):
+                        s3_params = CFG.s3
+                        if not meta.get('trailing', True) or not s3_params.trailing_enabled:
                             continue # Skip if trailing is disabled for the trade or globally for S3
 
                         is_trailing_active = meta.get('s3_trailing_active', False)
@@ -7486,7 +8603,7 @@ def monitor_thread_func():
                         # Activate trailing if profit target is hit
                         if not is_trailing_active:
                             profit_pct = (current_price / entry_price - 1) if side == 'BUY' else (1 - current_price / entry_price)
-                            if profit_pct >= s3_params['TRAILING_ACTIVATION_PROFIT_PCT']:
+                            if profit_pct >= s3_params.trailing_activation_profit_pct:
                                 log.info(f"S3: Activating trailing stop for {tid} at {profit_pct:.2f}% profit.")
                                 is_trailing_active = True
                                 with managed_trades_lock:
@@ -7497,11 +8614,11 @@ def monitor_thread_func():
                         # If trailing is active, calculate and update the SL
                         if is_trailing_active:
                             # Calculate ATR for trailing
-                            df_monitor['atr_trail'] = atr(df_monitor, length=s3_params['TRAILING_ATR_PERIOD'])
+                            df_monitor['atr_trail'] = atr(df_monitor, length=s3_params.trailing_atr_period)
                             atr_now = safe_last(df_monitor['atr_trail'])
                             
                             if atr_now > 0:
-                                trail_dist = s3_params['TRAILING_ATR_MULTIPLIER'] * atr_now
+                                trail_dist = s3_params.trailing_atr_multiplier * atr_now
                                 current_sl = meta.get('s3_trailing_stop', meta['sl'])
                                 new_sl = None
 
@@ -7527,22 +8644,22 @@ def monitor_thread_func():
                                     # send_telegram(f"📈 S3 Trailing SL updated for {tid} ({sym}) to `{new_sl:.4f}`", parse_mode='Markdown')
                         continue # End of S3 logic
                     
-                    elif strategy_id == '4':
+                    elif strategy_id == 4:
                         # --- 3x SuperTrend (S4) In-Trade Management ---
-                        df_with_indicators = calculate_all_indicators(df_monitor.copy())
+                        df_with_indicators = calculate_all_indicators(df_monitor)
                         if df_with_indicators is None or len(df_with_indicators) < 3:
                             log.warning(f"S4 Monitor: Not enough data for {sym} to manage trade, skipping.")
                             continue
                         
                         # --- Panic Exit Logic (Intra-candle) ---
-                        s4_params = CONFIG['STRATEGY_4']
+                        s4_params = CFG.s4
                         forming_candle = df_with_indicators.iloc[-1]
                         
                         # Check if forming_candle has valid data for panic check
                         panic_check_cols = ['high', 'low', 'atr', 'close', 's4_st1', 's4_st2', 's4_st3']
                         if all(col in forming_candle and pd.notna(forming_candle[col]) for col in panic_check_cols):
                             candle_size = forming_candle['high'] - forming_candle['low']
-                            atr_threshold = forming_candle['atr'] * s4_params['VOLATILITY_EXIT_ATR_MULT']
+                            atr_threshold = forming_candle['atr'] * s4_params.volatility_exit_atr_mult
                             
                             price_cross_st = False
                             current_price = forming_candle['close']
@@ -7643,9 +8760,9 @@ def monitor_thread_func():
                                     # send_telegram(f"📈 S4 Trailing SL updated for {tid} ({sym}) to `{new_sl:.4f}`", parse_mode='Markdown')
                         continue
 
-                    elif strategy_id == '5':
+                    elif strategy_id == 5:
                         # --- Strategy 5: In-Trade Manager ---
-                        s5 = CONFIG['STRATEGY_5']
+                        s5 = CFG.s5
                         entry_price = meta['entry_price']
                         current_price = float(df_monitor['close'].iloc[-1])
                         r_dist = float(meta.get('s5_r_per_unit') or abs(entry_price - meta.get('s5_initial_sl', entry_price)))
@@ -7659,7 +8776,7 @@ def monitor_thread_func():
                             if (side == 'BUY' and current_price >= half_r_price) or (side == 'SELL' and current_price <= half_r_price):
                                 try:
                                     cancel_trade_sltp_orders_sync(meta)
-                                    be_buffer_pct = s5.get('BE_BUFFER_PCT', 0.0005)
+                                    be_buffer_pct = s5.be_buffer_pct
                                     if side == 'BUY':
                                         new_sl = entry_price * (1 + be_buffer_pct)
                                     else: # SELL
@@ -7688,7 +8805,7 @@ def monitor_thread_func():
                                 (side == 'SELL' and current_price <= tp1_price)
                             ):
                                 try:
-                                    qty_to_close = round_qty(sym, meta['initial_qty'] * s5.get('TP1_CLOSE_PCT', 0.3))
+                                    qty_to_close = round_qty(sym, meta['initial_qty'] * s5.tp1_close_pct)
                                     if qty_to_close > 0:
                                         close_partial_market_position_sync(sym, side, qty_to_close)
                                         # reduce qty and move SL to BE if not already
@@ -7709,7 +8826,7 @@ def monitor_thread_func():
                                                     'trailing_active': True  # Activate trailing after TP1
                                                 })
                                                 add_managed_trade_to_db(managed_trades[tid])
-                                        send_telegram(f"✅ S5 TP1 hit for {sym}. Closed {s5.get('TP1_CLOSE_PCT',0.3)*100:.0f}%, SL to BE, trailing activated.")
+                                        send_telegram(f"✅ S5 TP1 hit for {sym}. Closed {s5.tp1_close_pct*100:.0f}%, SL to BE, trailing activated.")
                                         continue
                                 except Exception as e:
                                     log_and_send_error(f"Failed S5 TP1 management for {tid}", e)
@@ -7718,12 +8835,12 @@ def monitor_thread_func():
                         if meta.get('trailing_active', False) and meta.get('trailing', True) and meta.get('qty', 0) > 0:
                             try:
                                 # Compute ATR on monitor data
-                                atr_series = atr(df_monitor, s5.get('ATR_PERIOD', 14))
+                                atr_series = atr(df_monitor, s5.atr_period)
                                 atr_now = safe_last(atr_series, default=0.0)
                                 if atr_now <= 0:
                                     continue
-                                buffer = s5.get('TRAIL_BUFFER_MULT', 0.25) * atr_now
-                                atr_trail_component = s5.get('TRAIL_ATR_MULT', 1.0) * atr_now
+                                buffer = s5.trail_buffer_mult * atr_now
+                                atr_trail_component = s5.trail_atr_mult * atr_now
 
                                 # Pivot: recent swing low/high
                                 pivot_lookback = 5
@@ -7764,10 +8881,11 @@ def monitor_thread_func():
                     # Break-Even Trigger (Only for S1, or S2 if it hasn't hit TP1 yet)
                     if not meta.get('be_moved'):
                         profit_pct = (current_price / entry_price - 1) if side == 'BUY' else (1 - current_price / entry_price)
-                        if profit_pct >= exit_params['BE_TRIGGER']:
+                        if profit_pct >= EXIT_BE_TRIGGER[exit_idx]:
                             log.info(f"Trade {tid} (S{strategy_id}) hit BE trigger. Moving SL.")
                             cancel_trade_sltp_orders_sync(meta)
-                            new_sl_price = entry_price * (1 + exit_params['BE_SL_OFFSET'] if side == 'BUY' else 1 - exit_params['BE_SL_OFFSET'])
+                            be_offset = EXIT_BE_SL_OFFSET[exit_idx]
+                            new_sl_price = entry_price * (1 + be_offset if side == 'BUY' else 1 - be_offset)
                             new_orders = place_batch_sl_tp_sync(sym, side, sl_price=new_sl_price, qty=meta['qty'])
                             trade_to_update_in_db = None
                             with managed_trades_lock:
@@ -7787,7 +8905,7 @@ def monitor_thread_func():
                         adx(df_monitor, period=CONFIG['ADX_PERIOD'])
                         trend_strength = safe_last(df_monitor.get('adx'), default=0)
                         
-                        if strategy_id == '2':
+                        if strategy_id == 2:
                             atr_multiplier = 2.5
                         else:
                             atr_multiplier = calculate_trailing_distance(strategy_id, volatility_ratio, trend_strength)
@@ -7833,7 +8951,7 @@ def monitor_thread_func():
                     log.info(f"State after removal: {len(managed_trades)} trades. Keys: {list(managed_trades.keys())}")
 
             # --- Overload Monitoring ---
-            loop_end_time = time.time()
+            loop_end_time = time.monotonic()
             duration = loop_end_time - loop_start_time
             if duration > CONFIG["MONITOR_LOOP_THRESHOLD_SEC"]:
                 if not overload_notified:
@@ -7891,10 +9009,14 @@ def daily_pnl_monitor_thread_func():
                     log.info("Cleared last_trade_close_time for all symbols.")
 
             # PnL Check Logic
-            conn = sqlite3.connect(CONFIG["DB_FILE"])
+            conn = db_connect()
             cur = conn.cursor()
-            today_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-            cur.execute("SELECT SUM(pnl) FROM trades WHERE DATE(close_time) = ?", (today_str,))
+            today = datetime.now(timezone.utc).date()
+            # Sargable range on the ISO close_time text so idx_trades_close_time is used
+            cur.execute(
+                "SELECT SUM(pnl) FROM trades WHERE close_time >= ? AND close_time < ?",
+                (today.isoformat(), (today + timedelta(days=1)).isoformat()),
+            )
             result = cur.fetchone()[0]
             conn.close()
             daily_pnl = result if result is not None else 0.0
@@ -8017,7 +9139,7 @@ def performance_alerter_thread_func():
     while not monitor_stop_event.is_set():
         try:
             now = datetime.now(timezone.utc)
-            conn = sqlite3.connect(CONFIG["DB_FILE"])
+            conn = db_connect()
             
             # 1. Check Trades per Day (last 24 hours)
             one_day_ago = (now - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
@@ -8104,14 +9226,14 @@ async def manage_session_freeze_state():
                 log.info("Resetting user override because a new session freeze has started.")
                 session_freeze_override = False
             
-            await asyncio.to_thread(send_telegram, f"⚠️ Session Change: {session_name}\\nThe bot is now frozen for this session. Use /unfreeze to override.")
+            enqueue_telegram(f"⚠️ Session Change: {session_name}\\nThe bot is now frozen for this session. Use /unfreeze to override.")
             session_freeze_active = True
             notified_frozen_session = session_name
     
     else:  # Not in a natural freeze window
         if session_freeze_active:  # A natural freeze period has just ended
             log.info("Exiting session freeze period.")
-            await asyncio.to_thread(send_telegram, f"✅ Session freeze for {notified_frozen_session} has ended. The bot is now active again.")
+            enqueue_telegram(f"✅ Session freeze for {notified_frozen_session} has ended. The bot is now active again.")
             session_freeze_active = False
             notified_frozen_session = None
             # Also reset the override flag when a session naturally ends, so it doesn't carry over.
@@ -8126,7 +9248,7 @@ async def run_scan_cycle():
     Runs a single concurrent scan of all symbols, limited by a semaphore
     to prevent overwhelming the thread pool.
     """
-    global scan_cycle_count
+    global scan_cycle_count, cycle_cache
     sem = asyncio.Semaphore(4)
 
     if await manage_session_freeze_state():
@@ -8139,6 +9261,7 @@ async def run_scan_cycle():
             # to ensure the semaphore is held for the duration of the evaluation.
             return await evaluate_and_enter(symbol)
 
+    cycle_cache = CycleCache()
     log.info("Starting concurrent symbol scan (concurrency limit: 4)...")
     symbols = [s.strip().upper() for s in CONFIG["SYMBOLS"] if s.strip()]
     tasks = [throttled_eval(s) for s in symbols]
@@ -8150,10 +9273,14 @@ async def run_scan_cycle():
             log.exception(f"Error evaluating symbol {symbol} during concurrent scan: {result}")
     
     scan_cycle_count += 1
-    
-    # --- NEW: Clear indicator cache to free memory ---
-    log.info("Clearing indicator cache to conserve memory.")
-    indicator_cache.clear()
+    cycle_cache = None
+
+    # Keep incremental indicator state for the next cycle; only drop symbols we no longer scan.
+    prune_indicator_cache(symbols)
+    # The monitor still fetches klines for open trades, so keep those alongside the watchlist.
+    async with managed_trades_lock:
+        open_trade_symbols = {t['symbol'] for t in managed_trades.values()}
+    prune_kline_store(open_trade_symbols.union(symbols))
 
 
 async def scanning_loop():
@@ -8228,7 +9355,7 @@ async def scanning_loop():
 
 def _generate_pnl_report_sync(query: str, params: tuple, title: str) -> tuple[str, Optional[bytes]]:
     """A helper function to generate a PnL report from a given SQL query."""
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
+    conn = db_connect()
     try:
         df = pd.read_sql_query(query, conn, params=params)
     finally:
@@ -8275,21 +9402,11 @@ def _generate_pnl_report_sync(query: str, params: tuple, title: str) -> tuple[st
 
     # --- Generate PnL Chart ---
     df['close_time'] = pd.to_datetime(df['close_time'])
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(df['close_time'], df['cumulative_pnl'], marker='o', linestyle='-')
-    
-    ax.set_title(f'Cumulative PnL: {title.splitlines()[0]}')
-    ax.set_xlabel('Date')
-    ax.set_ylabel('Cumulative PnL (USDT)')
-    ax.grid(True)
-    fig.autofmt_xdate()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight')
-    plt.close(fig)
-    buf.seek(0)
-    
-    return (report_text, buf.getvalue())
+    chart_bytes = render_chart(
+        charts.render_pnl_chart, df['close_time'], df['cumulative_pnl'], title.splitlines()[0]
+    )
+
+    return (report_text, chart_bytes)
 
 
 def _generate_strategy_report_sync() -> str:
@@ -8297,7 +9414,7 @@ def _generate_strategy_report_sync() -> str:
     Generates a comparative performance report for each strategy, including
     advanced metrics like trades per day, confidence/volatility analysis.
     """
-    conn = sqlite3.connect(CONFIG["DB_FILE"])
+    conn = db_connect()
     try:
         # Fetch all necessary columns
         query = "SELECT strategy_id, pnl, risk_usdt, signal_confidence, open_time, entry_price, atr_at_entry FROM trades WHERE strategy_id IS NOT NULL AND pnl IS NOT NULL"
@@ -8405,7 +9522,7 @@ async def generate_and_send_monthly_report(year: int, month: int):
         )
     except Exception as e:
         log.exception(f"Error generating monthly report for {year}-{month:02d}")
-        await asyncio.to_thread(send_telegram, f"An error occurred while generating the monthly report: {e}")
+        enqueue_telegram(f"An error occurred while generating the monthly report: {e}")
 
 
 async def generate_and_send_strategy_report():
@@ -8421,7 +9538,24 @@ async def generate_and_send_strategy_report():
         )
     except Exception as e:
         log.exception("Error generating strategy report")
-        await asyncio.to_thread(send_telegram, f"An error occurred while generating the strategy report: {e}")
+        enqueue_telegram(f"An error occurred while generating the strategy report: {e}")
+
+
+SYSTEM_USAGE_TTL_SEC = 30.0
+_system_usage_cache = {"t": -math.inf, "data": None}
+psutil.cpu_percent(interval=None)  # prime the counter so the first non-blocking read is meaningful
+
+
+def get_system_usage() -> dict:
+    """
+    CPU % since the previous sample plus get_memory_info(), re-read from /proc at most
+    once per SYSTEM_USAGE_TTL_SEC. Non-blocking, unlike cpu_percent(interval=1).
+    """
+    now = time.monotonic()
+    if now - _system_usage_cache["t"] >= SYSTEM_USAGE_TTL_SEC:
+        _system_usage_cache["data"] = {"cpu": psutil.cpu_percent(interval=None), **get_memory_info()}
+        _system_usage_cache["t"] = now
+    return _system_usage_cache["data"]
 
 
 def get_memory_info() -> dict:
@@ -8487,7 +9621,7 @@ async def generate_and_send_report():
         )
     except Exception as e:
         log.exception("Error generating report")
-        await asyncio.to_thread(send_telegram, f"An error occurred while generating the report: {e}")
+        enqueue_telegram(f"An error occurred while generating the report: {e}")
 
 def generate_adv_chart_sync(symbol: str):
     try:
@@ -8496,13 +9630,13 @@ def generate_adv_chart_sync(symbol: str):
             return "Could not fetch k-line data for " + symbol, None
 
         df['sma'] = sma(df['close'], CONFIG["SMA_LEN"])
-        df['bbu'], df['bbl'] = bollinger_bands(df['close'], CONFIG["BB_LENGTH_CUSTOM"], CONFIG["BB_STD_CUSTOM"])
+        df['bbu'], df['bbl'] = bollinger_bands(df['close'], CFG.s1.bb_length, CFG.s1.bb_std)
 
-        conn = sqlite3.connect(CONFIG["DB_FILE"])
+        conn = db_connect()
         trades_df = pd.read_sql_query(f"SELECT * FROM trades WHERE symbol = '{symbol}' AND close_time IS NOT NULL", conn)
         conn.close()
 
-        addplots = []
+        plot_buy_entries = plot_sell_entries = plot_exits = None
         if not trades_df.empty:
             trades_df['open_time'] = pd.to_datetime(trades_df['open_time'])
             trades_df['close_time'] = pd.to_datetime(trades_df['close_time'])
@@ -8520,33 +9654,10 @@ def generate_adv_chart_sync(symbol: str):
             plot_sell_entries.loc[sell_entries] = df['high'].loc[sell_entries] * 1.02
             plot_exits.loc[exits] = df['close'].loc[exits]
 
-            addplots.append(mpf.make_addplot(plot_buy_entries, type='scatter', marker='^', color='g', markersize=100))
-            addplots.append(mpf.make_addplot(plot_sell_entries, type='scatter', marker='v', color='r', markersize=100))
-            addplots.append(mpf.make_addplot(plot_exits, type='scatter', marker='x', color='blue', markersize=100))
-
-        sma_plot = mpf.make_addplot(df['sma'], color='purple', width=0.7)
-        bb_plots = mpf.make_addplot(df[['bbu', 'bbl']], color=['blue', 'blue'], width=0.5, linestyle='--')
-        addplots.insert(0, bb_plots)
-        addplots.insert(0, sma_plot)
-        
-        fig, axes = mpf.plot(
-            df,
-            type='candle',
-            style='yahoo',
-            title=f'{symbol} Chart with SMA/BB and Trades',
-            ylabel='Price (USDT)',
-            addplot=addplots,
-            returnfig=True,
-            figsize=(15, 8),
-            volume=True,
-            panel_ratios=(3, 1)
+        chart_bytes = render_chart(
+            charts.render_candle_chart, df, plot_buy_entries, plot_sell_entries, plot_exits, symbol
         )
-        
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        
-        return f"Chart for {symbol}", buf.getvalue()
+        return f"Chart for {symbol}", chart_bytes
 
     except Exception as e:
         log.exception(f"Failed to generate advanced chart for {symbol}")
@@ -8568,7 +9679,7 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
     """
     Runs a simulation of the bot's strategies over a historical period.
     """
-    await asyncio.to_thread(send_telegram, f"🚀 Starting simulation for strategy `{strategy_to_run}` on `{symbol}` over the last `{days}` day(s)...", parse_mode='Markdown')
+    enqueue_telegram(f"🚀 Starting simulation for strategy `{strategy_to_run}` on `{symbol}` over the last `{days}` day(s)...", parse_mode='Markdown')
     
     original_strat_mode = CONFIG["STRATEGY_MODE"]
     try:
@@ -8581,7 +9692,7 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
         timeframe = CONFIG["TIMEFRAME"]
         tf_delta = timeframe_to_timedelta(timeframe)
         if not tf_delta:
-            await asyncio.to_thread(send_telegram, f"❌ Invalid timeframe for simulation: {timeframe}")
+            enqueue_telegram(f"❌ Invalid timeframe for simulation: {timeframe}")
             return
             
         candles_per_day = int(timedelta(days=1).total_seconds() / tf_delta.total_seconds())
@@ -8591,35 +9702,43 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
         lookback_period = 250 
         total_candles_to_fetch = num_candles_to_simulate + lookback_period
         
-        await asyncio.to_thread(send_telegram, f"Fetching {total_candles_to_fetch} candles of `{timeframe}` data for `{symbol}`...", parse_mode='Markdown')
+        enqueue_telegram(f"Fetching {total_candles_to_fetch} candles of `{timeframe}` data for `{symbol}`...", parse_mode='Markdown')
         
         df_full = await asyncio.to_thread(fetch_klines_sync, symbol, timeframe, total_candles_to_fetch)
         
         if df_full is None or len(df_full) < total_candles_to_fetch:
-            await asyncio.to_thread(send_telegram, "❌ Not enough historical data available to run the full simulation.")
+            enqueue_telegram("❌ Not enough historical data available to run the full simulation.")
             return
 
         simulated_open_trades = []
         signal_count = 0
+
+        # Every indicator here is causal, so one pass over the full history gives each bar
+        # the same values a per-bar recompute would; the loop just slices a prefix of it.
+        df_ind_full = await asyncio.to_thread(calculate_all_indicators, df_full)
+        # Trade management only needs the current bar's high/low/ATR, so read those as arrays
+        highs = df_ind_full['high'].to_numpy(dtype=np.float64)
+        lows = df_ind_full['low'].to_numpy(dtype=np.float64)
+        atrs = df_ind_full['atr'].to_numpy(dtype=np.float64) if 'atr' in df_ind_full else None
+        close_ns = df_ind_full.index.as_unit('ns').asi8
         
         # Main simulation loop
         for i in range(lookback_period, len(df_full)):
-            df_slice = df_full.iloc[:i]
-            
-            # It's more efficient to calculate all indicators once
-            df_with_indicators = calculate_all_indicators(df_slice.copy())
+            df_with_indicators = df_ind_full.iloc[:i]
+            bar = i - 1  # last bar of the slice
 
             # --- Manage existing simulated trades ---
             active_trades_copy = list(simulated_open_trades) # Iterate over a copy
+            atr_now = float(atrs[bar]) if atrs is not None and np.isfinite(atrs[bar]) else 0.0
             for trade in active_trades_copy:
-                result = manage_simulated_trade(trade, df_with_indicators)
+                result = manage_simulated_trade(trade, highs[bar], lows[bar], atr_now)
                 if result:
                     event, price = result
-                    timestamp_dt = df_with_indicators.index[-1].to_pydatetime()
                     
                     if event in ["SL_HIT", "TP_HIT"]:
                         pnl = (price - trade['entry_price']) * (1 if trade['side'] == 'BUY' else -1)
-                        duration = timestamp_dt - trade['entry_time']
+                        # int64 ns arithmetic; only the final duration becomes a timedelta
+                        duration = timedelta(microseconds=(close_ns[bar] - trade['entry_ns']) // 1000)
                         
                         msg = (
                             f"💥 *SIM: Trade Closed* 💥\n\n"
@@ -8629,7 +9748,7 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
                             f"**PnL:** `{pnl:.4f}` (approx.)\n"
                             f"**Duration:** `{format_timedelta(duration)}`"
                         )
-                        await asyncio.to_thread(send_telegram, msg, parse_mode='Markdown')
+                        enqueue_telegram(msg, parse_mode='Markdown')
                         simulated_open_trades.remove(trade)
 
                     elif event == "SL_MOVED":
@@ -8638,7 +9757,7 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
                             f"**Strategy:** `{trade['strategy']}`\n"
                             f"**New SL:** `{price:.4f}`"
                         )
-                        await asyncio.to_thread(send_telegram, msg, parse_mode='Markdown')
+                        enqueue_telegram(msg, parse_mode='Markdown')
 
             # --- Check for new signals ---
             # Avoid opening a new trade if one is already open for this symbol
@@ -8666,6 +9785,7 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
                             "sl": signal['sl_price'],
                             "tp": signal['tp_price'],
                             "entry_time": timestamp_dt,
+                            "entry_ns": pd.Timestamp(timestamp_dt).value,
                             "strategy": signal['strategy']
                         }
                         simulated_open_trades.append(simulated_trade)
@@ -8680,12 +9800,12 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
                             f"**SL:** `{signal['sl_price']:.4f}`\n"
                             f"**TP:** `{signal['tp_price']:.4f}`"
                         )
-                        await asyncio.to_thread(send_telegram, msg, parse_mode='Markdown')
+                        enqueue_telegram(msg, parse_mode='Markdown')
                         # Since we opened a trade, we don't check for other signals on this candle
                         break
 
         summary_msg = f"✅ Simulation for `{symbol}` complete. Found `{signal_count}` total signal(s)."
-        await asyncio.to_thread(send_telegram, summary_msg, parse_mode='Markdown')
+        enqueue_telegram(summary_msg, parse_mode='Markdown')
 
     except Exception as e:
         await asyncio.to_thread(log_and_send_error, f"An error occurred during simulation for {symbol}", e)
@@ -8694,18 +9814,15 @@ async def run_simulation(strategy_to_run: str, symbol: str, days: int):
         CONFIG["STRATEGY_MODE"] = original_strat_mode
 
 
-def manage_simulated_trade(trade: Dict[str, Any], df_slice: pd.DataFrame) -> Optional[tuple[str, float]]:
+def manage_simulated_trade(trade: Dict[str, Any], candle_high: float, candle_low: float, atr_now: float) -> Optional[tuple[str, float]]:
     """
-    Manages a single simulated trade for one candle tick.
-    Checks for SL/TP hits and updates trailing stops.
+    Manages a single simulated trade for one candle tick, given that candle's high, low and
+    ATR (0 when not available). Checks for SL/TP hits and updates trailing stops.
     Returns a tuple of (event_type, price) if an event occurs, otherwise None.
     """
-    current_candle = df_slice.iloc[-1]
     side = trade['side']
     sl_price = trade['sl']
     tp_price = trade['tp']
-    candle_low = current_candle['low']
-    candle_high = current_candle['high']
 
     # Check for Stop Loss
     if side == 'BUY' and candle_low <= sl_price:
@@ -8722,12 +9839,11 @@ def manage_simulated_trade(trade: Dict[str, Any], df_slice: pd.DataFrame) -> Opt
 
     # Trailing Stop Logic (adapted from monitor_thread_func)
     strategy_id = trade.get('strategy', '1') # Default to S1 for safety
-    exit_params = CONFIG['STRATEGY_EXIT_PARAMS'].get(strategy_id, CONFIG['STRATEGY_EXIT_PARAMS']['1'])
+    exit_idx = _exit_index(strategy_id)
     
     # Simple trailing for now, can be enhanced with BE logic later
-    atr_now = safe_last(df_slice.get('atr'), default=0)
     if atr_now > 0:
-        atr_multiplier = exit_params.get("ATR_MULTIPLIER", 1.5)
+        atr_multiplier = EXIT_ATR_MULT[exit_idx]
         new_sl = None
         
         if side == 'BUY':
@@ -8772,7 +9888,7 @@ def handle_callback_query_sync(update, loop):
         async def _task():
             trades = await get_managed_trades_snapshot()
             if trade_id not in trades:
-                await asyncio.to_thread(send_telegram, f"Trade {trade_id} not found or already closed.")
+                enqueue_telegram(f"Trade {trade_id} not found or already closed.")
                 return
 
             trade = trades[trade_id]
@@ -8784,7 +9900,7 @@ def handle_callback_query_sync(update, loop):
             qty_to_close = await asyncio.to_thread(round_qty, symbol, qty_to_close)
 
             if qty_to_close <= 0:
-                await asyncio.to_thread(send_telegram, f"Calculated quantity to close for {trade_id} is zero. No action taken.")
+                enqueue_telegram(f"Calculated quantity to close for {trade_id} is zero. No action taken.")
                 return
 
             try:
@@ -8802,7 +9918,7 @@ def handle_callback_query_sync(update, loop):
                 await asyncio.to_thread(query.edit_message_text, text=f"{query.message.text}\n\nAction: {msg}")
             except Exception as e:
                 log.exception(f"Failed to execute action for callback {data}")
-                await asyncio.to_thread(send_telegram, f"❌ Error processing action for {trade_id}: {e}")
+                enqueue_telegram(f"❌ Error processing action for {trade_id}: {e}")
 
         asyncio.run_coroutine_threadsafe(_task(), loop)
 
@@ -8835,12 +9951,15 @@ async def run_test_order(strategy_id: int, symbol: str, full_test: bool):
             await evaluate_strategy_4(symbol, df, **test_params)
         else:
             # This case should ideally not be hit due to checks in the command handler
-            await asyncio.to_thread(send_telegram, f"Invalid strategy ID {strategy_id} for test order.")
+            enqueue_telegram(f"Invalid strategy ID {strategy_id} for test order.")
             return
 
     except Exception as e:
         log.exception(f"Error during run_test_order for S{strategy_id} on {symbol}")
-        await asyncio.to_thread(send_telegram, f"❌ An error occurred during the test: {e}")
+        enqueue_telegram(f"❌ An error occurred during the test: {e}")
+
+# "KEY = value" messages edit CONFIG directly
+_PARAM_ASSIGN_RE = re.compile(r'^\s*([A-Z_]+)\s*=\s*(.+)$', re.IGNORECASE)
 
 def handle_update_sync(update, loop):
     try:
@@ -8854,7 +9973,7 @@ def handle_update_sync(update, loop):
             text = (msg.text or "").strip()
 
             # --- Automatic Parameter Editing ---
-            param_match = re.match(r'^\s*([A-Z_]+)\s*=\s*(.+)$', text, re.IGNORECASE)
+            param_match = _PARAM_ASSIGN_RE.match(text)
             if param_match:
                 key, val_str = param_match.groups()
                 key = key.upper()
@@ -9206,9 +10325,9 @@ def handle_update_sync(update, loop):
                                 await asyncio.to_thread(add_managed_trade_to_db, trade_to_update)
                                 status_msg = "ENABLED" if new_trailing_state else "DISABLED"
                                 msg = f"✅ Trailing stop for trade `{trade_id}` has been manually {status_msg}."
-                                await asyncio.to_thread(send_telegram, msg, parse_mode='Markdown')
+                                enqueue_telegram(msg, parse_mode='Markdown')
                             else:
-                                await asyncio.to_thread(send_telegram, f"❌ Trade with ID `{trade_id}` not found.", parse_mode='Markdown')
+                                enqueue_telegram(f"❌ Trade with ID `{trade_id}` not found.", parse_mode='Markdown')
 
                         fut = asyncio.run_coroutine_threadsafe(_task(), loop)
                         try:
@@ -9262,7 +10381,7 @@ def handle_update_sync(update, loop):
                     "- `/testrun`: Runs a full end-to-end test on the Binance testnet."
                 )
                 async def _task():
-                    await asyncio.to_thread(send_telegram, help_text, parse_mode='Markdown')
+                    enqueue_telegram(help_text, parse_mode='Markdown')
                 fut = asyncio.run_coroutine_threadsafe(_task(), loop)
                 try:
                     fut.result(timeout=10)
@@ -9303,8 +10422,8 @@ def handle_update_sync(update, loop):
                 except Exception as e:
                     log.error(f"Failed to schedule /simulate task: {e}")
             elif text.startswith("/usage"):
-                cpu_usage = psutil.cpu_percent(interval=1)
-                mem_data = get_memory_info()
+                mem_data = get_system_usage()
+                cpu_usage = mem_data['cpu']
                 
                 usage_report = (
                     f"🖥️ *System Resource Usage*\n\n"
@@ -9408,13 +10527,13 @@ def handle_update_sync(update, loop):
                             # --- Get trade data without holding lock for long ---
                             trades = await get_managed_trades_snapshot()
                             if trade_id not in trades:
-                                await asyncio.to_thread(send_telegram, f"Trade {trade_id} not found.")
+                                enqueue_telegram(f"Trade {trade_id} not found.")
                                 return
                             
                             trade = trades[trade_id]
                             price_distance = abs(trade['entry_price'] - trade['sl'])
                             if price_distance <= 0:
-                                await asyncio.to_thread(send_telegram, f"Cannot scale in, price distance is zero.")
+                                enqueue_telegram(f"Cannot scale in, price distance is zero.")
                                 return
 
                             qty_to_add = risk_to_add / price_distance
@@ -9436,12 +10555,12 @@ def handle_update_sync(update, loop):
                                 # --- Perform slow I/O (DB, Telegram) outside the lock ---
                                 if trade_to_update:
                                     await asyncio.to_thread(add_managed_trade_to_db, trade_to_update)
-                                    await asyncio.to_thread(send_telegram, f"✅ Scaled in {trade_id} by {qty_to_add} {trade['symbol']}.")
+                                    enqueue_telegram(f"✅ Scaled in {trade_id} by {qty_to_add} {trade['symbol']}.")
                                 else:
                                     # This case is unlikely but handled for safety
-                                    await asyncio.to_thread(send_telegram, f"Could not update trade {trade_id} after scaling in. Please check status.")
+                                    enqueue_telegram(f"Could not update trade {trade_id} after scaling in. Please check status.")
                             else:
-                                await asyncio.to_thread(send_telegram, "Calculated quantity to add is zero.")
+                                enqueue_telegram("Calculated quantity to add is zero.")
 
                         fut = asyncio.run_coroutine_threadsafe(_task(), loop)
                         fut.result(timeout=30)
@@ -9529,7 +10648,7 @@ async def run_full_testnet_test():
     try:
         # --- Step 1: Initialize Testnet Client ---
         report_lines.append("\n*Step 1: Initialization*")
-        await asyncio.to_thread(send_telegram, "1. Initializing testnet client...")
+        enqueue_telegram("1. Initializing testnet client...")
         
         # Use a temporary client for the test run, correctly enabling testnet mode
         temp_client = await asyncio.to_thread(
@@ -9552,11 +10671,11 @@ async def run_full_testnet_test():
 
         # --- Step 2: Sanity Checks ---
         report_lines.append("\n*Step 2: Sanity Checks*")
-        await asyncio.to_thread(send_telegram, "2. Pinging testnet server...")
+        enqueue_telegram("2. Pinging testnet server...")
         await asyncio.to_thread(temp_client.ping)
         report_lines.append("✅ Ping successful.")
 
-        await asyncio.to_thread(send_telegram, f"Fetching 1m klines for {test_symbol}...")
+        enqueue_telegram(f"Fetching 1m klines for {test_symbol}...")
         klines = await asyncio.to_thread(temp_client.futures_klines, symbol=test_symbol, interval='1m', limit=100)
         if not klines:
             raise RuntimeError("Failed to fetch klines from testnet.")
@@ -9564,7 +10683,7 @@ async def run_full_testnet_test():
 
         # --- Step 3: Open Position ---
         report_lines.append("\n*Step 3: Open Position*")
-        await asyncio.to_thread(send_telegram, "3. Placing a small market BUY order...")
+        enqueue_telegram("3. Placing a small market BUY order...")
         qty_to_open = 0.001
         
         # Manually construct and send the order using the temporary client
@@ -9578,7 +10697,7 @@ async def run_full_testnet_test():
 
         # --- Step 4: Verify Position & Create Mock Trade ---
         report_lines.append("\n*Step 4: Verify Position*")
-        await asyncio.to_thread(send_telegram, "4. Verifying open position...")
+        enqueue_telegram("4. Verifying open position...")
         positions = await asyncio.to_thread(temp_client.futures_position_information, symbol=test_symbol)
         pos = next((p for p in positions if p.get('symbol') == test_symbol and float(p.get('positionAmt', 0)) != 0), None)
         
@@ -9607,7 +10726,7 @@ async def run_full_testnet_test():
 
         # --- Step 5: Place SL/TP ---
         report_lines.append("\n*Step 5: Place SL/TP*")
-        await asyncio.to_thread(send_telegram, "5. Placing SL/TP orders...")
+        enqueue_telegram("5. Placing SL/TP orders...")
         
         # --- Hedge Mode Aware SL/TP ---
         position_mode = await asyncio.to_thread(temp_client.futures_get_position_mode)
@@ -9643,7 +10762,7 @@ async def run_full_testnet_test():
 
         # --- Step 6: Trailing Stop Check ---
         report_lines.append("\n*Step 6: Trailing Stop Check*")
-        await asyncio.to_thread(send_telegram, "6. Waiting 2 minutes to observe trailing stop... (This will depend on market movement)")
+        enqueue_telegram("6. Waiting 2 minutes to observe trailing stop... (This will depend on market movement)")
             
         await asyncio.sleep(120)
 
@@ -9664,7 +10783,7 @@ async def run_full_testnet_test():
     finally:
         # --- Step 7: Cleanup ---
         report_lines.append("\n*Step 7: Cleanup*")
-        await asyncio.to_thread(send_telegram, "7. Cleaning up test orders and position...")
+        enqueue_telegram("7. Cleaning up test orders and position...")
         
         if test_trade_id:
             async with managed_trades_lock:
@@ -9691,7 +10810,7 @@ async def run_full_testnet_test():
                 log.exception("Test cleanup failed.")
                 report_lines.append(f"❌ Cleanup failed: {e}")
 
-        await asyncio.to_thread(send_telegram, "\n".join(report_lines), parse_mode='Markdown')
+        enqueue_telegram("\n".join(report_lines), parse_mode='Markdown')
 
 async def handle_critical_error_async(exc: Exception, context: str = None):
     global running
@@ -9700,7 +10819,7 @@ async def handle_critical_error_async(exc: Exception, context: str = None):
     tb = ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__)) if exc else "No traceback"
     safe_tb = _shorten_for_telegram(tb)
     msg = f"CRITICAL ERROR: {context or ''}\nException: {str(exc)}\n\nTraceback:\n{safe_tb}\nServer IP: {ip}\nBot paused."
-    await asyncio.to_thread(send_telegram, msg)
+    enqueue_telegram(msg)
 
 @app.get("/")
 async def root():
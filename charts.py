@@ -0,0 +1,77 @@
+"""
+Chart rendering for the Telegram reports and /chart command.
+
+These functions run inside a dedicated worker process (see get_chart_pool() in app.py)
+so a several-hundred-millisecond matplotlib/mplfinance render never stalls the scan,
+monitor or Telegram threads. matplotlib is imported on first render, which keeps it out
+of the bot process entirely; the PnL figure is created once per worker and reused.
+All inputs are plain picklable data and every function returns PNG bytes.
+"""
+import io
+
+_pnl_fig = None
+_pnl_ax = None
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend for server-side plotting
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render_pnl_chart(times, cumulative_pnl, title: str) -> bytes:
+    """Cumulative PnL line chart."""
+    global _pnl_fig, _pnl_ax
+    if _pnl_fig is None:
+        _pnl_fig, _pnl_ax = _pyplot().subplots(figsize=(10, 6))
+    fig, ax = _pnl_fig, _pnl_ax
+    ax.cla()
+    ax.plot(times, cumulative_pnl, marker='o', linestyle='-')
+
+    ax.set_title(f'Cumulative PnL: {title}')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Cumulative PnL (USDT)')
+    ax.grid(True)
+    fig.autofmt_xdate()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    return buf.getvalue()
+
+
+def render_candle_chart(df, buy_marks, sell_marks, exit_marks, symbol: str) -> bytes:
+    """
+    Candles with SMA/BB overlays (df columns 'sma', 'bbu', 'bbl') and trade markers.
+    The *_marks Series are aligned to df.index (NaN where there is no marker), or None.
+    """
+    plt = _pyplot()
+    import mplfinance as mpf
+
+    addplots = [
+        mpf.make_addplot(df['sma'], color='purple', width=0.7),
+        mpf.make_addplot(df[['bbu', 'bbl']], color=['blue', 'blue'], width=0.5, linestyle='--'),
+    ]
+    if buy_marks is not None:
+        addplots.append(mpf.make_addplot(buy_marks, type='scatter', marker='^', color='g', markersize=100))
+        addplots.append(mpf.make_addplot(sell_marks, type='scatter', marker='v', color='r', markersize=100))
+        addplots.append(mpf.make_addplot(exit_marks, type='scatter', marker='x', color='blue', markersize=100))
+
+    fig, _ = mpf.plot(
+        df,
+        type='candle',
+        style='yahoo',
+        title=f'{symbol} Chart with SMA/BB and Trades',
+        ylabel='Price (USDT)',
+        addplot=addplots,
+        returnfig=True,
+        figsize=(15, 8),
+        volume=True,
+        panel_ratios=(3, 1)
+    )
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
@@ -0,0 +1,414 @@
+"""
+Numba-jitted indicator primitives used by the strategy evaluators in app.py.
+
+Every kernel takes contiguous float64 arrays (e.g. df['close'].to_numpy(np.float64))
+and returns freshly allocated float64 arrays of the same length, so callers can
+wrap the result back into a Series with the original index when needed.
+If numba isn't installed the kernels still run as plain Python, with the EWM
+recursions that dominate them handed to scipy's lfilter when scipy is available.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - numba is optional at runtime
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # Support both @njit and @njit(cache=True) forms
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        def _wrap(fn):
+            return fn
+        return _wrap
+
+
+@njit(cache=True)
+def _true_range_nb(high, low, close):
+    n = high.shape[0]
+    tr = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return tr
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        hl = high[i] - low[i]
+        hc = abs(high[i] - close[i - 1])
+        lc = abs(low[i] - close[i - 1])
+        m = hl
+        if hc > m:
+            m = hc
+        if lc > m:
+            m = lc
+        tr[i] = m
+    return tr
+
+
+@njit(cache=True)
+def _ewm_nb(x, alpha):
+    """pandas' ewm(alpha=alpha, adjust=False).mean() for series with only leading NaNs."""
+    n = x.shape[0]
+    out = np.full(n, np.nan, dtype=np.float64)
+    prev = np.nan
+    started = False
+    for i in range(n):
+        v = x[i]
+        if not started:
+            if v == v:
+                prev = v
+                started = True
+                out[i] = prev
+            continue
+        if v == v:
+            prev = prev + alpha * (v - prev)
+        out[i] = prev
+    return out
+
+
+@njit(cache=True)
+def _presma_ewm_nb(x, length, alpha):
+    """pandas-ta style MA: seed with the SMA of the first `length` valid values, then ewm."""
+    n = x.shape[0]
+    out = np.full(n, np.nan, dtype=np.float64)
+    first = 0
+    while first < n and x[first] != x[first]:
+        first += 1
+    seed_idx = first + length - 1
+    if length < 1 or seed_idx >= n:
+        return out
+    acc = 0.0
+    for i in range(first, seed_idx + 1):
+        acc += x[i]
+    prev = acc / length
+    out[seed_idx] = prev
+    for i in range(seed_idx + 1, n):
+        v = x[i]
+        if v == v:
+            prev = prev + alpha * (v - prev)
+        out[i] = prev
+    return out
+
+
+if not HAVE_NUMBA:  # pragma: no cover - exercised only without numba
+    try:
+        from scipy.signal import lfilter
+    except ImportError:
+        lfilter = None
+
+    if lfilter is not None:
+        _ewm_loop = _ewm_nb
+        _presma_ewm_loop = _presma_ewm_nb
+
+        def _ewm_from(x, start, seed, alpha, out):
+            # y[i] = y[i-1] + alpha*(x[i] - y[i-1]) with y[start] = seed, run in C
+            out[start] = seed
+            if start + 1 < x.shape[0]:
+                out[start + 1:] = lfilter([alpha], [1.0, alpha - 1.0], x[start + 1:], zi=[(1.0 - alpha) * seed])[0]
+            return out
+
+        def _ewm_nb(x, alpha):
+            """lfilter version of the loop above; interior NaNs still take the loop."""
+            valid = np.flatnonzero(x == x)
+            if valid.size == 0 or valid.size != x.shape[0] - valid[0]:
+                return _ewm_loop(x, alpha)
+            first = valid[0]
+            return _ewm_from(x, first, x[first], alpha, np.full(x.shape[0], np.nan, dtype=np.float64))
+
+        def _presma_ewm_nb(x, length, alpha):
+            valid = np.flatnonzero(x == x)
+            if valid.size == 0 or valid.size != x.shape[0] - valid[0]:
+                return _presma_ewm_loop(x, length, alpha)
+            first = valid[0]
+            seed_idx = first + length - 1
+            out = np.full(x.shape[0], np.nan, dtype=np.float64)
+            if length < 1 or seed_idx >= x.shape[0]:
+                return out
+            return _ewm_from(x, seed_idx, x[first:seed_idx + 1].mean(), alpha, out)
+
+
+@njit(cache=True)
+def _supertrend_bands_nb(high, low, close, period, mult):
+    """
+    SuperTrend as computed by pandas-ta (RMA ATR seeded with an SMA).
+    Returns (trend, direction, upper_band, lower_band, atr); direction is +1/-1
+    with NaN during warm-up. The bands are the final (ratcheted) bands.
+    """
+    return _supertrend_bands_tr_nb(high, low, close, _true_range_nb(high, low, close), period, mult)
+
+
+@njit(cache=True)
+def _supertrend_bands_tr_nb(high, low, close, tr, period, mult):
+    """_supertrend_bands_nb with a precomputed true range, so several SuperTrends share one TR pass."""
+    n = close.shape[0]
+    trend = np.full(n, np.nan, dtype=np.float64)
+    direction = np.full(n, np.nan, dtype=np.float64)
+    ub = np.empty(n, dtype=np.float64)
+    lb = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return trend, direction, ub, lb, np.empty(0, dtype=np.float64)
+    atr = _presma_ewm_nb(tr, period, 1.0 / period)
+    for i in range(n):
+        hl2 = 0.5 * (high[i] + low[i])
+        ub[i] = hl2 + mult * atr[i]
+        lb[i] = hl2 - mult * atr[i]
+    d = 1.0
+    direction[0] = d
+    for i in range(1, n):
+        if close[i] > ub[i - 1]:
+            d = 1.0
+        elif close[i] < lb[i - 1]:
+            d = -1.0
+        else:
+            if d > 0 and lb[i] < lb[i - 1]:
+                lb[i] = lb[i - 1]
+            if d < 0 and ub[i] > ub[i - 1]:
+                ub[i] = ub[i - 1]
+        direction[i] = d
+        trend[i] = lb[i] if d > 0 else ub[i]
+    for i in range(min(period, n)):
+        direction[i] = np.nan
+    return trend, direction, ub, lb, atr
+
+
+@njit(cache=True)
+def _supertrend_nb(high, low, close, period, mult):
+    """SuperTrend line and direction only; see _supertrend_bands_nb."""
+    trend, direction, _, _, _ = _supertrend_bands_nb(high, low, close, period, mult)
+    return trend, direction
+
+
+@njit(cache=True)
+def _adx_nb(high, low, close, n):
+    """
+    ADX with +DI/-DI using Wilder smoothing (ewm alpha=1/n), matching app.adx().
+    Returns (plus_di, minus_di, adx).
+    """
+    size = close.shape[0]
+    plus_dm = np.full(size, np.nan, dtype=np.float64)
+    minus_dm = np.full(size, np.nan, dtype=np.float64)
+    for i in range(1, size):
+        up = high[i] - high[i - 1]
+        dn = low[i - 1] - low[i]
+        p = 0.0 if (up < 0 or up < dn) else up
+        m = 0.0 if (dn < 0 or dn < p) else dn
+        plus_dm[i] = p
+        minus_dm[i] = m
+    alpha = 1.0 / n
+    atr_s = _ewm_nb(_true_range_nb(high, low, close), alpha)
+    pdm_s = _ewm_nb(plus_dm, alpha)
+    mdm_s = _ewm_nb(minus_dm, alpha)
+    plus_di = np.empty(size, dtype=np.float64)
+    minus_di = np.empty(size, dtype=np.float64)
+    dx = np.empty(size, dtype=np.float64)
+    for i in range(size):
+        a = atr_s[i]
+        if a == 0.0:
+            a = 1e-10
+        plus_di[i] = 100.0 * pdm_s[i] / a
+        minus_di[i] = 100.0 * mdm_s[i] / a
+        den = plus_di[i] + minus_di[i]
+        if den == 0.0:
+            den = 1e-10
+        dx[i] = 100.0 * abs(plus_di[i] - minus_di[i]) / den
+    return plus_di, minus_di, _ewm_nb(dx, alpha)
+
+
+@njit(cache=True)
+def _rsi_avgs_nb(close, n):
+    """
+    Wilder RSI as computed by pandas-ta (RMA of gains/losses, no SMA seed).
+    Returns (rsi, avg_gain, avg_loss).
+    """
+    size = close.shape[0]
+    gain = np.full(size, np.nan, dtype=np.float64)
+    loss = np.full(size, np.nan, dtype=np.float64)
+    for i in range(1, size):
+        diff = close[i] - close[i - 1]
+        gain[i] = diff if diff > 0 else 0.0
+        loss[i] = -diff if diff < 0 else 0.0
+    alpha = 1.0 / n
+    avg_gain = _ewm_nb(gain, alpha)
+    avg_loss = _ewm_nb(loss, alpha)
+    out = np.empty(size, dtype=np.float64)
+    for i in range(size):
+        den = avg_gain[i] + avg_loss[i]
+        # Flat stretch: njit raises on x/0.0, so emit NaN like step_rsi_wilder
+        out[i] = 100.0 * avg_gain[i] / den if den != 0.0 else np.nan
+    return out, avg_gain, avg_loss
+
+
+@njit(cache=True)
+def _rsi_nb(close, n):
+    """Wilder RSI line only; see _rsi_avgs_nb."""
+    out, _, _ = _rsi_avgs_nb(close, n)
+    return out
+
+
+@njit(cache=True)
+def _macd_nb(close, f, s, sig):
+    """
+    MACD as computed by pandas-ta (SMA-seeded EMAs).
+    Returns (macd, signal, histogram).
+    """
+    if s < f:
+        f, s = s, f
+    fast = _presma_ewm_nb(close, f, 2.0 / (f + 1.0))
+    slow = _presma_ewm_nb(close, s, 2.0 / (s + 1.0))
+    line = fast - slow
+    signal = _presma_ewm_nb(line, sig, 2.0 / (sig + 1.0))
+    return line, signal, line - signal
+
+
+@njit(cache=True)
+def _rolling_mean_nb(x, length, min_periods):
+    """rolling(length, min_periods=min_periods).mean(), skipping NaNs, with a compensated running sum."""
+    n = x.shape[0]
+    out = np.full(n, np.nan, dtype=np.float64)
+    nobs = 0
+    total = 0.0
+    comp = 0.0
+    for i in range(n):
+        v = x[i]
+        if v == v:
+            nobs += 1
+            y = v - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+        if i >= length:
+            old = x[i - length]
+            if old == old:
+                nobs -= 1
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+        if nobs >= min_periods and nobs > 0:
+            out[i] = total / nobs
+    return out
+
+
+@njit(cache=True)
+def _rolling_mean_std_nb(x, length):
+    """
+    rolling(length).mean() and .std() (ddof=1) in one pass, using the same add/remove
+    Welford updates as pandas. NaN until `length` valid values are in the window.
+    """
+    n = x.shape[0]
+    mean_out = np.full(n, np.nan, dtype=np.float64)
+    std_out = np.full(n, np.nan, dtype=np.float64)
+    nobs = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        v = x[i]
+        if v == v:
+            nobs += 1
+            delta = v - mean
+            mean += delta / nobs
+            m2 += delta * (v - mean)
+        if i >= length:
+            old = x[i - length]
+            if old == old:
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    m2 -= delta * (old - mean)
+                else:
+                    mean = 0.0
+                    m2 = 0.0
+        if nobs >= length and length > 0:
+            mean_out[i] = mean
+            if nobs > 1:
+                std_out[i] = np.sqrt(m2 / (nobs - 1)) if m2 > 0.0 else 0.0
+    return mean_out, std_out
+
+
+@njit(cache=True)
+def _rsi_sma_nb(close, length):
+    """
+    app.rsi(): rolling-mean gains/losses, where any undefined or infinite RS
+    (warm-up, no losses, flat window) yields 0.
+    """
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.float64)
+    gain = np.zeros(n, dtype=np.float64)
+    loss = np.zeros(n, dtype=np.float64)
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            gain[i] = d
+        elif d < 0:
+            loss[i] = -d
+    gain_sum = 0.0
+    loss_sum = 0.0
+    loss_ct = 0  # losing bars in the window; at 0 the running sum is reset to exactly 0
+    for i in range(n):
+        gain_sum += gain[i]
+        loss_sum += loss[i]
+        if loss[i] > 0:
+            loss_ct += 1
+        if i >= length:
+            gain_sum -= gain[i - length]
+            loss_sum -= loss[i - length]
+            if loss[i - length] > 0:
+                loss_ct -= 1
+        if loss_ct == 0:
+            loss_sum = 0.0
+        if i >= length - 1 and loss_ct > 0:
+            rs = (gain_sum if gain_sum > 0.0 else 0.0) / loss_sum
+            out[i] = 100.0 - 100.0 / (1.0 + rs)
+    return out
+
+
+# -------------------------
+# O(1) single-bar steps used to extend a cached indicator by one candle.
+# Each takes the carried state after the previous bar plus the new bar's OHLC,
+# and returns (outputs, new_state). Plain Python on purpose: a handful of float
+# ops is cheaper than a jit dispatch with tuple arguments.
+# -------------------------
+def _bar_true_range(high, low, prev_close):
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+def step_ema(state, high, low, close, alpha):
+    prev = state[0]
+    val = prev + alpha * (close - prev)
+    return (val,), (val,)
+
+
+def step_atr_wilder(state, high, low, close, alpha):
+    prev_atr, prev_close = state
+    val = prev_atr + alpha * (_bar_true_range(high, low, prev_close) - prev_atr)
+    return (val,), (val, close)
+
+
+def step_rsi_wilder(state, high, low, close, alpha):
+    avg_gain, avg_loss, prev_close = state
+    diff = close - prev_close
+    avg_gain = avg_gain + alpha * ((diff if diff > 0 else 0.0) - avg_gain)
+    avg_loss = avg_loss + alpha * ((-diff if diff < 0 else 0.0) - avg_loss)
+    den = avg_gain + avg_loss
+    val = 100.0 * avg_gain / den if den else float('nan')
+    return (val,), (avg_gain, avg_loss, close)
+
+
+def step_supertrend(state, high, low, close, alpha, mult):
+    prev_atr, prev_ub, prev_lb, prev_dir, prev_close = state
+    atr = prev_atr + alpha * (_bar_true_range(high, low, prev_close) - prev_atr)
+    hl2 = 0.5 * (high + low)
+    ub = hl2 + mult * atr
+    lb = hl2 - mult * atr
+    if close > prev_ub:
+        d = 1.0
+    elif close < prev_lb:
+        d = -1.0
+    else:
+        d = prev_dir
+        if d > 0 and lb < prev_lb:
+            lb = prev_lb
+        if d < 0 and ub > prev_ub:
+            ub = prev_ub
+    trend = lb if d > 0 else ub
+    return (trend, d), (atr, ub, lb, d, close)
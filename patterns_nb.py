@@ -0,0 +1,84 @@
+"""
+Numba-jitted candle-pattern classifiers for the S6/S7 rejection-candle rules.
+
+The scalar kernels define each rule once for a single bar (app.py's _s6_* helpers
+call them with floats pulled from a row); the *_mask kernels apply the same rule to
+whole float64 OHLCV arrays so a caller can classify every bar in one pass and then
+just index the result. `direction` is BUY (+1) or SELL (-1).
+"""
+import numpy as np
+
+from indicators_nb import njit
+
+BUY = 1
+SELL = -1
+
+
+@njit(cache=True)
+def is_pin_bar(o, h, l, c, direction):
+    """Wick on the trade side >= 60% of the range and body <= 40% of it."""
+    rng = h - l
+    if not rng > 1e-9:
+        rng = 1e-9
+    body = abs(c - o)
+    if direction == BUY:
+        wick = min(o, c) - l
+    else:
+        wick = h - max(o, c)
+    return wick / rng >= 0.60 and body / rng <= 0.40
+
+
+@njit(cache=True)
+def is_engulfing(co, cc, po, pc, direction):
+    """Current body engulfs the previous one in `direction` (the POI reclaim is checked by the caller)."""
+    if direction == BUY:
+        return cc > co and cc >= max(po, pc) and co <= min(po, pc)
+    return cc < co and cc <= min(po, pc) and co >= max(po, pc)
+
+
+@njit(cache=True)
+def is_follow_through(rej_h, rej_l, fo, fh, fl, fc, fv, vol_ma, direction, ratio):
+    """Follow-through candle closes in `direction` with range >= ratio * rejection range, or volume >= vol_ma."""
+    if direction == BUY:
+        in_dir = fc > fo
+    else:
+        in_dir = fc < fo
+    if not in_dir:
+        return False
+    rej_range = rej_h - rej_l
+    if np.isfinite(rej_range) and fh - fl >= ratio * rej_range:
+        return True
+    return np.isfinite(vol_ma) and vol_ma > 0 and fv >= vol_ma
+
+
+@njit(cache=True)
+def pin_bar_mask(o, h, l, c, direction):
+    n = c.shape[0]
+    out = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        out[i] = is_pin_bar(o[i], h[i], l[i], c[i], direction)
+    return out
+
+
+@njit(cache=True)
+def engulfing_mask(o, c, direction):
+    """out[i]: bar i engulfs bar i-1; the first bar is never engulfing."""
+    n = c.shape[0]
+    out = np.zeros(n, dtype=np.bool_)
+    for i in range(1, n):
+        out[i] = is_engulfing(o[i], c[i], o[i - 1], c[i - 1], direction)
+    return out
+
+
+@njit(cache=True)
+def follow_through_mask(o, h, l, c, v, vol_ma, direction, ratio):
+    """
+    out[i]: the candle after rejection bar i follows through, judged against vol_ma[i].
+    The last bar has no successor and is judged against itself.
+    """
+    n = c.shape[0]
+    out = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        j = i + 1 if i + 1 < n else i
+        out[i] = is_follow_through(h[i], l[i], o[j], h[j], l[j], c[j], v[j], vol_ma[i], direction, ratio)
+    return out